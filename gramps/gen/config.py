@@ -202,6 +202,9 @@ register("database.autobackup", 0)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
 register("database.host", "")
 register("database.port", "")
+register("database.serializer", "pickle")
+register("database.cache-size", 32)
+register("database.sqlite-profile", "default")
 
 register(
     "export.proxy-order",
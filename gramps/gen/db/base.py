@@ -39,6 +39,7 @@ import logging
 # -------------------------------------------------------------------------
 from ..const import GRAMPS_LOCALE as glocale
 from ..db.dbconst import DBLOGNAME
+from ..errors import HandleError
 from ..lib.childref import ChildRef
 from ..lib.childreftype import ChildRefType
 from .exceptions import DbTransactionCancel
@@ -602,6 +603,394 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def _iter_from_handles(self, get_func, handles):
+        """
+        Iterate over the objects returned by get_func for a list of handles,
+        skipping the handles of objects which do not exist or are filtered
+        out.
+        """
+        for handle in handles:
+            try:
+                obj = get_func(handle)
+            except HandleError:
+                continue
+            if obj is not None:
+                yield obj
+
+    def get_citation_from_handles(self, handles):
+        """
+        Iterate over the Citation objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_citation_from_handle, handles)
+
+    def get_event_from_handles(self, handles):
+        """
+        Iterate over the Event objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_event_from_handle, handles)
+
+    def get_family_from_handles(self, handles):
+        """
+        Iterate over the Family objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_family_from_handle, handles)
+
+    def get_media_from_handles(self, handles):
+        """
+        Iterate over the Media objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_media_from_handle, handles)
+
+    def get_note_from_handles(self, handles):
+        """
+        Iterate over the Note objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_note_from_handle, handles)
+
+    def get_person_from_handles(self, handles):
+        """
+        Iterate over the Person objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_person_from_handle, handles)
+
+    def get_place_from_handles(self, handles):
+        """
+        Iterate over the Place objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_place_from_handle, handles)
+
+    def get_repository_from_handles(self, handles):
+        """
+        Iterate over the Repository objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_repository_from_handle, handles)
+
+    def get_source_from_handles(self, handles):
+        """
+        Iterate over the Source objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_source_from_handle, handles)
+
+    def get_tag_from_handles(self, handles):
+        """
+        Iterate over the Tag objects with the passed handles, in the same
+        order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: iterable of str
+
+        Handles of objects which do not exist, or are filtered out by a
+        proxy, are skipped.  Backends may fetch the objects in batches.
+        """
+        return self._iter_from_handles(self.get_tag_from_handle, handles)
+
+    def _get_generation_handles(self, handle, get_next, max_gen, min_gen):
+        """
+        Return the handles of the people reached from a person by following
+        get_next for between min_gen and max_gen generations.
+
+        The people of each generation are visited once, and the people
+        already found are not visited again once min_gen is reached, so that
+        loops in the family tree do not prevent the walk from ending.
+        """
+        found = set()
+        generation = {handle}
+        gen = 0
+        while generation:
+            if gen >= min_gen:
+                generation -= found
+                found.update(generation)
+            if max_gen is not None and gen >= max_gen:
+                break
+            generation = {
+                next_handle
+                for person_handle in generation
+                for next_handle in get_next(person_handle)
+            }
+            gen += 1
+        return found
+
+    def _get_parent_handles(self, handle):
+        """
+        Return the handles of the parents in the main parent family of a
+        person.
+        """
+        try:
+            person = self.get_person_from_handle(handle)
+            if person is None or not person.get_main_parents_family_handle():
+                return []
+            family = self.get_family_from_handle(
+                person.get_main_parents_family_handle()
+            )
+        except HandleError:
+            return []
+        if family is None:
+            return []
+        return [
+            parent_handle
+            for parent_handle in (
+                family.get_father_handle(),
+                family.get_mother_handle(),
+            )
+            if parent_handle
+        ]
+
+    def _get_child_handles(self, handle):
+        """
+        Return the handles of the children in all families of a person.
+        """
+        try:
+            person = self.get_person_from_handle(handle)
+        except HandleError:
+            return []
+        if person is None:
+            return []
+        return [
+            child_ref.ref
+            for family in self.get_family_from_handles(person.get_family_handle_list())
+            for child_ref in family.get_child_ref_list()
+        ]
+
+    def get_ancestor_handles(self, handle, max_gen=None, min_gen=0):
+        """
+        Return the set of handles of the ancestors of a person.
+
+        Ancestors are followed through the main parent family of each person.
+        The person is generation 0, the parents generation 1, and so on.  A
+        person is included if there is a line of ancestry from the person of
+        at least min_gen and at most max_gen generations, so that the person
+        itself is only included when min_gen is 0, or when it is its own
+        ancestor.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :param max_gen: maximum number of generations, or None for no limit.
+        :type max_gen: int or None
+        :param min_gen: minimum number of generations.
+        :type min_gen: int
+        :returns: handles of the ancestors.
+        :rtype: set
+
+        Backends may run the search in the database.  When used through a
+        proxy, the lines go through the people and families of the proxy.
+        """
+        return self._get_generation_handles(
+            handle, self._get_parent_handles, max_gen, min_gen
+        )
+
+    def get_descendant_handles(self, handle, max_gen=None, min_gen=0):
+        """
+        Return the set of handles of the descendants of a person.
+
+        Descendants are followed through all families of each person.  The
+        person is generation 0, the children generation 1, and so on.  A
+        person is included if there is a line of descent from the person of
+        at least min_gen and at most max_gen generations, so that the person
+        itself is only included when min_gen is 0, or when it is its own
+        descendant.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :param max_gen: maximum number of generations, or None for no limit.
+        :type max_gen: int or None
+        :param min_gen: minimum number of generations.
+        :type min_gen: int
+        :returns: handles of the descendants.
+        :rtype: set
+
+        Backends may run the search in the database.  When used through a
+        proxy, the lines go through the people and families of the proxy.
+        """
+        return self._get_generation_handles(
+            handle, self._get_child_handles, max_gen, min_gen
+        )
+
+    def select_handles(self, class_name, where=None, args=None):
+        """
+        Return the handles of the objects of a primary class which match a
+        SQL predicate, or None if the database cannot evaluate SQL.
+
+        The predicate may use the secondary columns of the table of the
+        class, and the reference table.  It is used by the filters to select
+        the objects matching rules which can be expressed in SQL.
+
+        :param class_name: name of the primary object class.
+        :type class_name: str
+        :param where: SQL predicate, or None for all objects.
+        :type where: str
+        :param args: values of the parameters of the predicate.
+        :type args: list
+        :returns: handles of the matching objects.
+        :rtype: list or None
+        """
+        return None
+
+    def find_people_by_phonetic(self, surname, given=None, method="soundex"):
+        """
+        Return the handles of the people with a name whose surname, and given
+        name if one is given, have the same phonetic code as the given ones,
+        or None if the database does not store the phonetic codes.
+
+        All the surnames of the primary and alternate names are searched.
+
+        :param surname: surname to search.
+        :type surname: str
+        :param given: given name to search in the same names, or None.
+        :type given: str
+        :param method: phonetic method, see
+                       :data:`~gramps.gen.soundex.PHONETIC_METHODS`.
+        :type method: str
+        :returns: handles of the matching people.
+        :rtype: set or None
+        """
+        return None
+
+    def get_person_sortvals(self, handle):
+        """
+        Return the sort values of the dates of the birth and death of a
+        person, as a (birth, death) tuple, or None if the database does not
+        store them.
+
+        The dates are those of the events returned by
+        :func:`~gramps.gen.utils.db.get_birth_or_fallback` and
+        :func:`~gramps.gen.utils.db.get_death_or_fallback`, with a sort value
+        of 0 if there is no such event.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :returns: sort values of the birth and death dates.
+        :rtype: tuple or None
+        """
+        return None
+
+    def get_change_count(self):
+        """
+        Return a number which changes whenever objects of the database are
+        added, changed or removed, or None if the database cannot tell.
+
+        The filters use it to keep the prepared state of their rules while
+        the database does not change.  None is also returned while a
+        transaction is in progress.
+
+        :returns: number of changes, or None.
+        :rtype: int or None
+        """
+        return None
+
+    def search_text(self, class_name, text):
+        """
+        Return the handles of the objects of a primary class whose texts may
+        contain a string, ignoring case, or None if the database has no
+        full-text index or cannot search the string.
+
+        All the objects containing the string are returned, but some of the
+        returned objects may not contain it: the callers test them with
+        :meth:`~.BaseObject.matches_string`.  The texts of an object are
+        those of :meth:`~.BaseObject.get_text_data_list_recursively`.
+
+        :param class_name: The name of the primary object class.
+        :type class_name: str
+        :param text: The string to search.
+        :type text: str
+        :returns: Handles of the objects which may contain the string, or None.
+        :rtype: set or None
+        """
+        return None
+
+    def get_backlink_map(self):
+        """
+        Return the backlinks of all objects, as read at once from the
+        reference map, or None if the database cannot read them at once.
+
+        The backlinks of an object are those returned by
+        :meth:`find_backlink_handles`.
+
+        :returns: Dictionary of the lists of (class_name, handle) tuples of
+                  the objects referencing an object, by handle of the
+                  referenced object.  Objects without backlinks are missing.
+        :rtype: dict or None
+        """
+        return None
+
+    def get_raw_data_in_handle_order(self, class_name):
+        """
+        Return an iterator over the (handle, raw data) pairs of all objects of
+        a primary class, read with a single query in the order of their
+        handles, or None if the database cannot read them in that order.
+
+        The handles are in the order of ``sorted()`` applied to the handles
+        returned by the ``get_*_handles`` methods.
+
+        :param class_name: The name of the primary object class.
+        :type class_name: str
+        :returns: Iterator over (handle, raw data) pairs, or None.
+        :rtype: iterator or None
+        """
+        return None
+
     def get_citation_handles(self, sort_handles=False, locale=glocale):
         """
         Return a list of database handles, one handle for each Citation in
@@ -988,6 +1377,99 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def _iter_raw_data_many(self, get_func, handles):
+        """
+        Iterate over (handle, data) pairs returned by get_func for a list of
+        handles, skipping the handles of objects which do not exist.
+        """
+        for handle in handles:
+            try:
+                data = get_func(handle)
+            except HandleError:
+                continue
+            if data is not None:
+                yield (handle, data)
+
+    def get_raw_citation_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Citation objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_citation_data, handles)
+
+    def get_raw_event_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Event objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_event_data, handles)
+
+    def get_raw_family_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Family objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_family_data, handles)
+
+    def get_raw_media_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Media objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_media_data, handles)
+
+    def get_raw_note_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Note objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_note_data, handles)
+
+    def get_raw_person_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Person objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_person_data, handles)
+
+    def get_raw_place_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Place objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_place_data, handles)
+
+    def get_raw_repository_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Repository objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_repository_data, handles)
+
+    def get_raw_source_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Source objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_source_data, handles)
+
+    def get_raw_tag_data_many(self, handles):
+        """
+        Iterate over (handle, raw data) pairs of the Tag objects with the
+        passed handles, in the same order.  Handles of objects which do not
+        exist are skipped.
+        """
+        return self._iter_raw_data_many(self.get_raw_tag_data, handles)
+
     def get_researcher(self):
         """
         Return the Researcher instance, providing information about the owner
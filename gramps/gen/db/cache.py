@@ -0,0 +1,164 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Size-bounded record cache for the database backends.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import sys
+import threading
+from collections import OrderedDict
+
+
+# -------------------------------------------------------------------------
+#
+# DbCache
+#
+# -------------------------------------------------------------------------
+class DbCache:
+    """
+    A least recently used cache of database records, keyed by object type
+    and handle.
+
+    The size of the cache is bounded by the total size of the cached values,
+    in bytes, rather than by their number.  A maximum size of 0 disables the
+    cache.
+
+    The database is responsible for discarding the records it changes.
+
+    The cache is only used by the thread which creates it.  Other threads
+    may read the database through other connections, which do not see the
+    uncommitted changes of the first thread, so they neither read nor fill
+    the cache.
+    """
+
+    def __init__(self, max_size=0):
+        self.__data = OrderedDict()
+        self.__thread = threading.get_ident()
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.__data)
+
+    def get(self, obj_key, handle):
+        """
+        Return the cached value for the object, or None if it is not cached.
+        """
+        if threading.get_ident() != self.__thread:
+            return None
+        entry = self.__data.get((obj_key, handle))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__data.move_to_end((obj_key, handle))
+        return entry[0]
+
+    def put(self, obj_key, handle, value):
+        """
+        Store a value for the object, evicting the least recently used
+        values if the cache becomes too big.
+        """
+        size = sys.getsizeof(value)
+        if size > self.max_size or threading.get_ident() != self.__thread:
+            return
+        key = (obj_key, handle)
+        old = self.__data.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.__data[key] = (value, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, old_size) = self.__data.popitem(last=False)
+            self.size -= old_size
+            self.evictions += 1
+
+    def discard(self, obj_key, handle):
+        """
+        Remove the object from the cache, if present.
+        """
+        entry = self.__data.pop((obj_key, handle), None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def discard_handles(self, obj_key, handles):
+        """
+        Remove a list of objects of the same type from the cache.
+        """
+        for handle in handles:
+            self.discard(obj_key, handle)
+
+    def discard_type(self, obj_key):
+        """
+        Remove all objects of a type from the cache.
+        """
+        for key in [key for key in self.__data if key[0] == obj_key]:
+            self.discard(*key)
+
+    def clear(self):
+        """
+        Remove all objects from the cache.
+        """
+        self.__data.clear()
+        self.size = 0
+
+    def set_max_size(self, max_size):
+        """
+        Change the maximum size of the cache, in bytes.
+        """
+        self.max_size = max_size
+        if max_size <= 0:
+            self.clear()
+        while self.size > self.max_size:
+            _, (_, old_size) = self.__data.popitem(last=False)
+            self.size -= old_size
+            self.evictions += 1
+
+    def get_stats(self):
+        """
+        Return a dictionary with the cache statistics.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.__data),
+            "size": self.size,
+            "max_size": self.max_size,
+        }
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -42,6 +42,7 @@ from pathlib import Path
 # Gramps modules
 #
 # ------------------------------------------------------------------------
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 from ..errors import HandleError
 from ..lib import (
@@ -58,6 +59,7 @@ from ..lib import (
     Tag,
 )
 from ..lib.genderstats import GenderStats
+from ..lib.lazy import create_lazy
 from ..lib.researcher import Researcher
 from ..updatecallback import UpdateCallback
 from ..utils.callback import Callback
@@ -87,6 +89,7 @@ from . import (
     DbWriteBase,
 )
 from .bookmarks import DbBookmarks
+from .cache import DbCache
 from .exceptions import DbUpgradeRequiredError, DbVersionError
 from .utils import clear_lock_file, write_lock_file
 
@@ -94,6 +97,8 @@ _ = glocale.translation.gettext
 
 LOG = logging.getLogger(DBLOGNAME)
 
+NAME_TO_KEY_MAP = {name: key for key, name in KEY_TO_NAME_MAP.items()}
+
 SIGBASE = (
     "person",
     "family",
@@ -187,6 +192,7 @@ class DbGenericUndo(DbUndo):
                     self.db.undo_reference(new_data, handle)
                 else:
                     self.db.undo_data(new_data, handle, key)
+                    self.db.cache.discard(key, handle)
                     sigs[key][trans_type].append(handle)
             # now emit the signals
             self.undo_sigs(sigs, False)
@@ -194,6 +200,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_commit()
         except:
             self.db._txn_abort()
+            self.db.cache.clear()
             raise
 
         # Notify listeners
@@ -236,6 +243,7 @@ class DbGenericUndo(DbUndo):
                     self.db.undo_reference(old_data, handle)
                 else:
                     self.db.undo_data(old_data, handle, key)
+                    self.db.cache.discard(key, handle)
                     sigs[key][trans_type].append(handle)
             # now emit the signals
             self.undo_sigs(sigs, True)
@@ -243,6 +251,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_commit()
         except:
             self.db._txn_abort()
+            self.db.cache.clear()
             raise
 
         # Notify listeners
@@ -389,12 +398,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
     __callback_map = {}
 
-    VERSION = (20, 0, 0)
+    VERSION = (21, 0, 0)
 
     def __init__(self, directory=None):
         DbReadBase.__init__(self)
         DbWriteBase.__init__(self)
         Callback.__init__(self)
+        self.cache = DbCache(config.get("database.cache-size") * 1024 * 1024)
         self.__tables = {
             "Person": {
                 "handle_func": self.get_person_from_handle,
@@ -609,6 +619,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.abort_possible = True
         self._bm_changes = 0
         self.has_changed = 0  # Also gives commits since startup
+        self._change_count = 0
         self.surname_list = []
         self.genderStats = GenderStats()  # can pass in loaded stats as dict
         self.owner = Researcher()
@@ -662,6 +673,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             mode = DBMODE_R
 
         self.readonly = mode == DBMODE_R
+        # The cache belongs to the thread which loads the database.
+        self.cache = DbCache(config.get("database.cache-size") * 1024 * 1024)
 
         if not self.readonly and directory != ":memory:":
             write_lock_file(directory)
@@ -832,6 +845,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        self.cache.clear()
+        self._change_count += 1
         self.db_is_open = False
         self._directory = None
 
@@ -863,6 +878,40 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """Return True when the file has a supported version."""
         return True
 
+    def emit(self, signal_name, args=tuple()):
+        """
+        Emit a signal, after discarding the objects it reports as changed
+        from the record cache, and counting the change.
+        """
+        obj_type, _, operation = signal_name.rpartition("-")
+        obj_key = NAME_TO_KEY_MAP.get(obj_type)
+        if obj_key is not None:
+            self._change_count += 1
+            if operation in ("update", "delete"):
+                self.cache.discard_handles(obj_key, args[0])
+            elif operation == "rebuild":
+                self.cache.discard_type(obj_key)
+        super().emit(signal_name, args)
+
+    def get_cache_stats(self):
+        """
+        Return a dictionary with the statistics of the record cache.
+
+        The keys are hits, misses, hit_ratio, evictions, entries, size and
+        max_size.  The sizes are in bytes.
+        """
+        return self.cache.get_stats()
+
+    def get_change_count(self):
+        """
+        Return the number of object signals emitted, and batch transactions
+        committed, since the database object was created, or None during a
+        transaction.
+        """
+        if self.transaction is not None:
+            return None
+        return self._change_count
+
     def _get_table_func(self, table=None, func=None):
         """
         Private implementation of get_table_func.
@@ -1348,46 +1397,103 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     #
     ################################################################
 
-    def _get_from_handle(self, obj_key, obj_class, handle):
+    def _get_from_handle(self, obj_key, obj_class, handle, lazy=False):
+        """
+        Return the object with the given handle.
+
+        If lazy is True, a lazy object is returned, which only unpacks its
+        secondary objects when they are first accessed.
+        """
         if handle is None:
             raise HandleError("Handle is None")
         if not handle:
             raise HandleError("Handle is empty")
         data = self._get_raw_data(obj_key, handle)
         if data:
+            if lazy:
+                return create_lazy(obj_class, data)
             return obj_class.create(data)
         raise HandleError(f"Handle {handle} not found")
 
-    def get_event_from_handle(self, handle):
-        return self._get_from_handle(EVENT_KEY, Event, handle)
+    def get_event_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(EVENT_KEY, Event, handle, lazy)
 
-    def get_family_from_handle(self, handle):
-        return self._get_from_handle(FAMILY_KEY, Family, handle)
+    def get_family_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(FAMILY_KEY, Family, handle, lazy)
 
-    def get_repository_from_handle(self, handle):
-        return self._get_from_handle(REPOSITORY_KEY, Repository, handle)
+    def get_repository_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(REPOSITORY_KEY, Repository, handle, lazy)
 
-    def get_person_from_handle(self, handle):
-        return self._get_from_handle(PERSON_KEY, Person, handle)
+    def get_person_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(PERSON_KEY, Person, handle, lazy)
 
-    def get_place_from_handle(self, handle):
-        return self._get_from_handle(PLACE_KEY, Place, handle)
+    def get_place_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(PLACE_KEY, Place, handle, lazy)
 
-    def get_citation_from_handle(self, handle):
-        return self._get_from_handle(CITATION_KEY, Citation, handle)
+    def get_citation_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(CITATION_KEY, Citation, handle, lazy)
 
-    def get_source_from_handle(self, handle):
-        return self._get_from_handle(SOURCE_KEY, Source, handle)
+    def get_source_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(SOURCE_KEY, Source, handle, lazy)
 
-    def get_note_from_handle(self, handle):
-        return self._get_from_handle(NOTE_KEY, Note, handle)
+    def get_note_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(NOTE_KEY, Note, handle, lazy)
 
-    def get_media_from_handle(self, handle):
-        return self._get_from_handle(MEDIA_KEY, Media, handle)
+    def get_media_from_handle(self, handle, lazy=False):
+        return self._get_from_handle(MEDIA_KEY, Media, handle, lazy)
 
     def get_tag_from_handle(self, handle):
         return self._get_from_handle(TAG_KEY, Tag, handle)
 
+    ################################################################
+    #
+    # get_*_from_handles methods
+    #
+    ################################################################
+
+    def _get_from_handles(self, obj_key, obj_class, handles, lazy=False):
+        """
+        Iterate over the objects with the given handles, in the same order,
+        skipping the handles of objects which do not exist.
+
+        If lazy is True, lazy objects are returned.
+        """
+        for _, data in self._get_raw_data_many(obj_key, handles):
+            if lazy:
+                yield create_lazy(obj_class, data)
+            else:
+                yield obj_class.create(data)
+
+    def get_event_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(EVENT_KEY, Event, handles, lazy)
+
+    def get_family_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(FAMILY_KEY, Family, handles, lazy)
+
+    def get_repository_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(REPOSITORY_KEY, Repository, handles, lazy)
+
+    def get_person_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(PERSON_KEY, Person, handles, lazy)
+
+    def get_place_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(PLACE_KEY, Place, handles, lazy)
+
+    def get_citation_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(CITATION_KEY, Citation, handles, lazy)
+
+    def get_source_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(SOURCE_KEY, Source, handles, lazy)
+
+    def get_note_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(NOTE_KEY, Note, handles, lazy)
+
+    def get_media_from_handles(self, handles, lazy=False):
+        return self._get_from_handles(MEDIA_KEY, Media, handles, lazy)
+
+    def get_tag_from_handles(self, handles):
+        return self._get_from_handles(TAG_KEY, Tag, handles)
+
     ################################################################
     #
     # get_*_from_gramps_id methods
@@ -1778,6 +1884,55 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def get_raw_tag_data(self, handle):
         return self._get_raw_data(TAG_KEY, handle)
 
+    ################################################################
+    #
+    # get_raw_*_data_many methods
+    #
+    ################################################################
+
+    def _get_raw_data_many(self, obj_key, handles):
+        """
+        Iterate over (handle, raw data) pairs for the given handles, in the
+        same order, skipping the handles of objects which do not exist.
+
+        Backends should override this method to fetch the objects in
+        batches.
+        """
+        for handle in handles:
+            data = self._get_raw_data(obj_key, handle)
+            if data:
+                yield (handle, data)
+
+    def get_raw_event_data_many(self, handles):
+        return self._get_raw_data_many(EVENT_KEY, handles)
+
+    def get_raw_family_data_many(self, handles):
+        return self._get_raw_data_many(FAMILY_KEY, handles)
+
+    def get_raw_repository_data_many(self, handles):
+        return self._get_raw_data_many(REPOSITORY_KEY, handles)
+
+    def get_raw_person_data_many(self, handles):
+        return self._get_raw_data_many(PERSON_KEY, handles)
+
+    def get_raw_place_data_many(self, handles):
+        return self._get_raw_data_many(PLACE_KEY, handles)
+
+    def get_raw_citation_data_many(self, handles):
+        return self._get_raw_data_many(CITATION_KEY, handles)
+
+    def get_raw_source_data_many(self, handles):
+        return self._get_raw_data_many(SOURCE_KEY, handles)
+
+    def get_raw_note_data_many(self, handles):
+        return self._get_raw_data_many(NOTE_KEY, handles)
+
+    def get_raw_media_data_many(self, handles):
+        return self._get_raw_data_many(MEDIA_KEY, handles)
+
+    def get_raw_tag_data_many(self, handles):
+        return self._get_raw_data_many(TAG_KEY, handles)
+
     ################################################################
     #
     # get_raw_*_from_id_data methods
@@ -2663,6 +2818,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_18,
             gramps_upgrade_19,
             gramps_upgrade_20,
+            gramps_upgrade_21,
         )
 
         if version < 14:
@@ -2679,6 +2835,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_19(self)
         if version < 20:
             gramps_upgrade_20(self)
+        if version < 21:
+            gramps_upgrade_21(self)
 
         self.rebuild_secondary(callback)
         self.reindex_reference_map(callback)
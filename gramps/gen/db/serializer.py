@@ -0,0 +1,133 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Record serializers for the DB-API backends.
+
+The ``blob_data`` column of each primary table holds the tuple returned by
+the ``serialize`` method of the object.  Records written by different
+serializers can live side by side in the same table, as their first byte
+tells their format apart:
+
+- Records written by the :class:`PickleSerializer` are pickles of protocol
+  2 or later, which start with the ``PROTO`` opcode (``0x80``).
+- Records written by the :class:`MarshalSerializer` use version 4 of the
+  :mod:`marshal` format, which starts with the type code of a tuple.
+
+:func:`loads` inspects the first byte and decodes any record, whichever
+serializer is used for writing.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import marshal
+import pickle
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+MARSHAL_VERSION = 4
+
+# The type codes of a tuple and a small tuple in the marshal format, with
+# and without the flag of referenced objects.
+MARSHAL_TUPLE_CODES = frozenset(b"()\xa8\xa9")
+
+
+def loads(blob):
+    """
+    Decode a stored record, whichever serializer was used to write it.
+
+    :param blob: The stored record.
+    :type blob: bytes
+    :returns: The serialized object data.
+    :rtype: tuple
+    """
+    if blob[0] in MARSHAL_TUPLE_CODES:
+        return marshal.loads(blob)
+    return pickle.loads(blob)
+
+
+# -------------------------------------------------------------------------
+#
+# Serializer classes
+#
+# -------------------------------------------------------------------------
+class PickleSerializer:
+    """
+    Store records as pickles.  This is the format used by all versions of
+    Gramps with a DB-API backend.
+    """
+
+    name = "pickle"
+
+    @staticmethod
+    def dumps(data):
+        """
+        Encode serialized object data as a pickle.
+        """
+        return pickle.dumps(data)
+
+    loads = staticmethod(loads)
+
+
+class MarshalSerializer:
+    """
+    Store records in the marshal format of Python, which decodes faster
+    than pickles, but takes more space.
+
+    The version of the format is fixed, so that records are read back by
+    later versions of Python.  Data which is not a tuple, or which holds
+    types that marshal cannot encode, is stored as a pickle instead.
+    """
+
+    name = "marshal"
+
+    @staticmethod
+    def dumps(data):
+        """
+        Encode serialized object data in the marshal format.
+        """
+        if type(data) is tuple:
+            try:
+                return marshal.dumps(data, MARSHAL_VERSION)
+            except ValueError:
+                pass
+        return pickle.dumps(data)
+
+    loads = staticmethod(loads)
+
+
+SERIALIZERS = {
+    PickleSerializer.name: PickleSerializer,
+    MarshalSerializer.name: MarshalSerializer,
+}
+
+
+def get_serializer(name):
+    """
+    Return the serializer with the given name, or the pickle serializer if
+    the name is unknown.
+    """
+    return SERIALIZERS.get(name, PickleSerializer)()
@@ -58,6 +58,19 @@ _ = glocale.translation.gettext
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_21(self):
+    """
+    Upgrade from version 20 to 21.
+
+    The objects do not change.  Version 21 adds data derived from them to
+    the database backends, which older versions of Gramps do not keep up to
+    date: these must no longer open it.  The derived data is created, or
+    rebuilt if an older version changed the objects since, by
+    rebuild_secondary after the upgrade steps.
+    """
+    self.set_total(0)
+
+
 def gramps_upgrade_20(self):
     """
     Placeholder update.
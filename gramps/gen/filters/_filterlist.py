@@ -35,6 +35,7 @@ from collections import abc
 #
 # -------------------------------------------------------------------------
 from ._filterparser import FilterParser
+from .rules._rule import clear_prepared
 from ..plug import BasePluginManager
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -101,9 +102,11 @@ class FilterList:
         if namespace not in self.filter_namespaces:
             self.filter_namespaces[namespace] = []
         self.filter_namespaces[namespace].append(filt)
+        clear_prepared()
 
     def load(self):
         """load a custom filter"""
+        clear_prepared()
         try:
             if os.path.isfile(self.file):
                 parser = make_parser()
@@ -125,6 +128,7 @@ class FilterList:
 
     def save(self):
         """save the list of custom filters"""
+        clear_prepared()
         with open(self.file, "w", encoding="utf8") as file:
             file.write('<?xml version="1.0" encoding="utf-8"?>\n')
             file.write("<filters>\n")
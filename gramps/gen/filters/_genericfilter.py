@@ -24,6 +24,14 @@
 Package providing filtering framework for Gramps.
 """
 
+# ------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# ------------------------------------------------------------------------
+import logging
+from time import perf_counter
+
 # ------------------------------------------------------------------------
 #
 # Gramps imports
@@ -39,10 +47,59 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
+from ..lib.lazy import create_lazy
 from ..const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 
+# Filters are profiled when this logger is enabled for debug messages,
+# for example with the command line option "-d .filter".
+LOG = logging.getLogger(".filter")
+
+# Lowest probability that a rule decides the result of a filter, used when
+# the rules are ordered.
+MIN_PROBABILITY = 0.001
+
+
+def _get_rule_sql(rule):
+    """
+    Return the SQL predicate of a rule, or None if it has none or if it was
+    written for the apply method of a base class.
+    """
+    for cls in type(rule).__mro__:
+        if "get_sql" in cls.__dict__:
+            return rule.get_sql()
+        if "apply" in cls.__dict__:
+            return None
+    return None
+
+
+class _RuleProfile:
+    """
+    Wrap a rule to measure its applications while a filter is profiled.
+    """
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.count = 0
+        self.seconds = 0.0
+        self.matches = 0
+        self.sql = False
+
+    def get_sql(self):
+        sql = _get_rule_sql(self.rule)
+        self.sql = sql is not None
+        return sql
+
+    def apply(self, db, obj):
+        start = perf_counter()
+        result = self.rule.apply(db, obj)
+        self.seconds += perf_counter() - start
+        self.count += 1
+        if result:
+            self.matches += 1
+        return result
+
 
 # -------------------------------------------------------------------------
 #
@@ -69,6 +126,9 @@ class GenericFilter:
             self.comment = ""
             self.logical_op = "and"
             self.invert = False
+        # The rules in the order in which they are applied, while the filter
+        # is applied.
+        self._rules = None
 
     def match(self, handle, db):
         """
@@ -79,6 +139,20 @@ class GenericFilter:
         else:
             return False
 
+    def get_affected_handles(self, db, handles):
+        """
+        Return the handles of the objects whose match may change after the
+        objects with the given handles changed, or None if the rules cannot
+        tell them, see :meth:`.Rule.get_affected_handles`.
+        """
+        affected = set(handles)
+        for rule in self.flist:
+            rule_handles = rule.get_affected_handles(db, handles)
+            if rule_handles is None:
+                return None
+            affected.update(rule_handles)
+        return affected
+
     def is_empty(self):
         return (len(self.flist) == 0) or (
             len(self.flist) == 1 and ((self.flist[0].is_empty() and not self.invert))
@@ -123,6 +197,58 @@ class GenericFilter:
     def get_rules(self):
         return self.flist
 
+    def _get_logical_op(self):
+        if self.logical_op in GenericFilter.logical_functions:
+            return self.logical_op
+        return "and"
+
+    def _get_applied_rules(self):
+        if self._rules is None:
+            return self.flist
+        return self._rules
+
+    def get_active_rules(self):
+        """
+        Return the rules which can change the result of the filter.
+
+        Rules which match everything, see Rule.is_empty, do not change the
+        result of the "and" operator, and decide the result of the "or"
+        operator, so that the other rules need not be prepared.
+        """
+        logical_op = self._get_logical_op()
+        if logical_op == "and":
+            return [rule for rule in self.flist if not rule.is_empty()]
+        if logical_op == "or":
+            for rule in self.flist:
+                if rule.is_empty():
+                    return [rule]
+        return self.flist
+
+    def get_ordered_rules(self, rules):
+        """
+        Return the rules in the order in which they are best applied.
+
+        The "and" and "or" operators stop at the first rule which does not
+        match, or which matches.  For them, the rules are sorted by their
+        cost divided by the probability that they decide the result, so that
+        cheap and decisive rules come first.  The other operators apply all
+        the rules, in the order of the filter.
+        """
+        logical_op = self._get_logical_op()
+        if logical_op == "and":
+            return sorted(
+                rules,
+                key=lambda rule: rule.get_cost()
+                / max(1 - rule.get_selectivity(), MIN_PROBABILITY),
+            )
+        if logical_op == "or":
+            return sorted(
+                rules,
+                key=lambda rule: rule.get_cost()
+                / max(rule.get_selectivity(), MIN_PROBABILITY),
+            )
+        return list(rules)
+
     def get_cursor(self, db):
         return db.get_person_cursor()
 
@@ -143,10 +269,10 @@ class GenericFilter:
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
+            obj_class = self.make_obj().__class__
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
-                    person = self.make_obj()
-                    person.unserialize(data)
+                    person = create_lazy(obj_class, data)
                     if user:
                         user.step_progress()
                     if task(db, person) != self.invert:
@@ -168,14 +294,14 @@ class GenericFilter:
 
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
         final_list = []
-        flist = self.flist
+        flist = self._get_applied_rules()
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
+            obj_class = self.make_obj().__class__
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
-                    person = self.make_obj()
-                    person.unserialize(data)
+                    person = create_lazy(obj_class, data)
                     if user:
                         user.step_progress()
                     val = all(rule.apply(db, person) for rule in flist)
@@ -208,13 +334,13 @@ class GenericFilter:
 
     def xor_test(self, db, person):
         test = False
-        for rule in self.flist:
+        for rule in self._get_applied_rules():
             test = test ^ rule.apply(db, person)
         return test
 
     def one_test(self, db, person):
         found_one = False
-        for rule in self.flist:
+        for rule in self._get_applied_rules():
             if rule.apply(db, person):
                 if found_one:
                     return False  # There can be only one!
@@ -222,7 +348,7 @@ class GenericFilter:
         return found_one
 
     def or_test(self, db, person):
-        return any(rule.apply(db, person) for rule in self.flist)
+        return any(rule.apply(db, person) for rule in self._get_applied_rules())
 
     def get_check_func(self):
         try:
@@ -234,11 +360,78 @@ class GenericFilter:
     def check(self, db, handle):
         return self.get_check_func()(db, [handle])
 
+    def check_sql(self, db, user=None):
+        """
+        Apply the filter to all objects of the database, selecting them with
+        the SQL predicates of the rules.
+
+        With the "and" operator, the rules which can be expressed in SQL
+        select the candidates, and the other rules are only applied to them.
+        The other operators need all rules to be expressed in SQL.
+
+        :returns: the handles of the matching objects, or None if the filter
+                  must be applied to each object.
+        """
+        predicates = []
+        residual = []
+        for rule in self._get_applied_rules():
+            sql = _get_rule_sql(rule)
+            if sql is None:
+                residual.append(rule)
+            else:
+                predicates.append(sql)
+        logical_op = self._get_logical_op()
+        if not predicates or (residual and logical_op != "and"):
+            return None
+
+        clauses = [f"({where})" for where, dummy_args in predicates]
+        args = [arg for dummy_where, rule_args in predicates for arg in rule_args]
+        if logical_op == "and":
+            where = " AND ".join(clauses)
+        elif logical_op == "or":
+            where = " OR ".join(clauses)
+        else:
+            count = " + ".join(
+                f"(CASE WHEN {clause} THEN 1 ELSE 0 END)" for clause in clauses
+            )
+            if logical_op == "one":
+                where = f"({count}) = 1"
+            else:
+                where = f"({count}) % 2 = 1"
+
+        class_name = self.make_obj().__class__.__name__
+        handles = db.select_handles(class_name, where, args)
+        if handles is None:
+            return None
+        if residual:
+            if user:
+                user.begin_progress(_("Filter"), _("Applying ..."), len(handles))
+            final_list = []
+            for handle in handles:
+                obj = self.find_from_handle(db, handle)
+                if user:
+                    user.step_progress()
+                if all(rule.apply(db, obj) for rule in residual):
+                    final_list.append(handle)
+            if user:
+                user.end_progress()
+            handles = final_list
+        if self.invert:
+            # NOT in SQL would drop the rows for which a predicate is NULL
+            matches = set(handles)
+            handles = [
+                handle
+                for handle in db.select_handles(class_name)
+                if handle not in matches
+            ]
+        return handles
+
     def apply(self, db, id_list=None, tupleind=None, user=None, tree=False):
         """
         Apply the filter using db.
         If id_list given, the handles in id_list are used. If not given
-        a database cursor will be used over all entries.
+        a database cursor will be used over all entries, unless the rules
+        can select the entries in SQL, see :meth:`check_sql`.
 
         If tupleind is given, id_list is supposed to consist of a list of
         tuples, with the handle being index tupleind. So
@@ -252,13 +445,60 @@ class GenericFilter:
                 match the filter are returned as a list of handles
         """
         m = self.get_check_func()
-        for rule in self.flist:
+        rules = self.get_active_rules()
+        for rule in rules:
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
-        for rule in self.flist:
+        self._rules = self.get_ordered_rules(rules)
+        profiles = None
+        if __debug__ and LOG.isEnabledFor(logging.DEBUG):
+            profiles = [_RuleProfile(rule) for rule in self._rules]
+            self._rules = profiles
+            start = perf_counter()
+        try:
+            res = None
+            if id_list is None:
+                res = self.check_sql(db, user)
+            if res is None:
+                res = m(db, id_list, user, tupleind, tree)
+        finally:
+            self._rules = None
+        if profiles is not None:
+            self.log_profile(profiles, perf_counter() - start)
+        for rule in rules:
             rule.requestreset()
         return res
 
+    def log_profile(self, profiles, seconds):
+        """
+        Log the time and rejection rate of the rules of a profiled filter,
+        and record their measures to refine their estimated cost and
+        selectivity.
+        """
+        LOG.debug(
+            "Filter %r (%s%s): %.3f s",
+            self.name,
+            self._get_logical_op(),
+            ", inverted" if self.invert else "",
+            seconds,
+        )
+        for profile in profiles:
+            rule_name = type(profile.rule).__name__
+            if profile.sql:
+                LOG.debug("  %s: selected in SQL", rule_name)
+            elif profile.count:
+                LOG.debug(
+                    "  %s: %d objects, %.1f us per object, %.1f%% rejected",
+                    rule_name,
+                    profile.count,
+                    profile.seconds * 1e6 / profile.count,
+                    100 * (profile.count - profile.matches) / profile.count,
+                )
+                profile.rule.add_measure(
+                    profile.count, profile.seconds, profile.matches
+                )
+            else:
+                LOG.debug("  %s: not applied", rule_name)
+
 
 class GenericFamilyFilter(GenericFilter):
     def __init__(self, source=None):
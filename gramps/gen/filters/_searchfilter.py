@@ -32,6 +32,9 @@ class SearchFilter:
     def match(self, handle, db):
         return self.invert ^ (self.func(handle).upper().find(self.text) != -1)
 
+    def get_affected_handles(self, db, handles):
+        return set(handles)
+
 
 class ExactSearchFilter(SearchFilter):
     def __init__(self, func, text, invert):
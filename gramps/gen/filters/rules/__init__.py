@@ -50,6 +50,7 @@ _MatchesFilterBase           Object matches another filter
 _RegExpldBase                Object has Gramps Id matching regular expression
 
 Match on related objects
+_HandleMapBase               Object is in a set of handles, such as ancestors
 _MatchesFilterEventBase      Object has an event that matches another filter
 _MatchesSourceConfidenceBase Object with specific confidence on direct sources
 _MatchesSourceFilterBase     Object matches another filter on direct sources
@@ -77,6 +78,7 @@ from ._ispublic import IsPublic
 from ._hastextmatchingsubstringof import HasTextMatchingSubstringOf
 from ._hastextmatchingregexpof import HasTextMatchingRegexpOf
 from ._matchesfilterbase import MatchesFilterBase
+from ._handlemapbase import HandleMapBase
 from ._matcheseventfilterbase import MatchesEventFilterBase
 from ._matchessourceconfidencebase import MatchesSourceConfidenceBase
 from ._matchessourcefilterbase import MatchesSourceFilterBase
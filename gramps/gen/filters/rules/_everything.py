@@ -46,9 +46,15 @@ class Everything(Rule):
     name = "Every object"
     category = _("General filters")
     description = "Matches every object in the database"
+    cost = 0.1
+    selectivity = 1
+    local = True
 
     def is_empty(self):
         return True
 
     def apply(self, db, obj):
         return True
+
+    def get_sql(self):
+        return ("1 = 1", [])
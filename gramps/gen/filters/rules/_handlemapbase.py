@@ -0,0 +1,75 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+"""
+Rule that checks for an object in a set of handles computed by prepare.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from . import Rule
+
+
+# -------------------------------------------------------------------------
+#
+# HandleMapBase
+#
+# -------------------------------------------------------------------------
+class HandleMapBase(Rule):
+    """
+    Rule that checks for an object in a set of handles.
+
+    The prepare method of subclasses must bind the set of the matching
+    handles to the map attribute.
+    """
+
+    cost = 1
+    selectivity = 0.05
+    prepared_attributes = ("map",)
+
+    def __init__(self, arg, use_regex=False, use_case=False):
+        super().__init__(arg, use_regex, use_case)
+        self.map = set()
+        # the map of the last prepare, or None if the rule was not prepared
+        self.prepared_map = None
+
+    def requestprepare(self, db, user):
+        super().requestprepare(db, user)
+        self.prepared_map = self.map
+
+    def reset(self):
+        self.map = set()
+
+    def apply(self, db, obj):
+        return obj.handle in self.map
+
+    def get_affected_handles(self, db, handles):
+        """
+        The objects which enter or leave the map when the rule is prepared
+        again are affected, as well as the changed objects.
+        """
+        if self.prepared_map is None:
+            return None
+        prepared_map = self.prepared_map
+        self.requestprepare(db, None)
+        self.requestreset()
+        return (prepared_map ^ self.prepared_map).union(handles)
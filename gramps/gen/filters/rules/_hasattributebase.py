@@ -50,6 +50,7 @@ class HasAttributeBase(Rule):
     description = "Matches objects with the given attribute of a particular value"
     category = _("General filters")
     allow_regex = True
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
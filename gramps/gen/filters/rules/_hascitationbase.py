@@ -53,6 +53,7 @@ class HasCitationBase(Rule):
     description = _("Matches citations with particular parameters")
     category = _("Citation/source filters")
     allow_regex = True
+    local = True
 
     def prepare(self, db, user):
         self.date = None
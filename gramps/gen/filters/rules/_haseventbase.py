@@ -52,6 +52,7 @@ class HasEventBase(Rule):
     description = "Matches events with particular parameters"
     category = _("Event filters")
     allow_regex = True
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
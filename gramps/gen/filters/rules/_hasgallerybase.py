@@ -48,6 +48,7 @@ class HasGalleryBase(Rule):
     name = "Object with <count> Media references"
     description = "Matches objects with certain number of items in the gallery"
     category = _("General filters")
+    local = True
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
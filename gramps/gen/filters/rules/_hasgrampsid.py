@@ -48,6 +48,9 @@ class HasGrampsId(Rule):
     name = "Object with <Id>"
     description = "Matches objects with a specified Gramps ID"
     category = _("General filters")
+    cost = 0.5
+    selectivity = 0.001
+    local = True
 
     def apply(self, db, obj):
         """
@@ -55,3 +58,6 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def get_sql(self):
+        return ("gramps_id = ?", [self.list[0]])
@@ -51,6 +51,7 @@ class HasLDSBase(Rule):
     name = "Objects with LDS events"
     description = "Matches objects with LDS events"
     category = _("General filters")
+    local = True
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
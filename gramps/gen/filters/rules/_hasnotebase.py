@@ -49,6 +49,7 @@ class HasNoteBase(Rule):
     name = "Object with notes"
     description = "Matches objects that have a certain number of notes"
     category = _("General filters")
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         # Upgrade from pre 3.1 HasNote filter, use defaults that correspond
@@ -45,10 +45,18 @@ class HasNoteSubstrBase(Rule):
     name = "Objects having notes containing <substring>"
     description = "Matches objects whose notes contain text matching a " "substring"
     category = _("General filters")
+    local = True
+
+    def prepare(self, db, user):
+        # Notes which may contain the substring, if the database has a
+        # full-text index.
+        self.candidates = db.search_text("Note", self.list[0])
 
     def apply(self, db, person):
         notelist = person.get_note_list()
         for notehandle in notelist:
+            if self.candidates is not None and notehandle not in self.candidates:
+                continue
             note = db.get_note_from_handle(notehandle)
             n = note.get()
             if n.upper().find(self.list[0].upper()) != -1:
@@ -49,6 +49,7 @@ class HasSourceBase(Rule):
     description = "Matches sources with particular parameters"
     category = _("Citation/source filters")
     allow_regex = True
+    local = True
 
     def apply(self, db, source):
         if not self.match_substring(0, source.get_title()):
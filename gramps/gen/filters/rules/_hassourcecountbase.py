@@ -51,6 +51,7 @@ class HasSourceCountBase(Rule):
         "connected to it (actually citations are counted)"
     )
     category = _("Citation/source filters")
+    local = True
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
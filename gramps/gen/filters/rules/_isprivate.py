@@ -42,6 +42,12 @@ class IsPrivate(Rule):
     name = "Objects marked private"
     description = "Matches objects that are indicated as private"
     category = _("General filters")
+    cost = 0.2
+    selectivity = 0.05
+    local = True
 
     def apply(self, db, obj):
         return obj.get_privacy()
+
+    def get_sql(self):
+        return ("private = 1", [])
@@ -39,6 +39,12 @@ class IsPublic(Rule):
     name = "Objects not marked private"
     description = "Matches objects that are not indicated as private"
     category = _("General filters")
+    cost = 0.2
+    selectivity = 0.95
+    local = True
 
     def apply(self, db, obj):
         return not obj.get_privacy()
+
+    def get_sql(self):
+        return ("private = 0", [])
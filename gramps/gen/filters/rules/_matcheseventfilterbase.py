@@ -56,6 +56,7 @@ class MatchesEventFilterBase(MatchesFilterBase):
 
     # we want to have this filter show event filters
     namespace = "Event"
+    other_objects = True
 
     def prepare(self, db, user):
         MatchesFilterBase.prepare(self, db, user)
@@ -59,6 +59,12 @@ class MatchesFilterBase(Rule):
     name = "Objects matching the <filter>"
     description = "Matches objects matched by the specified filter name"
     category = _("General filters")
+    cost = 50
+    selectivity = 0.5
+    checking = False
+    # True if the filter is for other objects than the tested ones, for
+    # example for the events of the tested people.
+    other_objects = False
 
     def prepare(self, db, user):
         if gramps.gen.filters.CustomFilters:
@@ -93,6 +99,29 @@ class MatchesFilterBase(Rule):
                 return filt.check(db, obj.handle)
         return False
 
+    def get_affected_handles(self, db, handles):
+        """
+        The objects for which the result of the filter may change are
+        affected.  If the filter is for other objects, the changed objects
+        are affected as long as the result of the filter does not change
+        for any other object.
+        """
+        filt = self.find_filter()
+        if filt is None:
+            return set(handles)
+        if self.checking:
+            # the filter definition contains a loop
+            return None
+        self.checking = True
+        try:
+            if not self.other_objects:
+                return filt.get_affected_handles(db, handles)
+            if filt.get_affected_handles(db, []) == set():
+                return set(handles)
+            return None
+        finally:
+            self.checking = False
+
     def find_filter(self):
         """
         Return the selected filter or None.
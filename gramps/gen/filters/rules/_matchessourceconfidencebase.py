@@ -52,6 +52,7 @@ class MatchesSourceConfidenceBase(Rule):
         "Matches objects with at least one direct source with confidence level(s)"
     )
     category = _("Citation/source filters")
+    local = True
 
     def apply(self, db, obj):
         required_conf = int(self.list[0])
@@ -55,6 +55,7 @@ class MatchesSourceFilterBase(MatchesFilterBase):
 
     # we want to have this filter show source filters
     namespace = "Source"
+    other_objects = True
 
     def prepare(self, db, user):
         MatchesFilterBase.prepare(self, db, user)
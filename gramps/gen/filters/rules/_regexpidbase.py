@@ -55,6 +55,26 @@ class RegExpIdBase(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    cost = 0.5
+    selectivity = 0.1
+    local = True
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def get_sql(self):
+        """
+        Return the SQL predicate of the rule.  Substrings are only searched
+        in SQL when they are ASCII, as the SQL upper function only converts
+        ASCII letters.
+        """
+        if not self.list[0]:
+            return ("1 = 1", [])
+        if self.use_regex:
+            pattern = self.regex[0].pattern
+            if not self.use_case:
+                pattern = "(?i)" + pattern
+            return ("gramps_id REGEXP ?", [pattern])
+        if self.list[0].isascii():
+            return ("instr(upper(gramps_id), ?) > 0", [self.list[0].upper()])
+        return None
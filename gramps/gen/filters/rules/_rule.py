@@ -29,6 +29,7 @@ Base class for filter rules.
 #
 # -------------------------------------------------------------------------
 import re
+import weakref
 
 from ...errors import FilterError
 from ...const import GRAMPS_LOCALE as glocale
@@ -44,6 +45,27 @@ import logging
 
 LOG = logging.getLogger(".")
 
+# Number of measured applications of a rule class after which the measured
+# time and match rate replace the estimates of the class.
+MIN_MEASURES = 100
+
+# Measured applications of each rule class: [applications, seconds, matches]
+MEASURES = {}
+
+# Prepared state of the rules of each database, shared by the rules with the
+# same arguments: {db: {key: (change count, {attribute: value})}}
+PREPARED = weakref.WeakKeyDictionary()
+
+
+def clear_prepared():
+    """
+    Forget the prepared state of all rules.
+
+    It must be called when the definition of a custom filter changes, as the
+    state of the rules which use custom filters depends on it.
+    """
+    PREPARED.clear()
+
 
 # -------------------------------------------------------------------------
 #
@@ -58,6 +80,21 @@ class Rule:
     category = _("Miscellaneous filters")
     description = _("No description")
     allow_regex = False
+    # Estimated time of the apply method in microseconds, and estimated
+    # fraction of the objects which match.  They are used to order the rules
+    # of a filter.
+    cost = 10
+    selectivity = 0.5
+    # Attributes set by the prepare method which only depend on the arguments
+    # of the rule and on the objects of the database.  Their values are
+    # shared by the rules with the same arguments, and reused by later
+    # prepares until the database changes, see get_prepared_key.  The reset
+    # method must bind new values to them, and not change the shared ones.
+    prepared_attributes = ()
+    # True if the result of the rule for an object only depends on the object
+    # and on the objects it refers to, so that a change of an object cannot
+    # change the result for other objects, see get_affected_handles.
+    local = False
 
     def __init__(self, arg, use_regex=False, use_case=False):
         self.list = []
@@ -67,10 +104,43 @@ class Rule:
         self.use_regex = use_regex
         self.use_case = use_case
         self.nrprepare = 0
+        self.shared = False
 
     def is_empty(self):
         return False
 
+    @classmethod
+    def add_measure(cls, count, seconds, matches):
+        """
+        Record the time and the number of matches of count applications of
+        the rule.
+        """
+        measure = MEASURES.setdefault(cls, [0, 0.0, 0])
+        measure[0] += count
+        measure[1] += seconds
+        measure[2] += matches
+
+    def get_cost(self):
+        """
+        Return the time of the apply method in microseconds, measured if the
+        rule was applied often enough by profiled filters, else estimated.
+        """
+        measure = MEASURES.get(type(self))
+        if measure and measure[0] >= MIN_MEASURES:
+            return measure[1] * 1e6 / measure[0]
+        return self.cost
+
+    def get_selectivity(self):
+        """
+        Return the fraction of the objects which match the rule, measured if
+        the rule was applied often enough by profiled filters, else
+        estimated.
+        """
+        measure = MEASURES.get(type(self))
+        if measure and measure[0] >= MIN_MEASURES:
+            return measure[2] / measure[0]
+        return self.selectivity
+
     def requestprepare(self, db, user):
         """
         Request that the prepare method of the rule is executed if needed
@@ -95,7 +165,10 @@ class Rule:
                         except re.error:
                             self.regex[index] = re.compile("")
                 self.match_substring = self.match_regex
-            self.prepare(db, user)
+            self.shared = self.restore_prepared(db)
+            if not self.shared:
+                self.prepare(db, user)
+                self.store_prepared(db)
         self.nrprepare += 1
         if self.nrprepare > 20:  # more references to a filter than expected
             raise FilterError(
@@ -110,6 +183,69 @@ class Rule:
         """prepare so the rule can be executed efficiently"""
         pass
 
+    def get_affected_handles(self, db, handles):
+        """
+        Return the handles of the objects for which the result of the rule
+        may change after the objects with the given handles changed, or None
+        if they cannot be told.
+
+        The views only test these objects again.  The default is the changed
+        objects for local rules, and None for the other rules.
+        """
+        if self.local:
+            return set(handles)
+        return None
+
+    def get_prepared_key(self):
+        """
+        Return the key of the prepared state of the rule, or None if the
+        state cannot be shared.  Rules with the same key share their state.
+        """
+        try:
+            return (type(self), tuple(self.list), self.use_regex, self.use_case)
+        except TypeError:
+            return None
+
+    def restore_prepared(self, db):
+        """
+        Set the prepared attributes from the state stored by an earlier
+        prepare on the same database, and return True, or return False if
+        there is no such state or the database changed since.
+        """
+        if not self.prepared_attributes:
+            return False
+        key = self.get_prepared_key()
+        states = PREPARED.get(db)
+        if key is None or not states or key not in states:
+            return False
+        count, state = states[key]
+        if count is None or count != db.get_change_count():
+            del states[key]
+            return False
+        for name, value in state.items():
+            setattr(self, name, value)
+        return True
+
+    def store_prepared(self, db):
+        """
+        Store the prepared attributes, for later prepares of rules with the
+        same key.
+        """
+        if not self.prepared_attributes:
+            return
+        count = db.get_change_count()
+        key = self.get_prepared_key()
+        if count is None or key is None:
+            return
+        try:
+            states = PREPARED.setdefault(db, {})
+        except TypeError:  # the database cannot be weakly referenced
+            return
+        states[key] = (
+            count,
+            {name: getattr(self, name) for name in self.prepared_attributes},
+        )
+
     def requestreset(self):
         """
         Request that the reset method of the rule is executed if possible
@@ -123,7 +259,11 @@ class Rule:
         """
         self.nrprepare -= 1
         if self.nrprepare == 0:
-            self.reset()
+            if self.shared:
+                # the state is kept for the next prepare
+                self.shared = False
+            else:
+                self.reset()
 
     def reset(self):
         """remove no longer needed memory"""
@@ -154,6 +294,20 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def get_sql(self):
+        """
+        Return a SQL predicate which selects the same objects as the apply
+        method, as a (where, args) pair, or None if the rule cannot be
+        expressed in SQL.
+
+        The predicate may use the secondary columns of the table of the
+        objects and the reference table, see
+        :meth:`~gramps.gen.db.base.DbReadBase.select_handles`.  It is only
+        requested after the rule is prepared.  The predicate is ignored for
+        subclasses which override apply, but not get_sql.
+        """
+        return None
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = (
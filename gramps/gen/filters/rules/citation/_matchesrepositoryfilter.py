@@ -58,6 +58,7 @@ class MatchesRepositoryFilter(MatchesFilterBase):
 
     # we want to have this filter show repository filters
     namespace = "Repository"
+    other_objects = True
 
     def prepare(self, db, user):
         MatchesFilterBase.prepare(self, db, user)
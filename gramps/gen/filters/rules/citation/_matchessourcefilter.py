@@ -56,6 +56,7 @@ class MatchesSourceFilter(MatchesFilterBase):
 
     # we want to have this filter show source filters
     namespace = "Source"
+    other_objects = True
 
     def prepare(self, db, user):
         MatchesFilterBase.prepare(self, db, user)
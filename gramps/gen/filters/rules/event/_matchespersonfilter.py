@@ -58,6 +58,7 @@ class MatchesPersonFilter(MatchesFilterBase):
 
     # we want to have this filter show person filters
     namespace = "Person"
+    other_objects = True
 
     def prepare(self, db, user):
         MatchesFilterBase.prepare(self, db, user)
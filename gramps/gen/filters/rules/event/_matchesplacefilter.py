@@ -57,6 +57,7 @@ class MatchesPlaceFilter(MatchesFilterBase):
     category = _("General filters")
     # we want to have this filter show place filters
     namespace = "Place"
+    other_objects = True
 
     def apply(self, db, event):
         filt = self.find_filter()
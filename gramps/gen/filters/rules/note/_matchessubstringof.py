@@ -47,8 +47,15 @@ class MatchesSubstringOf(Rule):
     description = _("Matches notes that contain text " "which matches a substring")
     category = _("General filters")
 
+    def prepare(self, db, user):
+        # Notes which may contain the substring, if the database has a
+        # full-text index.
+        self.candidates = db.search_text("Note", self.list[0])
+
     def apply(self, db, note):
         """Apply the filter"""
+        if self.candidates is not None and note.handle not in self.candidates:
+            return False
         text = note.get()
         if text.upper().find(self.list[0].upper()) != -1:
             return True
@@ -141,6 +141,7 @@ class DeepRelationshipPathBetween(Rule):
         " target people.  Each path is not necessarily"
         " the shortest path."
     )
+    prepared_attributes = ("matches",)
 
     def prepare(self, db, user):
         root_person_id = self.list[0]
@@ -170,13 +171,13 @@ class DeepRelationshipPathBetween(Rule):
                 _("Evaluating people"),
                 db.get_number_of_people(),
             )
-        self.__matches = find_deep_relations(db, user, root_person, target_people)
+        self.matches = find_deep_relations(db, user, root_person, target_people)
         if user:
             user.end_progress()
 
     def reset(self):
         self.filt.requestreset()
-        self.__matches = set()
+        self.matches = set()
 
     def apply(self, db, person):
-        return person.get_handle() in self.__matches
+        return person.get_handle() in self.matches
@@ -49,6 +49,7 @@ class Disconnected(Rule):
         "Matches people that have no family relationships "
         "to any other person in the database"
     )
+    local = True
 
     def apply(self, db, person):
         return not (
@@ -46,9 +46,15 @@ class Everyone(Rule):
     name = _("Everyone")
     category = _("General filters")
     description = _("Matches everyone in the database")
+    cost = 0.1
+    selectivity = 1
+    local = True
 
     def is_empty(self):
         return True
 
     def apply(self, db, person):
         return True
+
+    def get_sql(self):
+        return ("1 = 1", [])
@@ -51,6 +51,7 @@ class HasAddress(Rule):
     name = _("People with <count> addresses")
     description = _("Matches people with a certain number of personal addresses")
     category = _("General filters")
+    local = True
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
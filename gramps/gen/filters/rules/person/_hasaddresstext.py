@@ -47,6 +47,7 @@ class HasAddressText(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    local = True
 
     def apply(self, db, person):
         for address in person.get_address_list():
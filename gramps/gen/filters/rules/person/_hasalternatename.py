@@ -47,6 +47,7 @@ class HasAlternateName(Rule):
     name = _("People with an alternate name")
     description = _("Matches people with an alternate name")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         if person.get_alternate_names():
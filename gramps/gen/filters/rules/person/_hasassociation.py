@@ -51,6 +51,7 @@ class HasAssociation(Rule):
     name = _("People with <count> associations")
     description = _("Matches people with a certain number of associations")
     category = _("General filters")
+    local = True
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
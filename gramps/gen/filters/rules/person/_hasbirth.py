@@ -52,6 +52,9 @@ class HasBirth(Rule):
     description = _("Matches people with birth data of a particular value")
     category = _("Event filters")
     allow_regex = True
+    cost = 20
+    selectivity = 0.5
+    local = True
 
     def prepare(self, db, user):
         if self.list[0]:
@@ -50,6 +50,9 @@ class HasCommonAncestorWith(Rule):
     description = _(
         "Matches people that have a common ancestor " "with a specified person"
     )
+    cost = 100
+    selectivity = 0.05
+    prepared_attributes = ("ancestor_cache", "with_people")
 
     def prepare(self, db, user):
         self.db = db
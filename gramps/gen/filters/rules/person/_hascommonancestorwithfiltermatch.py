@@ -52,6 +52,9 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
         "Matches people that have a common ancestor " "with anybody matched by a filter"
     )
     category = _("Ancestral filters")
+    # the matches depend on the definition of the sub-filter, which is not
+    # part of the prepared key
+    prepared_attributes = ()
 
     def __init__(self, list, use_regex=False, use_case=False):
         HasCommonAncestorWith.__init__(self, list, use_regex, use_case)
@@ -51,6 +51,7 @@ class HasFamilyEvent(Rule):
     description = _("Matches people with a family event of a particular value")
     category = _("Event filters")
     allow_regex = True
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
@@ -48,6 +48,7 @@ class HasNameOriginType(Rule):
     name = _("People with the <Surname origin type>")
     description = _("Matches people with a surname origin")
     category = _("General filters")
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
@@ -47,6 +47,7 @@ class HasOtherGender(Rule):
     name = _("People who are neither male nor female")
     category = _("General filters")
     description = _("Matches all people with other gender")
+    local = True
 
     def apply(self, db, person):
         return person.gender == Person.OTHER
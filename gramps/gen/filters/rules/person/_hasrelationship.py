@@ -52,6 +52,7 @@ class HasRelationship(Rule):
     name = _("People with the <relationships>")
     description = _("Matches people with a particular relationship")
     category = _("Family filters")
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
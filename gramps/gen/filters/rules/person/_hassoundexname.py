@@ -29,7 +29,7 @@ Rule that checks for full or partial name matches based on soundex.
 # -------------------------------------------------------------------------
 from ....const import GRAMPS_LOCALE as glocale
 from ....lib.nameorigintype import NameOriginType
-from ....soundex import soundex
+from ....soundex import SOUNDEX, soundex
 from .. import Rule
 
 _ = glocale.translation.sgettext
@@ -53,6 +53,9 @@ class HasSoundexName(Rule):
     )
     category = _("General filters")
     allow_regex = False
+    cost = 25
+    selectivity = 0.05
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
@@ -65,6 +68,16 @@ class HasSoundexName(Rule):
         if self.list[0]:
             self.soundex = soundex(self.list[0])
 
+    def get_sql(self):
+        # Empty parts of names, whose soundex is Z000, are not stored.
+        if not self.soundex or self.soundex == soundex(""):
+            return None
+        return (
+            "handle IN (SELECT obj_handle FROM person_phonetic "
+            "WHERE method = ? AND code = ?)",
+            [SOUNDEX, self.soundex],
+        )
+
     def apply(self, _db, obj):
         """
         Apply the rule. Return True on a match.
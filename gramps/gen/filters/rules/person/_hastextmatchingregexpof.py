@@ -55,4 +55,5 @@ class HasTextMatchingRegexpOf(HasTextMatchingSubstringOf):
         self.media_map = set()
         self.case_sensitive = False
         self.regexp_match = True
+        self.candidates = {}
         self.cache_sources()
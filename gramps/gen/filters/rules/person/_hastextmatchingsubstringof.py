@@ -51,6 +51,9 @@ class HasTextMatchingSubstringOf(Rule):
     description = _("Matches people whose records contain text " "matching a substring")
     category = _("General filters")
     allow_regex = True
+    cost = 150
+    selectivity = 0.05
+    local = True
 
     def prepare(self, db, user):
         self.db = db
@@ -68,6 +71,21 @@ class HasTextMatchingSubstringOf(Rule):
                 self.case_sensitive = False
         except IndexError:
             self.case_sensitive = False
+        # Objects which may contain the substring, by class name, if the
+        # database has a full-text index.
+        self.candidates = {}
+        if not self.use_regex:
+            for class_name in (
+                "Person",
+                "Family",
+                "Event",
+                "Place",
+                "Source",
+                "Citation",
+                "Media",
+                "Repository",
+            ):
+                self.candidates[class_name] = db.search_text(class_name, self.list[0])
         self.cache_repos()
         self.cache_sources()
 
@@ -239,6 +257,9 @@ class HasTextMatchingSubstringOf(Rule):
     def match_object(self, obj):
         if not obj:
             return False
+        candidates = self.candidates.get(obj.__class__.__name__)
+        if candidates is not None and obj.handle not in candidates:
+            return False
         if self.use_regex:
             return obj.matches_regexp(self.list[0], self.case_sensitive)
         return obj.matches_string(self.list[0], self.case_sensitive)
@@ -45,6 +45,7 @@ class HaveAltFamilies(Rule):
     name = _("Adopted people")
     description = _("Matches people who were adopted")
     category = _("Family filters")
+    local = True
 
     def apply(self, db, person):
         for fhandle in person.get_parent_family_handle_list():
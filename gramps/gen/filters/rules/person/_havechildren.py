@@ -47,6 +47,9 @@ class HaveChildren(Rule):
     name = _("People with children")
     description = _("Matches people who have children")
     category = _("Family filters")
+    cost = 30
+    selectivity = 0.4
+    local = True
 
     def apply(self, db, person):
         for family_handle in person.get_family_handle_list():
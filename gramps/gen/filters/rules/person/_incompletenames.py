@@ -46,6 +46,7 @@ class IncompleteNames(Rule):
     name = _("People with incomplete names")
     description = _("Matches people with firstname or lastname missing")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         for name in [person.get_primary_name()] + person.get_alternate_names():
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from .. import Rule
+from .. import HandleMapBase
 
 
 # -------------------------------------------------------------------------
@@ -40,7 +40,7 @@ from .. import Rule
 # IsAncestorOf
 #
 # -------------------------------------------------------------------------
-class IsAncestorOf(Rule):
+class IsAncestorOf(HandleMapBase):
     """Rule that checks for a person that is an ancestor of a specified person"""
 
     labels = [_("ID:"), _("Inclusive:")]
@@ -58,31 +58,7 @@ class IsAncestorOf(Rule):
             first = 1
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_ancestor_list(db, root_person, first)
+            if root_person:
+                self.map = db.get_ancestor_handles(root_person.handle, min_gen=first)
         except:
             pass
-
-    def reset(self):
-        self.map.clear()
-
-    def apply(self, db, person):
-        return person.handle in self.map
-
-    def init_ancestor_list(self, db, person, first):
-        if not person:
-            return
-        if person.handle in self.map:
-            return
-        if not first:
-            self.map.add(person.handle)
-        fam_id = person.get_main_parents_family_handle()
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.get_father_handle()
-                m_id = fam.get_mother_handle()
-
-                if f_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(f_id), 0)
-                if m_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(m_id), 0)
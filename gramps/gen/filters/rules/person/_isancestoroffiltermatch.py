@@ -51,6 +51,9 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
     description = _(
         "Matches people that are ancestors " "of anybody matched by a filter"
     )
+    # the matches depend on the definition of the sub-filter, which is not
+    # part of the prepared key
+    prepared_attributes = ()
 
     def prepare(self, db, user):
         self.db = db
@@ -75,13 +78,10 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
             if user:
                 user.step_progress()
             if self.filt.apply(db, person):
-                self.init_ancestor_list(db, person, first)
+                self.map |= db.get_ancestor_handles(person.handle, min_gen=first)
         if user:
             user.end_progress()
 
     def reset(self):
         self.filt.requestreset()
-        self.map.clear()
-
-    def apply(self, db, person):
-        return person.handle in self.map
+        self.map = set()
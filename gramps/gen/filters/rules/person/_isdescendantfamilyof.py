@@ -90,19 +90,23 @@ class IsDescendantFamilyOf(Rule):
                 # if we have been here before, skip
                 continue
             self.matches.add(person.handle)
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if family:
-                    # Add every child recursively
-                    for child_ref in family.get_child_ref_list():
-                        if child_ref:
-                            expand.append(self.db.get_person_from_handle(child_ref.ref))
-                    # Add spouse
-                    if person.handle == family.get_father_handle():
-                        spouse_handle = family.get_mother_handle()
-                    else:
-                        spouse_handle = family.get_father_handle()
-                    self.matches.add(spouse_handle)
+            for family in self.db.get_family_from_handles(
+                person.get_family_handle_list()
+            ):
+                # Add every child recursively
+                expand.extend(
+                    self.db.get_person_from_handles(
+                        child_ref.ref
+                        for child_ref in family.get_child_ref_list()
+                        if child_ref
+                    )
+                )
+                # Add spouse
+                if person.handle == family.get_father_handle():
+                    spouse_handle = family.get_mother_handle()
+                else:
+                    spouse_handle = family.get_father_handle()
+                self.matches.add(spouse_handle)
 
     def exclude(self):
         # This removes root person and his/her spouses from the matches set
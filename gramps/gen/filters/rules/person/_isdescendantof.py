@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from .. import Rule
+from .. import HandleMapBase
 
 
 # -------------------------------------------------------------------------
@@ -40,7 +40,7 @@ from .. import Rule
 # IsDescendantOf
 #
 # -------------------------------------------------------------------------
-class IsDescendantOf(Rule):
+class IsDescendantOf(HandleMapBase):
     """Rule that checks for a person that is a descendant
     of a specified person"""
 
@@ -53,30 +53,12 @@ class IsDescendantOf(Rule):
         self.db = db
         self.map = set()
         try:
-            first = False if int(self.list[1]) else True
+            first = 0 if int(self.list[1]) else 1
         except IndexError:
-            first = True
+            first = 1
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, first)
+            if root_person:
+                self.map = db.get_descendant_handles(root_person.handle, min_gen=first)
         except:
             pass
-
-    def reset(self):
-        self.map.clear()
-
-    def apply(self, db, person):
-        return person.handle in self.map
-
-    def init_list(self, person, first):
-        if not person or person.handle in self.map:
-            # if we have been here before, skip
-            return
-        if not first:
-            self.map.add(person.handle)
-
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(self.db.get_person_from_handle(child_ref.ref), 0)
@@ -51,6 +51,9 @@ class IsDescendantOfFilterMatch(IsDescendantOf):
     description = _(
         "Matches people that are descendants " "of anybody matched by a filter"
     )
+    # the matches depend on the definition of the sub-filter, which is not
+    # part of the prepared key
+    prepared_attributes = ()
 
     def prepare(self, db, user):
         self.db = db
@@ -75,13 +78,10 @@ class IsDescendantOfFilterMatch(IsDescendantOf):
             if user:
                 user.step_progress()
             if self.filt.apply(db, person):
-                self.init_list(person, first)
+                self.map |= db.get_descendant_handles(person.handle, min_gen=first)
         if user:
             user.end_progress()
 
     def reset(self):
         self.filt.requestreset()
-        self.map.clear()
-
-    def apply(self, db, person):
-        return person.handle in self.map
+        self.map = set()
@@ -47,6 +47,12 @@ class IsFemale(Rule):
     name = _("Females")
     category = _("General filters")
     description = _("Matches all females")
+    cost = 0.5
+    selectivity = 0.5
+    local = True
 
     def apply(self, db, person):
         return person.gender == Person.FEMALE
+
+    def get_sql(self):
+        return ("gender = ?", [Person.FEMALE])
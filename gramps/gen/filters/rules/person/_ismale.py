@@ -47,6 +47,12 @@ class IsMale(Rule):
     name = _("Males")
     category = _("General filters")
     description = _("Matches all males")
+    cost = 0.5
+    selectivity = 0.5
+    local = True
 
     def apply(self, db, person):
         return person.gender == Person.MALE
+
+    def get_sql(self):
+        return ("gender = ?", [Person.MALE])
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from .. import Rule
+from .. import HandleMapBase
 
 
 # -------------------------------------------------------------------------
@@ -40,7 +40,7 @@ from .. import Rule
 # IsMoreThanNthGenerationDescendantOf
 #
 # -------------------------------------------------------------------------
-class IsMoreThanNthGenerationDescendantOf(Rule):
+class IsMoreThanNthGenerationDescendantOf(HandleMapBase):
     """Rule that checks for a person that is a descendant of a specified person
     at least N generations away"""
 
@@ -57,26 +57,9 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
         self.map = set()
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, 0)
+            if root_person:
+                self.map = db.get_descendant_handles(
+                    root_person.handle, min_gen=int(self.list[1])
+                )
         except:
             pass
-
-    def reset(self):
-        self.map.clear()
-
-    def apply(self, db, person):
-        return person.handle in self.map
-
-    def init_list(self, person, gen):
-        if not person:
-            return
-        if gen >= int(self.list[1]):
-            self.map.add(person.handle)
-
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(
-                        self.db.get_person_from_handle(child_ref.ref), gen + 1
-                    )
@@ -49,6 +49,7 @@ class IsWitness(Rule):
     name = _("Witnesses")
     description = _("Matches people who are witnesses in any event")
     category = _("Event filters")
+    local = True
 
     def __init__(self, arg, use_regex=False, use_case=False):
         super().__init__(arg, use_regex, use_case)
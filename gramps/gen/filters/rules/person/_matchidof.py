@@ -47,6 +47,7 @@ class MatchIdOf(Rule):
     name = _("Person with <Id>")
     description = _("Matches person with a specified Gramps ID")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         return person.gramps_id.find(self.list[0]) != -1
@@ -49,6 +49,9 @@ class MissingParent(Rule):
         " or are not children in any family."
     )
     category = _("Family filters")
+    cost = 30
+    selectivity = 0.4
+    local = True
 
     def apply(self, db, person):
         families = person.get_parent_family_handle_list()
@@ -44,6 +44,7 @@ class MultipleMarriages(Rule):
     name = _("People with multiple marriage records")
     description = _("Matches people who have more than one spouse")
     category = _("Family filters")
+    local = True
 
     def apply(self, db, person):
         return len(person.get_family_handle_list()) > 1
@@ -44,6 +44,7 @@ class NeverMarried(Rule):
     name = _("People with no marriage records")
     description = _("Matches people who have no spouse")
     category = _("Family filters")
+    local = True
 
     def apply(self, db, person):
         return len(person.get_family_handle_list()) == 0
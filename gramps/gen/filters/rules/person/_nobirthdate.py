@@ -33,6 +33,7 @@ _ = glocale.translation.gettext
 #
 # -------------------------------------------------------------------------
 from .. import Rule
+from ....errors import HandleError
 
 
 # -------------------------------------------------------------------------
@@ -44,12 +45,16 @@ class NoBirthdate(Rule):
     name = _("People without a known birth date")
     description = _("Matches people without a known birthdate")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         birth_ref = person.get_birth_ref()
         if not birth_ref:
             return True
-        birth = db.get_event_from_handle(birth_ref.ref)
+        try:
+            birth = db.get_event_from_handle(birth_ref.ref)
+        except HandleError:
+            return True
         if birth:
             birth_obj = birth.get_date_object()
             if not birth_obj:
@@ -57,3 +62,6 @@ class NoBirthdate(Rule):
             if birth_obj.sortval == 0:
                 return True
         return False
+
+    def get_sql(self):
+        return ("birth_sortval IS NULL OR birth_sortval = 0", [])
@@ -33,6 +33,7 @@ _ = glocale.translation.gettext
 #
 # -------------------------------------------------------------------------
 from .. import Rule
+from ....errors import HandleError
 
 
 # -------------------------------------------------------------------------
@@ -44,12 +45,16 @@ class NoDeathdate(Rule):
     name = _("People without a known death date")
     description = _("Matches people without a known deathdate")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         death_ref = person.get_death_ref()
         if not death_ref:
             return True
-        death = db.get_event_from_handle(death_ref.ref)
+        try:
+            death = db.get_event_from_handle(death_ref.ref)
+        except HandleError:
+            return True
         if death:
             death_obj = death.get_date_object()
             if not death_obj:
@@ -57,3 +62,6 @@ class NoDeathdate(Rule):
             if death_obj.sortval == 0:
                 return True
         return False
+
+    def get_sql(self):
+        return ("death_sortval IS NULL OR death_sortval = 0", [])
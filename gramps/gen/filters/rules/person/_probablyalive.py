@@ -32,7 +32,8 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....config import config
+from ....utils.alive import get_alive_map
 from .. import Rule
 from ....datehandler import parser
 
@@ -47,12 +48,31 @@ class ProbablyAlive(Rule):
     name = _("People probably alive")
     description = _("Matches people without indications of death that are not too old")
     category = _("General filters")
+    cost = 150
+    selectivity = 0.35
+    prepared_attributes = ("current_date", "alive")
 
     def prepare(self, db, user):
         try:
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        self.alive = get_alive_map(db, self.current_date)
+
+    def get_prepared_key(self):
+        # the results depend on the limits set in the preferences
+        key = super().get_prepared_key()
+        if key is None:
+            return None
+        return (
+            key,
+            config.get("behavior.max-age-prob-alive"),
+            config.get("behavior.max-sib-age-diff"),
+            config.get("behavior.avg-generation-gap"),
+        )
+
+    def reset(self):
+        self.alive = None
 
     def apply(self, db, person):
-        return probably_alive(person, db, self.current_date)
+        return self.alive[person.handle][0]
@@ -52,6 +52,7 @@ class RegExpName(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    local = True
 
     def apply(self, db, person):
         for name in [person.get_primary_name()] + person.get_alternate_names():
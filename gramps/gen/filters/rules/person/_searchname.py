@@ -48,6 +48,7 @@ class SearchName(Rule):
     name = _("People matching the <name>")
     description = _("Matches people with a specified (partial) name")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         src = self.list[0].upper()
@@ -57,6 +57,7 @@ class MatchesEventFilter(MatchesFilterBase):
     category = _("General filters")
     # we want to have this filter show event filters
     namespace = "Event"
+    other_objects = True
 
     def apply(self, db, event):
         filt = self.find_filter()
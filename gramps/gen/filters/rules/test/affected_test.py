@@ -0,0 +1,194 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the objects affected by a change, see Rule.get_affected_handles
+"""
+
+import os
+import unittest
+
+from ....const import CUSTOM_FILTERS, DATA_DIR
+from ....db import DbTxn
+from ....db.utils import import_as_dict
+from ....filters import FilterList, GenericFilter, GenericFilterFactory, SearchFilter
+from ....user import User
+from .... import filters
+
+from .. import _rule
+from ..event import HasIdOf, MatchesPersonFilter
+from ..person import (
+    HasNameOf,
+    HasTag,
+    IsAncestorOf,
+    IsAncestorOfFilterMatch,
+    IsDescendantOf,
+    IsLessThanNthGenerationAncestorOf,
+    IsMale,
+    IsMoreThanNthGenerationDescendantOf,
+    MatchesEventFilter,
+    MatchesFilter,
+    ProbablyAlive,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class AffectedTest(unittest.TestCase):
+    """
+    Test which objects the views test again after a change.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def setUp(self):
+        _rule.clear_prepared()
+        self.custom_filters = filters.CustomFilters
+        filters.CustomFilters = FilterList(CUSTOM_FILTERS)
+
+    def tearDown(self):
+        filters.CustomFilters = self.custom_filters
+
+    def make_filter(self, rules, name=None, namespace="Person"):
+        filter_ = GenericFilterFactory(namespace)()
+        filter_.set_rules(rules)
+        if name:
+            filter_.set_name(name)
+            filters.CustomFilters.add(namespace, filter_)
+        return filter_
+
+    def set_parents(self, person, family, child_refs, family_handles):
+        """
+        Change the children of the family and the parent families of the
+        person, and return the handles of the changed people.
+        """
+        with DbTxn("Set parents", self.db) as trans:
+            family.set_child_ref_list(child_refs)
+            person.set_parent_family_handle_list(family_handles)
+            self.db.commit_family(family, trans)
+            self.db.commit_person(person, trans)
+        return [person.handle]
+
+    def check_affected(self, filter_):
+        """
+        Remove I0044 from the children of his parents, and add him again,
+        and check that the objects for which the filter changes are
+        affected.
+        """
+        person = self.db.get_person_from_gramps_id("I0044")
+        family_handles = person.get_parent_family_handle_list()
+        family = self.db.get_family_from_handle(family_handles[0])
+        child_refs = family.get_child_ref_list()
+        before = set(filter_.apply(self.db))
+        handles = self.set_parents(
+            person,
+            family,
+            [child_ref for child_ref in child_refs if child_ref.ref != person.handle],
+            family_handles[1:],
+        )
+        try:
+            affected = filter_.get_affected_handles(self.db, handles)
+            after = set(filter_.apply(self.db))
+            self.assertNotEqual(before, after)
+            self.assertLessEqual(before ^ after, affected)
+            self.assertLess(len(affected), self.db.get_number_of_people())
+        finally:
+            handles = self.set_parents(person, family, child_refs, family_handles)
+        affected = filter_.get_affected_handles(self.db, handles)
+        self.assertLessEqual(before ^ after, affected)
+        self.assertEqual(set(filter_.apply(self.db)), before)
+
+    def test_rules(self):
+        self.assertEqual(IsMale([]).get_affected_handles(self.db, ["a"]), {"a"})
+        self.assertEqual(HasTag(["ToDo"]).get_affected_handles(self.db, ["a"]), {"a"})
+        rule = HasNameOf(["", "Smith"] + [""] * 11)
+        self.assertEqual(rule.get_affected_handles(self.db, ["a"]), {"a"})
+        self.assertIsNone(ProbablyAlive(["1900"]).get_affected_handles(self.db, ["a"]))
+
+    def test_not_prepared(self):
+        rule = IsAncestorOf(["I0044", "1"])
+        self.assertIsNone(rule.get_affected_handles(self.db, ["a"]))
+
+    def test_filter(self):
+        self.assertEqual(
+            self.make_filter([]).get_affected_handles(self.db, ["a"]), {"a"}
+        )
+        filter_ = self.make_filter([IsMale([]), HasTag(["ToDo"])])
+        self.assertEqual(filter_.get_affected_handles(self.db, ["a"]), {"a"})
+        filter_ = self.make_filter([IsMale([]), ProbablyAlive(["1900"])])
+        self.assertIsNone(filter_.get_affected_handles(self.db, ["a"]))
+
+    def test_search(self):
+        filter_ = SearchFilter(str, "smith", False)
+        self.assertEqual(filter_.get_affected_handles(self.db, ["a"]), {"a"})
+
+    def test_ancestors(self):
+        self.check_affected(self.make_filter([IsAncestorOf(["I0044", "1"])]))
+        self.check_affected(
+            self.make_filter([IsLessThanNthGenerationAncestorOf(["I0044", "5"])])
+        )
+
+    def test_descendants(self):
+        person = self.db.get_person_from_gramps_id("I0044")
+        family = self.db.get_family_from_handle(person.get_main_parents_family_handle())
+        father = self.db.get_person_from_handle(family.get_father_handle())
+        self.check_affected(self.make_filter([IsDescendantOf([father.gramps_id, "1"])]))
+        self.check_affected(
+            self.make_filter(
+                [IsMoreThanNthGenerationDescendantOf([father.gramps_id, "2"])]
+            )
+        )
+
+    def test_filter_match(self):
+        self.make_filter([HasIdOf(["I0044"])], "Base")
+        self.check_affected(self.make_filter([IsAncestorOfFilterMatch(["Base", "1"])]))
+
+    def test_nested(self):
+        self.make_filter([IsMale([])], "Men")
+        self.make_filter([IsAncestorOf(["I0044", "1"])], "Ancestors")
+        filter_ = self.make_filter([MatchesFilter(["Men"])])
+        self.assertEqual(filter_.get_affected_handles(self.db, ["a"]), {"a"})
+        filter_ = self.make_filter([MatchesFilter(["Unknown"])])
+        self.assertEqual(filter_.get_affected_handles(self.db, ["a"]), {"a"})
+        self.check_affected(self.make_filter([MatchesFilter(["Ancestors"])]))
+
+    def test_loop(self):
+        self.make_filter([IsMale([]), MatchesFilter(["Loop"])], "Loop")
+        filter_ = self.make_filter([MatchesFilter(["Loop"])])
+        self.assertIsNone(filter_.get_affected_handles(self.db, ["a"]))
+
+    def test_other_objects(self):
+        self.make_filter([HasIdOf(["E0001"])], "Event", "Event")
+        self.make_filter([ProbablyAlive(["1900"])], "Alive")
+        self.make_filter([MatchesPersonFilter(["Alive", "0"])], "Living", "Event")
+        filter_ = self.make_filter([MatchesEventFilter(["Event"])])
+        self.assertEqual(filter_.get_affected_handles(self.db, ["a"]), {"a"})
+        filter_ = self.make_filter([MatchesEventFilter(["Living"])])
+        self.assertIsNone(filter_.get_affected_handles(self.db, ["a"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
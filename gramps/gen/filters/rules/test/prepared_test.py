@@ -0,0 +1,176 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the prepared state shared by the rules
+"""
+
+import os
+import unittest
+from unittest import mock
+
+from ....db import DbTxn
+from ....db.utils import import_as_dict
+from .... import filters
+from ....filters import GenericFilter, reload_custom_filters
+from ....const import DATA_DIR
+from ....proxy import LivingProxyDb
+from ....user import User
+
+from .. import _rule
+from ..person import (
+    HasIdOf,
+    IsAncestorOf,
+    IsAncestorOfFilterMatch,
+    IsDescendantOfFilterMatch,
+    IsMale,
+    ProbablyAlive,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class PreparedTest(unittest.TestCase):
+    """
+    Test the sharing of the prepared state of rules between filters.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def setUp(self):
+        _rule.clear_prepared()
+
+    def filter_with_rule(self, rule, db=None):
+        """
+        Apply a new filter with the rule to the database.
+        """
+        filter_ = GenericFilter()
+        filter_.add_rule(rule)
+        return set(filter_.apply(db or self.db))
+
+    def count_prepares(self, *rules, db=None):
+        """
+        Apply filters with the rules, and return the results and the number
+        of prepares of the ancestor rules.
+        """
+        with mock.patch.object(
+            IsAncestorOf, "prepare", autospec=True, side_effect=IsAncestorOf.prepare
+        ) as prepare:
+            results = [self.filter_with_rule(rule, db) for rule in rules]
+        return results, prepare.call_count
+
+    def test_shared(self):
+        results, prepares = self.count_prepares(
+            IsAncestorOf(["I0044", "1"]), IsAncestorOf(["I0044", "1"])
+        )
+        self.assertEqual(prepares, 1)
+        self.assertEqual(results[0], results[1])
+        self.assertIn(self.db.get_person_from_gramps_id("I0044").handle, results[0])
+
+    def test_arguments(self):
+        results, prepares = self.count_prepares(
+            IsAncestorOf(["I0044", "1"]), IsAncestorOf(["I0044", "0"])
+        )
+        self.assertEqual(prepares, 2)
+        self.assertEqual(len(results[0]), len(results[1]) + 1)
+
+    def test_changed(self):
+        rule = IsAncestorOf(["I0044", "0"])
+        results, prepares = self.count_prepares(rule)
+        person = self.db.get_person_from_gramps_id("I0044")
+        family = self.db.get_family_from_handle(person.get_main_parents_family_handle())
+        with DbTxn("Remove father", self.db) as trans:
+            father_handle = family.get_father_handle()
+            family.set_father_handle(None)
+            self.db.commit_family(family, trans)
+            self.assertIsNone(self.db.get_change_count())
+        try:
+            changed, prepares = self.count_prepares(rule)
+            self.assertEqual(prepares, 1)
+            self.assertNotIn(father_handle, changed[0])
+            self.assertIn(father_handle, results[0])
+        finally:
+            with DbTxn("Restore father", self.db) as trans:
+                family.set_father_handle(father_handle)
+                self.db.commit_family(family, trans)
+
+    def test_proxy(self):
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_INCLUDE_ALL)
+        self.assertIsNone(proxy.get_change_count())
+        rule = IsAncestorOf(["I0044", "1"])
+        _results, prepares = self.count_prepares(rule, rule, db=proxy)
+        self.assertEqual(prepares, 2)
+
+    def test_nested(self):
+        filter_ = GenericFilter()
+        filter_.add_rule(IsAncestorOf(["I0044", "1"]))
+        filter_.add_rule(IsMale([]))
+        with mock.patch.object(
+            IsAncestorOf, "reset", autospec=True, side_effect=IsAncestorOf.reset
+        ) as reset:
+            first = set(filter_.apply(self.db))
+            second = set(filter_.apply(self.db))
+        self.assertEqual(first, second)
+        # the shared state is not reset
+        self.assertEqual(reset.call_count, 1)
+
+    def test_filter_match(self):
+        base = GenericFilter()
+        base.add_rule(HasIdOf(["I0044"]))
+        base.set_name("PreparedBase")
+        if filters.CustomFilters is None:
+            reload_custom_filters()
+        custom = filters.CustomFilters.get_filters_dict("Person")
+        custom["PreparedBase"] = base
+        try:
+            for rule_class in (IsAncestorOfFilterMatch, IsDescendantOfFilterMatch):
+                rule = rule_class(["PreparedBase", "1"])
+                first = self.filter_with_rule(rule)
+                second = self.filter_with_rule(rule)
+                self.assertIn(self.db.get_person_from_gramps_id("I0044").handle, first)
+                self.assertEqual(first, second)
+                # a changed sub-filter changes the matches
+                base.set_rules([HasIdOf(["I0001"])])
+                changed = self.filter_with_rule(rule)
+                base.set_rules([HasIdOf(["I0044"])])
+                self.assertNotEqual(first, changed)
+        finally:
+            del custom["PreparedBase"]
+
+    def test_results(self):
+        with mock.patch.object(
+            _rule.PREPARED, "get", side_effect=_rule.PREPARED.get
+        ) as get:
+            first = self.filter_with_rule(ProbablyAlive(["1900"]))
+            second = self.filter_with_rule(ProbablyAlive(["1900"]))
+        self.assertEqual(first, second)
+        self.assertEqual(get.call_count, 2)
+        ((_count, state),) = _rule.PREPARED[self.db].values()
+        self.assertEqual(len(state["alive"]), self.db.get_number_of_people())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the ordering and profiling of the rules of a filter
+"""
+
+import os
+import unittest
+
+from ....db.utils import import_as_dict
+from ....filters import GenericFilter
+from ....const import DATA_DIR
+from ....user import User
+
+from .. import _rule
+from ..person import (
+    Everyone,
+    HasNickname,
+    HasTextMatchingSubstringOf,
+    IsFemale,
+    IsMale,
+    MissingParent,
+    PeoplePrivate,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class PreparedRule(MissingParent):
+    """
+    Rule which counts how often it is prepared.
+    """
+
+    prepared = 0
+
+    def prepare(self, db, user):
+        PreparedRule.prepared += 1
+
+
+class RuleOrderTest(unittest.TestCase):
+    """
+    Test the ordering and profiling of the rules of a filter.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def setUp(self):
+        PreparedRule.prepared = 0
+        _rule.MEASURES.clear()
+
+    def tearDown(self):
+        _rule.MEASURES.clear()
+
+    def make_filter(self, rules, l_op="and", invert=False):
+        filter_ = GenericFilter()
+        filter_.set_rules(rules)
+        filter_.set_logical_op(l_op)
+        filter_.set_invert(invert)
+        return filter_
+
+    def matches(self, rules, l_op):
+        """
+        Return the people matching the rules, applied in the given order
+        without short-circuit.
+        """
+        for rule in rules:
+            rule.requestprepare(self.db, None)
+        result = set()
+        for person in self.db.iter_people():
+            values = [rule.apply(self.db, person) for rule in rules]
+            if (l_op == "and" and all(values)) or (l_op == "or" and any(values)):
+                result.add(person.handle)
+        for rule in rules:
+            rule.requestreset()
+        return result
+
+    def test_order(self):
+        text = HasTextMatchingSubstringOf(["Garner", "0"])
+        male = IsMale([])
+        private = PeoplePrivate([])
+        filter_ = self.make_filter([text, male, private])
+        self.assertEqual(
+            filter_.get_ordered_rules(filter_.flist), [private, male, text]
+        )
+        filter_.set_logical_op("or")
+        self.assertEqual(
+            filter_.get_ordered_rules(filter_.flist), [male, private, text]
+        )
+        filter_.set_logical_op("one")
+        self.assertEqual(
+            filter_.get_ordered_rules(filter_.flist), [text, male, private]
+        )
+
+    def test_results(self):
+        rules = [HasNickname([]), MissingParent([]), IsFemale([])]
+        for l_op in ("and", "or"):
+            with self.subTest(l_op=l_op):
+                filter_ = self.make_filter(rules, l_op)
+                self.assertEqual(set(filter_.apply(self.db)), self.matches(rules, l_op))
+
+    def test_active_rules(self):
+        rule = PreparedRule([])
+        filter_ = self.make_filter([Everyone([]), rule])
+        self.assertEqual(filter_.get_active_rules(), [rule])
+        self.assertEqual(set(filter_.apply(self.db)), self.matches([rule], "and"))
+
+        PreparedRule.prepared = 0
+        filter_.set_logical_op("or")
+        self.assertEqual(len(filter_.apply(self.db)), self.db.get_number_of_people())
+        self.assertEqual(PreparedRule.prepared, 0)
+
+    def test_profile(self):
+        filter_ = self.make_filter([MissingParent([]), IsMale([])])
+        with self.assertLogs(".filter", "DEBUG") as logs:
+            results = filter_.apply(self.db)
+        self.assertEqual(set(results), self.matches(filter_.flist, "and"))
+        self.assertEqual(len(logs.output), 3)
+        self.assertIn("IsMale: selected in SQL", logs.output[1])
+        self.assertIn("MissingParent:", logs.output[2])
+        self.assertIn("rejected", logs.output[2])
+
+        # MissingParent was applied to the males only
+        count, seconds, matches = _rule.MEASURES[MissingParent]
+        self.assertEqual(count, len(self.matches([IsMale([])], "and")))
+        rule = MissingParent([])
+        self.assertEqual(rule.get_cost(), seconds * 1e6 / count)
+        self.assertEqual(rule.get_selectivity(), matches / count)
+        self.assertEqual(IsMale([]).get_cost(), IsMale.cost)
+
+
+if __name__ == "__main__":
+    unittest.main()
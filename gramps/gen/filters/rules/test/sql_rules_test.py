@@ -0,0 +1,139 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that compares the rules selected in SQL with the rules applied to
+each object
+"""
+
+import os
+import unittest
+from unittest import mock
+
+from ....db.utils import import_as_dict
+from ....filters import GenericFilterFactory
+from ....const import DATA_DIR
+from ....user import User
+
+from ..citation import HasSourceIdOf
+from ..event import EventPrivate, HasType, RegExpIdOf as EventRegExpIdOf
+from ..person import (
+    ChangedSince,
+    HasIdOf,
+    HasNickname,
+    HasTag,
+    HasUnknownGender,
+    IsFemale,
+    IsMale,
+    PeoplePrivate,
+    PeoplePublic,
+    RegExpIdOf,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+PERSON_RULES = [
+    HasIdOf(["I0044"]),
+    RegExpIdOf(["i00[1-3]"], use_regex=True),
+    RegExpIdOf(["I00[1-3]"], use_regex=True, use_case=True),
+    RegExpIdOf(["i004"]),
+    RegExpIdOf([""]),
+    HasTag(["ToDo"]),
+    HasTag(["No such tag"]),
+    ChangedSince(["2013-11-09", ""]),
+    ChangedSince(["2010-01-01", "2013-01-01"]),
+    ChangedSince(["", "2010-01-01"]),
+    IsMale([]),
+    IsFemale([]),
+    HasUnknownGender([]),
+    PeoplePrivate([]),
+    PeoplePublic([]),
+]
+
+
+class SqlRulesTest(unittest.TestCase):
+    """
+    Compare the objects selected in SQL with the objects matching the rules.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def filter_with_rules(self, namespace, rules, l_op, invert):
+        filter_ = GenericFilterFactory(namespace)()
+        filter_.set_rules(rules)
+        filter_.set_logical_op(l_op)
+        filter_.set_invert(invert)
+        return filter_
+
+    def compare(self, namespace, rules, l_op="and", invert=False, sql=True):
+        """
+        Apply the filter to all objects, and to the list of their handles,
+        which is never done in SQL.
+        """
+        filter_ = self.filter_with_rules(namespace, rules, l_op, invert)
+        handles = list(self.db.method("iter_%s_handles", namespace)())
+        with mock.patch.object(
+            self.db, "select_handles", wraps=self.db.select_handles
+        ) as select_handles:
+            results = filter_.apply(self.db)
+        self.assertEqual(select_handles.called, sql)
+        self.assertEqual(set(results), set(filter_.apply(self.db, handles)))
+        self.assertEqual(len(results), len(set(results)))
+        return results
+
+    def test_single_rules(self):
+        for rule in PERSON_RULES:
+            for invert in (False, True):
+                with self.subTest(rule=rule, invert=invert):
+                    self.compare("Person", [rule], invert=invert)
+
+    def test_rules(self):
+        self.assertTrue(self.compare("Person", [IsMale([]), RegExpIdOf(["I00"])]))
+        for l_op in ("and", "or", "one", "xor"):
+            for invert in (False, True):
+                with self.subTest(l_op=l_op, invert=invert):
+                    self.compare("Person", PERSON_RULES[5:10], l_op, invert)
+
+    def test_residual_rules(self):
+        rules = [IsFemale([]), HasNickname([]), ChangedSince(["2010-01-01", ""])]
+        self.assertTrue(self.compare("Person", rules))
+        self.compare("Person", rules, invert=True)
+        self.compare("Person", rules, "or", sql=False)
+
+    def test_other_classes(self):
+        self.compare("Event", [EventRegExpIdOf(["E01"]), EventPrivate([])], "or")
+        self.compare("Event", [EventRegExpIdOf(["E01"]), HasType(["Birth"])])
+
+    def test_overridden_apply(self):
+        source_id = self.db.get_source_from_handle(
+            next(self.db.iter_source_handles())
+        ).gramps_id
+        results = self.compare("Citation", [HasSourceIdOf([source_id])], sql=False)
+        self.assertTrue(results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -135,6 +135,21 @@ class BaseObject(metaclass=ABCMeta):
         """
         return []
 
+    def get_text_data_list_recursively(self):
+        """
+        Return the list of all textual attributes of the object and of its
+        child objects, which are the texts searched by :meth:`matches_string`.
+
+        :returns: Returns the list of all non-empty textual attributes.
+        :rtype: list
+        """
+        ret = [item for item in self.get_text_data_list() if item]
+
+        # Run through child objects
+        for obj in self.get_text_data_child_list():
+            ret += obj.get_text_data_list_recursively()
+        return ret
+
     def get_referenced_handles(self):
         """
         Return the list of (classname, handle) tuples for all directly
@@ -0,0 +1,296 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Lazy primary objects.
+
+A lazy object is created from the serialized data of a primary object, but
+only the simple fields, whose serialized value is also their attribute value
+(handle, Gramps ID, change time, privacy, ...), are set when it is created.
+The secondary objects (names, event references, dates, ...) are unpacked the
+first time any other attribute is accessed.
+
+Lazy objects are instances of a subclass of the primary object class, with
+the same class name, so they can be used wherever the primary object is
+expected.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .citation import Citation
+from .event import Event
+from .family import Family
+from .media import Media
+from .note import Note
+from .person import Person
+from .place import Place
+from .repo import Repository
+from .src import Source
+
+
+# -------------------------------------------------------------------------
+#
+# LazyObject
+#
+# -------------------------------------------------------------------------
+class LazyObject:
+    """
+    Mixin class for lazy primary objects.
+
+    The subclasses set LAZY_CLASS to the primary object class, and list the
+    simple fields in LAZY_FIELDS, as (attribute name, index in serialized
+    data) pairs.  LAZY_DEFAULTS holds the attributes which are set by the
+    constructor, but not by the unserialize method.
+    """
+
+    LAZY_CLASS = None
+    LAZY_FIELDS = ()
+    LAZY_DEFAULTS = {}
+
+    def __getattr__(self, name):
+        """
+        Only called for attributes which are not set yet.  Unpack the object
+        and try again.
+        """
+        if name.startswith("__") or not self.unpack():
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        return getattr(self, name)
+
+    def __reduce_ex__(self, protocol):
+        """
+        Copy and pickle lazy objects as regular objects.
+        """
+        self.unpack()
+        return (self.LAZY_CLASS.create, (self.serialize(),))
+
+    def unpack(self):
+        """
+        Unpack the secondary objects from the serialized data.
+
+        Attributes which were set before the object is unpacked are kept.
+
+        :returns: True if the object was unpacked, False if it was already.
+        :rtype: bool
+        """
+        data = self.__dict__.pop("_lazy_data", None)
+        if data is None:
+            return False
+        values = dict(self.__dict__)
+        self.__dict__.update(self.LAZY_DEFAULTS)
+        self.unserialize(data)
+        self.__dict__.update(values)
+        return True
+
+    def is_unpacked(self):
+        """
+        Return True if the secondary objects are unpacked.
+        """
+        return "_lazy_data" not in self.__dict__
+
+
+def _lazy_class(obj_class, fields):
+    """
+    Create the lazy subclass of a primary object class.
+    """
+    new_obj = obj_class()
+    unserialized = obj_class.__new__(obj_class).unserialize(new_obj.serialize())
+    defaults = {
+        name: value
+        for name, value in new_obj.__dict__.items()
+        if name not in unserialized.__dict__
+    }
+    return type(
+        obj_class.__name__,
+        (LazyObject, obj_class),
+        {
+            "__module__": __name__,
+            "__qualname__": "Lazy" + obj_class.__name__,
+            "__doc__": f"Lazy {obj_class.__name__} object.",
+            "LAZY_CLASS": obj_class,
+            "LAZY_FIELDS": fields,
+            "LAZY_DEFAULTS": defaults,
+        },
+    )
+
+
+LazyPerson = _lazy_class(
+    Person,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("_Person__gender", 2),
+        ("death_ref_index", 5),
+        ("birth_ref_index", 6),
+        ("family_list", 8),
+        ("parent_family_list", 9),
+        ("change", 17),
+        ("tag_list", 18),
+        ("private", 19),
+    ),
+)
+
+LazyFamily = _lazy_class(
+    Family,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("father_handle", 2),
+        ("mother_handle", 3),
+        ("change", 12),
+        ("tag_list", 13),
+        ("private", 14),
+    ),
+)
+
+LazyEvent = _lazy_class(
+    Event,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("_Event__description", 4),
+        ("place", 5),
+        ("change", 10),
+        ("tag_list", 11),
+        ("private", 12),
+    ),
+)
+
+LazyPlace = _lazy_class(
+    Place,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("title", 2),
+        ("long", 3),
+        ("lat", 4),
+        ("code", 9),
+        ("change", 15),
+        ("tag_list", 16),
+        ("private", 17),
+    ),
+)
+
+LazySource = _lazy_class(
+    Source,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("title", 2),
+        ("author", 3),
+        ("pubinfo", 4),
+        ("abbrev", 7),
+        ("change", 8),
+        ("tag_list", 11),
+        ("private", 12),
+    ),
+)
+
+LazyCitation = _lazy_class(
+    Citation,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("page", 3),
+        ("confidence", 4),
+        ("source_handle", 5),
+        ("change", 9),
+        ("tag_list", 10),
+        ("private", 11),
+    ),
+)
+
+LazyMedia = _lazy_class(
+    Media,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("path", 2),
+        ("mime", 3),
+        ("desc", 4),
+        ("checksum", 5),
+        ("change", 9),
+        ("tag_list", 11),
+        ("private", 12),
+    ),
+)
+
+LazyRepository = _lazy_class(
+    Repository,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("name", 3),
+        ("change", 7),
+        ("tag_list", 8),
+        ("private", 9),
+    ),
+)
+
+LazyNote = _lazy_class(
+    Note,
+    (
+        ("handle", 0),
+        ("gramps_id", 1),
+        ("format", 3),
+        ("change", 5),
+        ("tag_list", 6),
+        ("private", 7),
+    ),
+)
+
+LAZY_CLASSES = {
+    Person: LazyPerson,
+    Family: LazyFamily,
+    Event: LazyEvent,
+    Place: LazyPlace,
+    Source: LazySource,
+    Citation: LazyCitation,
+    Media: LazyMedia,
+    Repository: LazyRepository,
+    Note: LazyNote,
+}
+
+
+def create_lazy(obj_class, data):
+    """
+    Create a lazy object from serialized data.
+
+    Classes without a lazy subclass, such as Tag, are created in full.
+
+    :param obj_class: The primary object class.
+    :type obj_class: type
+    :param data: The serialized data of the object.
+    :type data: tuple
+    :returns: The object, or None if there is no data.
+    """
+    lazy_class = LAZY_CLASSES.get(obj_class)
+    if lazy_class is None or not data:
+        return obj_class.create(data)
+    obj = lazy_class.__new__(lazy_class)
+    obj_dict = obj.__dict__
+    for name, index in lazy_class.LAZY_FIELDS:
+        obj_dict[name] = data[index]
+    obj_dict["_lazy_data"] = data
+    return obj
@@ -0,0 +1,269 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+References of serialized primary objects.
+
+:func:`get_raw_references` returns the same (class name, handle) pairs as
+:meth:`~.BaseObject.get_referenced_handles_recursively`, but reads them from
+the serialized data of the object, without creating the object and its
+secondary objects.
+
+The positions of the handles in the serialized data are found once per
+class, from the JSON schema of the class: the properties of a schema are
+listed in the order of the fields of the serialized tuple.  The schema does
+not tell which class a handle refers to, this is given by the name of the
+property, see :data:`HANDLE_PROPERTIES` and :data:`REF_CLASSES`.
+
+Empty handles are left out, except the ones of lists, like
+:meth:`~.BaseObject.get_referenced_handles_recursively` does.  The empty
+handles of the references of :data:`REF_CLASSES` and of the sources of
+citations may be asked for too, to repair them.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .citation import Citation
+from .event import Event
+from .family import Family
+from .media import Media
+from .note import Note
+from .person import Person
+from .place import Place
+from .repo import Repository
+from .src import Source
+from .styledtexttagtype import StyledTextTagType
+from .tag import Tag
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+
+#: Properties holding a handle or a list of handles, and the class of the
+#: referenced objects.
+HANDLE_PROPERTIES = {
+    "citation_list": "Citation",
+    "note_list": "Note",
+    "tag_list": "Tag",
+    "family_list": "Family",
+    "parent_family_list": "Family",
+    "father_handle": "Person",
+    "mother_handle": "Person",
+    "source_handle": "Source",
+    "place": "Place",
+    "famc": "Family",
+}
+
+#: Secondary object classes with a "ref" property, and the class of the
+#: object it refers to.
+REF_CLASSES = {
+    "ChildRef": "Person",
+    "EventRef": "Event",
+    "MediaRef": "Media",
+    "PersonRef": "Person",
+    "PlaceRef": "Place",
+    "RepoRef": "Repository",
+}
+
+#: Handle properties which are required, like the "ref" property of the
+#: :data:`REF_CLASSES`.
+REF_PROPERTIES = ("source_handle",)
+
+# Kinds of the steps of an extraction plan
+HANDLE, HANDLES, REF, OBJECT, OBJECTS, LINK = range(6)
+
+LINK_PREFIX = "gramps://"
+
+
+# -------------------------------------------------------------------------
+#
+# Plans
+#
+# -------------------------------------------------------------------------
+def _get_class_name(schema):
+    """
+    Return the class name of an object schema, or None if the schema does
+    not describe a Gramps object.
+    """
+    if schema.get("type") != "object":
+        for alternative in schema.get("oneOf", ()):
+            if alternative.get("type") == "object":
+                schema = alternative
+                break
+        else:
+            return None
+    class_property = schema.get("properties", {}).get("_class")
+    if class_property is None:
+        return None
+    return class_property["enum"][0]
+
+
+def _get_object_schema(schema):
+    """
+    Return the object schema of a property which may be null.
+    """
+    if schema.get("type") == "object":
+        return schema
+    for alternative in schema.get("oneOf", ()):
+        if alternative.get("type") == "object":
+            return alternative
+    return None
+
+
+def _make_plan(schema):
+    """
+    Return the extraction plan of an object schema.
+
+    The plan is a tuple of (index, kind, argument) steps, where index is the
+    position of a field in the serialized tuple.  The argument is the class
+    name of the referenced objects for HANDLE, HANDLES and REF steps, and
+    the plan of the secondary objects for OBJECT and OBJECTS steps.  Fields which
+    cannot hold a reference have no step.
+    """
+    class_name = _get_class_name(schema)
+    schema = _get_object_schema(schema)
+    if class_name == "StyledTextTag":
+        return ((None, LINK, None),)
+    plan = []
+    names = [name for name in schema["properties"] if name != "_class"]
+    for index, name in enumerate(names):
+        prop = schema["properties"][name]
+        prop_type = prop.get("type")
+        if name == "ref" and class_name in REF_CLASSES:
+            plan.append((index, REF, REF_CLASSES[class_name]))
+        elif name in REF_PROPERTIES:
+            plan.append((index, REF, HANDLE_PROPERTIES[name]))
+        elif name in HANDLE_PROPERTIES and prop_type == "array":
+            plan.append((index, HANDLES, HANDLE_PROPERTIES[name]))
+        elif name in HANDLE_PROPERTIES and "string" in prop_type:
+            # a handle, which may be null
+            plan.append((index, HANDLE, HANDLE_PROPERTIES[name]))
+        elif prop_type == "array" and _get_class_name(prop["items"]):
+            sub_plan = _make_plan(prop["items"])
+            if sub_plan:
+                plan.append((index, OBJECTS, sub_plan))
+        elif _get_class_name(prop):
+            sub_plan = _make_plan(prop)
+            if sub_plan:
+                plan.append((index, OBJECT, sub_plan))
+    return tuple(plan)
+
+
+PLANS = {
+    cls.__name__: _make_plan(cls.get_schema())
+    for cls in (
+        Person,
+        Family,
+        Event,
+        Place,
+        Source,
+        Citation,
+        Media,
+        Repository,
+        Note,
+        Tag,
+    )
+}
+
+
+# -------------------------------------------------------------------------
+#
+# Extraction
+#
+# -------------------------------------------------------------------------
+def _extract(plan, data, append, empty):
+    """
+    Append the references of the serialized data of an object.
+    """
+    for index, kind, arg in plan:
+        if kind == HANDLE:
+            if data[index]:
+                append((arg, data[index]))
+        elif kind == HANDLES:
+            for handle in data[index]:
+                append((arg, handle))
+        elif kind == REF:
+            if data[index] or empty:
+                append((arg, data[index]))
+        elif kind == OBJECTS:
+            for item in data[index]:
+                _extract(arg, item, append, empty)
+        elif kind == OBJECT:
+            if data[index]:
+                _extract(arg, data[index], append, empty)
+        elif data[0][0] == StyledTextTagType.LINK:
+            # A link of a styled text tag: see Note.get_links
+            value = data[1]
+            if value.startswith(LINK_PREFIX):
+                obj_class, prop, handle = value[len(LINK_PREFIX) :].split("/", 2)
+                if prop == "handle":
+                    append((obj_class, handle))
+
+
+def get_raw_references(class_name, data, empty=False):
+    """
+    Return the primary objects referenced by the serialized data of a
+    primary object, whether directly or through secondary objects.
+
+    :param class_name: The name of the primary object class.
+    :type class_name: str
+    :param data: The serialized data of the object.
+    :type data: tuple
+    :param empty: Whether to return the empty references of secondary
+                  objects and the empty sources of citations too.
+    :type empty: bool
+    :returns: List of (classname, handle) tuples for referenced objects.
+    :rtype: list
+    """
+    references = []
+    _extract(PLANS[class_name], data, references.append, empty)
+    return references
+
+
+def get_reference_rows(loads, class_name, rows):
+    """
+    Return the reference table rows for a list of (handle, blob_data) rows
+    of a primary object table.
+
+    This runs in the worker processes of a reference map rebuild, so it only
+    takes and returns picklable values.
+
+    :param loads: The function decoding the blob data.
+    :type loads: function
+    :param class_name: The name of the primary object class.
+    :type class_name: str
+    :param rows: The (handle, blob_data) rows of the objects.
+    :type rows: list
+    :returns: (handle, class name, referenced handle, referenced class name)
+              tuples.
+    :rtype: list
+    """
+    return [
+        (handle, class_name, ref_handle, ref_class_name)
+        for handle, blob in rows
+        for ref_class_name, ref_handle in set(
+            get_raw_references(class_name, loads(blob))
+        )
+    ]
@@ -41,6 +41,9 @@ from .baseobj import BaseObject
 
 CODESET = glocale.encoding
 
+# Secondary fields of the primary classes, see get_secondary_fields.
+_SECONDARY_FIELDS = {}
+
 
 # -------------------------------------------------------------------------
 #
@@ -153,15 +156,20 @@ class TableObject(BaseObject):
     def get_secondary_fields(cls):
         """
         Return all secondary fields and their types
-        """
-        result = []
-        for key, value in cls.get_schema()["properties"].items():
-            schema_type = value.get("type")
-            if isinstance(schema_type, list):
-                schema_type.remove("null")
-                schema_type = schema_type[0]
-            elif isinstance(schema_type, dict):
-                schema_type = None
-            if schema_type in ("string", "integer", "number", "boolean"):
-                result.append((key.lower(), schema_type, value.get("maxLength")))
-        return result
+
+        The fields are found once per class, as building the schema is
+        costly, and the secondary fields are needed at each commit.
+        """
+        if cls not in _SECONDARY_FIELDS:
+            result = []
+            for key, value in cls.get_schema()["properties"].items():
+                schema_type = value.get("type")
+                if isinstance(schema_type, list):
+                    schema_type.remove("null")
+                    schema_type = schema_type[0]
+                elif isinstance(schema_type, dict):
+                    schema_type = None
+                if schema_type in ("string", "integer", "number", "boolean"):
+                    result.append((key.lower(), schema_type, value.get("maxLength")))
+            _SECONDARY_FIELDS[cls] = result
+        return list(_SECONDARY_FIELDS[cls])
@@ -0,0 +1,120 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for lazy primary objects """
+
+import copy
+import os
+import pickle
+import unittest
+
+from ...const import DATA_DIR
+from ...db.utils import import_as_dict
+from ...user import User
+from .. import Person, Tag
+from ..lazy import LAZY_CLASSES, create_lazy
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class LazyTest(unittest.TestCase):
+    """
+    Compare lazy objects with the objects of the example database.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def iter_objects(self):
+        for obj_class in LAZY_CLASSES:
+            name = obj_class.__name__.lower()
+            for data in getattr(self.db, "_iter_raw_%s_data" % name)():
+                yield obj_class, data[1]
+
+    def test_fields(self):
+        for obj_class, data in self.iter_objects():
+            obj = create_lazy(obj_class, data)
+            full = obj_class.create(data)
+            for name, index in obj.LAZY_FIELDS:
+                self.assertEqual(getattr(obj, name), getattr(full, name))
+            self.assertFalse(obj.is_unpacked())
+
+    def test_serialize(self):
+        for obj_class, data in self.iter_objects():
+            obj = create_lazy(obj_class, data)
+            self.assertIsInstance(obj, obj_class)
+            self.assertEqual(obj.__class__.__name__, obj_class.__name__)
+            self.assertEqual(obj.serialize(), data)
+            self.assertTrue(obj.is_unpacked())
+
+    def test_unpack(self):
+        handle = self.db.get_default_handle()
+        data = self.db.get_raw_person_data(handle)
+        person = create_lazy(Person, data)
+        self.assertEqual(person.get_gramps_id(), data[1])
+        self.assertFalse(person.is_unpacked())
+        self.assertEqual(
+            person.get_primary_name().get_first_name(),
+            Person.create(data).get_primary_name().get_first_name(),
+        )
+        self.assertTrue(person.is_unpacked())
+        with self.assertRaises(AttributeError):
+            person.no_such_attribute
+
+    def test_changes_kept(self):
+        handle = self.db.get_default_handle()
+        person = create_lazy(Person, self.db.get_raw_person_data(handle))
+        person.set_gramps_id("X0001")
+        person.set_gender(Person.UNKNOWN)
+        person.get_primary_name()
+        self.assertEqual(person.get_gramps_id(), "X0001")
+        self.assertEqual(person.get_gender(), Person.UNKNOWN)
+
+    def test_copy(self):
+        handle = self.db.get_default_handle()
+        data = self.db.get_raw_person_data(handle)
+        for obj in (
+            copy.copy(create_lazy(Person, data)),
+            copy.deepcopy(create_lazy(Person, data)),
+            pickle.loads(pickle.dumps(create_lazy(Person, data))),
+        ):
+            self.assertIs(type(obj), Person)
+            self.assertEqual(obj.serialize(), data)
+
+    def test_db(self):
+        handle = self.db.get_default_handle()
+        person = self.db.get_person_from_handle(handle, lazy=True)
+        self.assertFalse(person.is_unpacked())
+        self.assertEqual(
+            person.serialize(), self.db.get_person_from_handle(handle).serialize()
+        )
+
+    def test_no_lazy_class(self):
+        tag = Tag()
+        tag.set_name("ToDo")
+        obj = create_lazy(Tag, tag.serialize())
+        self.assertIs(type(obj), Tag)
+        self.assertEqual(obj.serialize(), tag.serialize())
+
+
+if __name__ == "__main__":
+    unittest.main()
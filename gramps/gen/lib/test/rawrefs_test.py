@@ -0,0 +1,121 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the references of serialized primary objects """
+
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db.dbconst import CLASS_TO_KEY_MAP
+from ...db.utils import import_as_dict
+from ...user import User
+from .. import (
+    Citation,
+    Family,
+    Note,
+    Person,
+    PersonRef,
+    StyledText,
+    StyledTextTag,
+    StyledTextTagType,
+)
+from ..rawrefs import PLANS, get_raw_references
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+DATA = os.path.join(TEST_DIR, "data.gramps")
+
+
+class RawReferencesTest(unittest.TestCase):
+    """
+    Compare the references read from the serialized data with the ones of
+    the objects.
+    """
+
+    def compare(self, filename):
+        db = import_as_dict(filename, User())
+        for class_name in CLASS_TO_KEY_MAP:
+            get_object = db.method("get_%s_from_handle", class_name)
+            for handle in db.method("iter_%s_handles", class_name)():
+                obj = get_object(handle)
+                self.assertEqual(
+                    set(get_raw_references(class_name, obj.serialize())),
+                    set(obj.get_referenced_handles_recursively()),
+                )
+
+    def test_plans(self):
+        self.assertEqual(set(PLANS), set(CLASS_TO_KEY_MAP))
+
+    def test_example(self):
+        self.compare(EXAMPLE)
+
+    def test_data(self):
+        self.compare(DATA)
+
+    def test_empty_handles(self):
+        family = Family()
+        self.assertEqual(get_raw_references("Family", family.serialize()), [])
+        family.set_father_handle("F1")
+        self.assertEqual(
+            get_raw_references("Family", family.serialize()), [("Person", "F1")]
+        )
+
+    def test_empty_refs(self):
+        person = Person()
+        person.add_person_ref(PersonRef())
+        person.add_citation("")
+        self.assertEqual(
+            get_raw_references("Person", person.serialize()), [("Citation", "")]
+        )
+        self.assertEqual(
+            sorted(get_raw_references("Person", person.serialize(), empty=True)),
+            [("Citation", ""), ("Person", None)],
+        )
+        citation = Citation()
+        self.assertEqual(get_raw_references("Citation", citation.serialize()), [])
+        self.assertEqual(
+            get_raw_references("Citation", citation.serialize(), empty=True),
+            [("Source", None)],
+        )
+
+    def test_note_links(self):
+        text = "link and url"
+        tags = [
+            StyledTextTag(
+                StyledTextTagType.LINK, "gramps://Person/handle/P1", [(0, 4)]
+            ),
+            StyledTextTag(
+                StyledTextTagType.LINK, "https://gramps-project.org", [(9, 12)]
+            ),
+            StyledTextTag(StyledTextTagType.BOLD, None, [(0, 4)]),
+        ]
+        note = Note()
+        note.set_styledtext(StyledText(text, tags))
+        note.add_tag("T1")
+        self.assertEqual(
+            sorted(get_raw_references("Note", note.serialize())),
+            sorted(note.get_referenced_handles_recursively()),
+        )
+        self.assertIn(("Person", "P1"), get_raw_references("Note", note.serialize()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,7 +45,7 @@ from ..lib import (
     Note,
     Tag,
 )
-from ..utils.alive import probably_alive
+from ..utils.alive import get_alive_map
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -134,6 +134,26 @@ class LivingProxyDb(ProxyDbBase):
         family = self.__remove_living_from_family(family)
         return family
 
+    def get_person_from_handles(self, handles):
+        """
+        Iterate over the Person objects with the passed handles, with the
+        living people restricted or skipped.
+        """
+        for person in self.db.get_person_from_handles(handles):
+            if self.__is_living(person):
+                if self.mode != self.MODE_EXCLUDE_ALL:
+                    yield self.__restrict_person(person)
+            else:
+                yield person
+
+    def get_family_from_handles(self, handles):
+        """
+        Iterate over the Family objects with the passed handles, with the
+        living members removed.
+        """
+        for family in self.db.get_family_from_handles(handles):
+            yield self.__remove_living_from_family(family)
+
     def iter_people(self):
         """
         Protected version of iter_people
@@ -256,11 +276,8 @@ class LivingProxyDb(ProxyDbBase):
         Returns True if the person is considered living.
         Returns False if the person is not considered living.
         """
-        person_handle = person.get_handle()
-        unfil_person = self.get_unfiltered_person(person_handle)
-        return probably_alive(
-            unfil_person, self.db, self.current_date, self.years_after_death
-        )
+        alive = get_alive_map(self.basedb, self.current_date, self.years_after_death)
+        return alive[person.get_handle()][0]
 
     def __remove_living_from_family(self, family):
         """
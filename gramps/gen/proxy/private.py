@@ -168,6 +168,57 @@ class PrivateProxyDb(ProxyDbBase):
             return note
         return None
 
+    def __sanitize_many(self, objs, sanitize=None):
+        """
+        Iterate over the objects which are not private, sanitized.
+        """
+        for obj in objs:
+            if not obj.get_privacy():
+                yield obj if sanitize is None else sanitize(self.db, obj)
+
+    def get_person_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_person_from_handles(handles), sanitize_person
+        )
+
+    def get_source_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_source_from_handles(handles), sanitize_source
+        )
+
+    def get_citation_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_citation_from_handles(handles), sanitize_citation
+        )
+
+    def get_media_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_media_from_handles(handles), sanitize_media
+        )
+
+    def get_place_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_place_from_handles(handles), sanitize_place
+        )
+
+    def get_event_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_event_from_handles(handles), sanitize_event
+        )
+
+    def get_family_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_family_from_handles(handles), sanitize_family
+        )
+
+    def get_repository_from_handles(self, handles):
+        return self.__sanitize_many(
+            self.db.get_repository_from_handles(handles), sanitize_repository
+        )
+
+    def get_note_from_handles(self, handles):
+        return self.__sanitize_many(self.db.get_note_from_handles(handles))
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
@@ -561,6 +561,93 @@ class ProxyDbBase(DbReadBase):
         """
         return self.gfilter(self.include_tag, self.db.get_tag_from_handle(handle))
 
+    def _get_from_handles(self, obj_type, handles):
+        """
+        Iterate over the objects of a type with the passed handles.
+
+        The objects are fetched in batches from the proxied database, unless
+        the proxy changes how single objects are fetched; then they are
+        fetched one at a time.
+        """
+        method = "get_%s_from_handle" % obj_type
+        if getattr(type(self), method) is not getattr(ProxyDbBase, method):
+            return self._iter_from_handles(getattr(self, method), handles)
+        objs = getattr(self.db, "get_%s_from_handles" % obj_type)(handles)
+        predicate = getattr(self, "include_" + obj_type)
+        if predicate is None:
+            return objs
+        return (obj for obj in objs if predicate(obj.handle))
+
+    def get_person_from_handles(self, handles):
+        """
+        Iterate over the Person objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("person", handles)
+
+    def get_family_from_handles(self, handles):
+        """
+        Iterate over the Family objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("family", handles)
+
+    def get_event_from_handles(self, handles):
+        """
+        Iterate over the Event objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("event", handles)
+
+    def get_source_from_handles(self, handles):
+        """
+        Iterate over the Source objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("source", handles)
+
+    def get_citation_from_handles(self, handles):
+        """
+        Iterate over the Citation objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("citation", handles)
+
+    def get_place_from_handles(self, handles):
+        """
+        Iterate over the Place objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("place", handles)
+
+    def get_media_from_handles(self, handles):
+        """
+        Iterate over the Media objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("media", handles)
+
+    def get_repository_from_handles(self, handles):
+        """
+        Iterate over the Repository objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("repository", handles)
+
+    def get_note_from_handles(self, handles):
+        """
+        Iterate over the Note objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("note", handles)
+
+    def get_tag_from_handles(self, handles):
+        """
+        Iterate over the Tag objects with the passed handles, skipping the
+        objects which do not exist or are filtered out.
+        """
+        return self._get_from_handles("tag", handles)
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
@@ -832,6 +919,44 @@ class ProxyDbBase(DbReadBase):
     def get_raw_tag_data(self, handle):
         return self.get_tag_from_handle(handle).serialize()
 
+    @staticmethod
+    def _serialize_many(objs):
+        """
+        Iterate over (handle, raw data) pairs of objects.
+        """
+        for obj in objs:
+            yield (obj.handle, obj.serialize())
+
+    def get_raw_person_data_many(self, handles):
+        return self._serialize_many(self.get_person_from_handles(handles))
+
+    def get_raw_family_data_many(self, handles):
+        return self._serialize_many(self.get_family_from_handles(handles))
+
+    def get_raw_event_data_many(self, handles):
+        return self._serialize_many(self.get_event_from_handles(handles))
+
+    def get_raw_source_data_many(self, handles):
+        return self._serialize_many(self.get_source_from_handles(handles))
+
+    def get_raw_citation_data_many(self, handles):
+        return self._serialize_many(self.get_citation_from_handles(handles))
+
+    def get_raw_place_data_many(self, handles):
+        return self._serialize_many(self.get_place_from_handles(handles))
+
+    def get_raw_media_data_many(self, handles):
+        return self._serialize_many(self.get_media_from_handles(handles))
+
+    def get_raw_repository_data_many(self, handles):
+        return self._serialize_many(self.get_repository_from_handles(handles))
+
+    def get_raw_note_data_many(self, handles):
+        return self._serialize_many(self.get_note_from_handles(handles))
+
+    def get_raw_tag_data_many(self, handles):
+        return self._serialize_many(self.get_tag_from_handles(handles))
+
     def has_person_handle(self, handle):
         """
         Returns True if the handle exists in the current Person database.
@@ -37,6 +37,51 @@ import unicodedata
 IGNORE = "HW~!@#$%^&*()_+=-`[]\\|;:'/?.,<>\" \t\f\v"
 TABLE = bytes.maketrans(b"ABCDEFGIJKLMNOPQRSTUVXYZ", b"012301202245501262301202")
 
+# Daitch-Mokotoff coding of letter sequences: the codes at the start of a
+# name, before a vowel and in any other position, "-" for no code.  The
+# sequences with two codings have alternatives separated by "|".
+DM_TABLE = (
+    ("AI AJ AY EI EJ EY OI OJ OY UI UJ UY", "0 1 -"),
+    ("AU", "0 7 -"),
+    ("A E I O U UE", "0 - -"),
+    ("EU", "1 1 -"),
+    ("IA IE IO IU Y", "1 - -"),
+    ("B F FB P PF PH V W", "7 7 7"),
+    ("CHS KS X", "5 54 54"),
+    ("CH C", "5 5 5|4 4 4"),
+    ("CK", "5 5 5|45 45 45"),
+    ("CSZ CZS CZ CS DRZ DRS DSH DSZ DS DZH DZS DZ", "4 4 4"),
+    ("D DT T TH", "3 3 3"),
+    ("G K KH Q", "5 5 5"),
+    ("H", "5 5 -"),
+    ("J", "1 1 1|4 4 4"),
+    ("L", "8 8 8"),
+    ("M N", "6 6 6"),
+    ("MN NM", "66 66 66"),
+    ("R", "9 9 9"),
+    ("RS RZ", "94 94 94|4 4 4"),
+    ("SCHTSCH SCHTSH SCHTCH SHTCH SHCH SHTSH STCH STSCH SC", "2 4 4"),
+    ("STRZ STRS STSH SZCZ SZCS ZDZ ZDZH ZHDZH", "2 4 4"),
+    ("SHT SCHT SCHD ST SZT SHD SZD SD ZD ZHD", "2 43 43"),
+    ("S SH SCH SZ Z ZH ZS ZSCH ZSH", "4 4 4"),
+    ("TCH TTCH TTSCH TRZ TRS TSCH TSH TS TTS TTSZ TC TZ TTZ TZS TSZ", "4 4 4"),
+)
+DM_RULES = {
+    sequence: [
+        [None if code == "-" else code for code in alternative.split()]
+        for alternative in codes.split("|")
+    ]
+    for sequences, codes in DM_TABLE
+    for sequence in sequences.split()
+}
+DM_MAX_LENGTH = max(len(sequence) for sequence in DM_RULES)
+DM_VOWELS = "AEIOU"
+
+# Phonetic methods
+SOUNDEX = "soundex"
+DAITCH_MOKOTOFF = "daitch_mokotoff"
+PHONETIC_METHODS = (SOUNDEX, DAITCH_MOKOTOFF)
+
 
 # -------------------------------------------------------------------------
 #
@@ -68,6 +113,69 @@ def soundex(strval):
     return str2[:4]
 
 
+# -------------------------------------------------------------------------
+#
+# daitch_mokotoff - returns the Daitch-Mokotoff soundex values
+#
+# -------------------------------------------------------------------------
+def daitch_mokotoff(strval):
+    """
+    Return the list of the Daitch-Mokotoff soundex values of a string
+    argument.  Some letter sequences have two codings, so that a name may
+    have several values.
+    """
+    strval = unicodedata.normalize("NFKD", str(strval).upper()).encode(
+        "ASCII", "ignore"
+    )
+    strval = "".join(char for char in strval.decode("ASCII") if "A" <= char <= "Z")
+    # (value, last code) pairs of the codings of the string
+    branches = [("", None)]
+    pos = 0
+    while pos < len(strval):
+        length = min(DM_MAX_LENGTH, len(strval) - pos)
+        while strval[pos : pos + length] not in DM_RULES:
+            length -= 1
+        alternatives = DM_RULES[strval[pos : pos + length]]
+        following = strval[pos + length : pos + length + 1]
+        if pos == 0:
+            column = 0
+        elif following and following in DM_VOWELS:
+            column = 1
+        else:
+            column = 2
+        new_branches = []
+        for value, last in branches:
+            for alternative in alternatives:
+                code = alternative[column]
+                if code is None:
+                    # no code, but letters with the same code are coded
+                    # again after it
+                    new_branches.append((value, ""))
+                elif last is not None and last.endswith(code):
+                    # adjacent letters with the same code are coded once
+                    new_branches.append((value, code))
+                else:
+                    new_branches.append((value + code, code))
+        branches = list(dict.fromkeys(new_branches))
+        pos += length
+    return list(dict.fromkeys((value + "000000")[:6] for value, last in branches))
+
+
+# -------------------------------------------------------------------------
+#
+# phonetic_codes - returns the phonetic values for a phonetic method
+#
+# -------------------------------------------------------------------------
+def phonetic_codes(strval, method=SOUNDEX):
+    """
+    Return the list of the values of a string argument for a phonetic
+    method, see PHONETIC_METHODS.
+    """
+    if method == DAITCH_MOKOTOFF:
+        return daitch_mokotoff(strval)
+    return [soundex(strval)]
+
+
 # -------------------------------------------------------------------------
 #
 # compare - compares the soundex values of two strings
@@ -0,0 +1,56 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for soundex.py"""
+
+import unittest
+
+from ..soundex import DAITCH_MOKOTOFF, SOUNDEX, daitch_mokotoff, phonetic_codes, soundex
+
+
+class SoundexTest(unittest.TestCase):
+    def test_soundex(self):
+        self.assertEqual(soundex("Robert"), "R163")
+        self.assertEqual(soundex("Rupert"), "R163")
+        self.assertEqual(soundex("Tymczak"), "T522")
+        self.assertEqual(soundex(""), "Z000")
+
+    def test_daitch_mokotoff(self):
+        self.assertEqual(daitch_mokotoff("Moskowitz"), ["645740"])
+        self.assertEqual(daitch_mokotoff("Lipshitz"), ["874400"])
+        self.assertEqual(sorted(daitch_mokotoff("Auerbach")), ["097400", "097500"])
+        self.assertEqual(sorted(daitch_mokotoff("Ohrbach")), ["097400", "097500"])
+        self.assertEqual(sorted(daitch_mokotoff("Peters")), ["734000", "739400"])
+        self.assertEqual(sorted(daitch_mokotoff("Lippszyc")), ["874400", "874500"])
+        self.assertEqual(
+            sorted(daitch_mokotoff("Jackson")),
+            ["145460", "154600", "445460", "454600"],
+        )
+        self.assertEqual(daitch_mokotoff("Müller"), daitch_mokotoff("Muller"))
+        self.assertEqual(daitch_mokotoff(""), ["000000"])
+
+    def test_phonetic_codes(self):
+        self.assertEqual(phonetic_codes("Robert"), ["R163"])
+        self.assertEqual(phonetic_codes("Robert", SOUNDEX), ["R163"])
+        self.assertEqual(phonetic_codes("Lipshitz", DAITCH_MOKOTOFF), ["874400"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,6 +31,7 @@ privacy in reports and exports.
 #
 # -------------------------------------------------------------------------
 import logging
+import weakref
 
 LOG = logging.getLogger(".gen.utils.alive")
 
@@ -73,6 +74,11 @@ except ImportError:
 class ProbablyAlive:
     """
     An object to hold the parameters for considering someone alive.
+
+    The ranges of the people, and the evidence found for their siblings and
+    descendants, are kept until the object is deleted, so that the ranges of
+    many people are computed without searching the same relatives again.
+    The object must not be used after the database changes.
     """
 
     def __init__(
@@ -93,15 +99,31 @@ class ProbablyAlive:
         self.MAX_AGE_PROB_ALIVE = max_age_prob_alive
         self.AVG_GENERATION_GAP = avg_generation_gap
         self.pset = set()
+        # ranges by (person handle, is_spouse)
+        self.ranges = {}
+        # ranges from the siblings, by family handle
+        self.sibling_ranges = {}
+        # evidence from the descendants, by person handle
+        self.descendants = {}
 
     def probably_alive_range(self, person, is_spouse=False):
+        """
+        Compute the estimated birth and death dates of a person.
+        Returns: (birth_date, death_date, explain_text, related_person)
+        """
+        if person is None:
+            return (None, None, "", None)
+        key = (person.handle, is_spouse)
+        if key not in self.ranges:
+            self.ranges[key] = self.__probably_alive_range(person, is_spouse)
+        return self.ranges[key]
+
+    def __probably_alive_range(self, person, is_spouse):
         # FIXME: some of these computed dates need to be a span. For
         #        example, if a person could be born +/- 20 yrs around
         #        a date then it should be a span, and yr_offset should
         #        deal with it as well ("between 1920 and 1930" + 10 =
         #        "between 1930 and 1940")
-        if person is None:
-            return (None, None, "", None)
         self.pset = set()
         birth_ref = person.get_birth_ref()
         death_ref = person.get_death_ref()
@@ -166,100 +188,14 @@ class ProbablyAlive:
         # not alive. If the sibling died more than X years
         # past, or more than X years future, then probably not alive.
 
-        family_list = person.get_parent_family_handle_list()
-        for family_handle in family_list:
-            family = self.db.get_family_from_handle(family_handle)
-            if family is None:
-                continue
-            for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.ref
-                child = self.db.get_person_from_handle(child_handle)
-                if child is None:
-                    continue
-                # Go through once looking for direct evidence:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death date"),
-                                    child,
-                                )
-                # Go through again looking for fallback:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth-related date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death-related date"),
-                                    child,
-                                )
+        for family_handle in person.get_parent_family_handle_list():
+            if family_handle not in self.sibling_ranges:
+                family = self.db.get_family_from_handle(family_handle)
+                self.sibling_ranges[family_handle] = (
+                    self.sibling_range(family) if family else None
+                )
+            if self.sibling_ranges[family_handle]:
+                return self.sibling_ranges[family_handle]
 
         if not is_spouse:  # if you are not in recursion, let's recurse:
             for family_handle in person.get_family_handle_list():
@@ -362,89 +298,12 @@ class ProbablyAlive:
         # Try looking for descendants that were born more than a lifespan
         # ago.
 
-        def descendants_too_old(person, years):
-            if person.handle in self.pset:
-                return (None, None, "", None)
-            self.pset.add(person.handle)
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    continue
-                for child_ref in family.get_child_ref_list():
-                    child_handle = child_ref.ref
-                    child = self.db.get_person_from_handle(child_handle)
-                    child_birth_ref = child.get_birth_ref()
-                    if child_birth_ref:
-                        child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
-                        dobj = child_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            d = Date(dobj)
-                            val = d.get_start_date()
-                            val = d.get_year() - years
-                            d.set_year(val)
-                            return (
-                                d,
-                                d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                _("descendant birth date"),
-                                child,
-                            )
-                    child_death_ref = child.get_death_ref()
-                    if child_death_ref:
-                        child_death = self.db.get_event_from_handle(child_death_ref.ref)
-                        dobj = child_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (
-                                dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                dobj.copy_offset_ymd(
-                                    -self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE
-                                ),
-                                _("descendant death date"),
-                                child,
-                            )
-                    date1, date2, explain, other = descendants_too_old(
-                        child, years + self.AVG_GENERATION_GAP
-                    )
-                    if date1 and date2:
-                        return date1, date2, explain, other
-                    # Check fallback data:
-                    for ev_ref in child.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                d = Date(dobj)
-                                val = d.get_start_date()
-                                val = d.get_year() - years
-                                d.set_year(val)
-                                return (
-                                    d,
-                                    d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant birth-related date"),
-                                    child,
-                                )
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (
-                                    dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                    dobj.copy_offset_ymd(
-                                        -self.AVG_GENERATION_GAP
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("descendant death-related date"),
-                                    child,
-                                )
-
-            return (None, None, "", None)
-
         # If there are descendants that are too old for the person to have
         # been alive in the current year then they must be dead.
 
         date1, date2, explain, other = None, None, "", None
         try:
-            date1, date2, explain, other = descendants_too_old(
+            date1, date2, explain, other = self.descendants_too_old(
                 person, self.AVG_GENERATION_GAP
             )
         except RuntimeError:
@@ -634,6 +493,182 @@ class ProbablyAlive:
 
         return (None, None, "", None)
 
+    def sibling_range(self, family):
+        """
+        Return the range estimated from the first child of a family with a
+        birth or death date, or None.
+        """
+
+        for child_ref in family.get_child_ref_list():
+            child_handle = child_ref.ref
+            child = self.db.get_person_from_handle(child_handle)
+            if child is None:
+                continue
+            # Go through once looking for direct evidence:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
+                            return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling birth date"),
+                                child,
+                            )
+                elif ev and ev.type.is_death():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
+                            return (
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                ),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling death date"),
+                                child,
+                            )
+            # Go through again looking for fallback:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
+                            return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling birth-related date"),
+                                child,
+                            )
+                elif ev and ev.type.is_death_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
+                            return (
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                ),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling death-related date"),
+                                child,
+                            )
+        return None
+
+    def descendants_too_old(self, person, years):
+        """
+        Return the range estimated from the first descendant of a person
+        with a birth or death date, the children being at the given number
+        of years from the person.
+        """
+        self.pset.add(person.handle)
+        evidence = self.get_descendant_evidence(person)
+        if evidence is None:
+            return (None, None, "", None)
+        is_birth, explain, dobj, child, generations = evidence
+        if is_birth:
+            d = Date(dobj)
+            d.set_year(d.get_year() - years - generations * self.AVG_GENERATION_GAP)
+            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE), explain, child)
+        return (
+            dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
+            dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+            explain,
+            child,
+        )
+
+    def get_descendant_evidence(self, person):
+        """
+        Return the first date of a descendant of a person found by a depth
+        first search, as (is_birth, explanation, date, descendant,
+        generations) where generations is the number of generations between
+        the children of the person and the descendant, or None.
+        """
+        if person.handle not in self.descendants:
+            # no evidence if a person is their own descendant
+            self.descendants[person.handle] = None
+            for family_handle in person.get_family_handle_list():
+                family = self.db.get_family_from_handle(family_handle)
+                if not family:
+                    # can happen with LivingProxyDb(PrivateProxyDb(db))
+                    continue
+                for child_ref in family.get_child_ref_list():
+                    child = self.db.get_person_from_handle(child_ref.ref)
+                    evidence = self.get_child_evidence(child)
+                    if evidence:
+                        self.descendants[person.handle] = evidence
+                        return evidence
+        return self.descendants[person.handle]
+
+    def get_child_evidence(self, child):
+        """
+        Return the first date of a child or of their descendants, see
+        :meth:`get_descendant_evidence`.
+        """
+        child_birth_ref = child.get_birth_ref()
+        if child_birth_ref:
+            child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
+            dobj = child_birth.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return (True, _("descendant birth date"), dobj, child, 0)
+        child_death_ref = child.get_death_ref()
+        if child_death_ref:
+            child_death = self.db.get_event_from_handle(child_death_ref.ref)
+            dobj = child_death.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return (False, _("descendant death date"), dobj, child, 0)
+        evidence = self.get_descendant_evidence(child)
+        if evidence:
+            is_birth, explain, dobj, other, generations = evidence
+            return (is_birth, explain, dobj, other, generations + 1)
+        # Check fallback data:
+        for ev_ref in child.get_primary_event_ref_list():
+            ev = self.db.get_event_from_handle(ev_ref.ref)
+            if ev and ev.type.is_birth_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return (True, _("descendant birth-related date"), dobj, child, 0)
+            elif ev and ev.type.is_death_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return (False, _("descendant death-related date"), dobj, child, 0)
+        return None
+
 
 # -------------------------------------------------------------------------
 #
@@ -666,7 +701,7 @@ def probably_alive(
     """
     # First, get the real database to use all people
     # for determining alive status:
-    birth, death, explain, relative = probably_alive_range(
+    date_range = probably_alive_range(
         person, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
     )
     if current_date is None:
@@ -674,23 +709,46 @@ def probably_alive(
     LOG.debug(
         "%s: b.%s, d.%s - %s".format(
             " ".join(person.get_primary_name().get_text_data_list()),
-            birth,
-            death,
-            explain,
+            date_range[0],
+            date_range[1],
+            date_range[2],
         )
     )
+    result = _check_range(date_range, current_date, limit)
+    if return_range:
+        return result
+    else:
+        return result[0]
+
+
+def _check_range(date_range, current_date, limit):
+    """
+    Return (alive, birth_date, death_date, explain_text, related_person),
+    where alive tells if current_date is in the range of
+    :meth:`ProbablyAlive.probably_alive_range`.
+    """
+    birth, death, explain, relative = date_range
     if not birth or not death:
         # no evidence, must consider alive
-        return (True, None, None, _("no evidence"), None) if return_range else True
+        return (True, None, None, _("no evidence"), None)
     # must have dates from here:
     if limit:
         death += limit  # add these years to death
     # Finally, check to see if current_date is between dates
     result = current_date.match(birth, ">=") and current_date.match(death, "<=")
-    if return_range:
-        return (result, birth, death, explain, relative)
-    else:
-        return result
+    return (result, birth, death, explain, relative)
+
+
+def _get_base_db(db):
+    """
+    Return the real database of a proxy database.
+    """
+    from ..proxy.proxybase import ProxyDbBase
+
+    basedb = db
+    while isinstance(basedb, ProxyDbBase):
+        basedb = basedb.db
+    return basedb
 
 
 def probably_alive_range(
@@ -702,16 +760,82 @@ def probably_alive_range(
     """
     # First, find the real database to use all people
     # for determining alive status:
-    from ..proxy.proxybase import ProxyDbBase
-
-    basedb = db
-    while isinstance(basedb, ProxyDbBase):
-        basedb = basedb.db
+    basedb = _get_base_db(db)
     # Now, we create a wrapper for doing work:
     pb = ProbablyAlive(basedb, max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
     return pb.probably_alive_range(person)
 
 
+# -------------------------------------------------------------------------
+#
+# AliveMap class
+#
+# -------------------------------------------------------------------------
+class AliveMap(dict):
+    """
+    The people of a database who may be alive on a date, as a dictionary of
+    (alive, explain_text) tuples by person handle.
+
+    The tuples are computed on first access, as by :func:`probably_alive`,
+    with a single :class:`ProbablyAlive` object, so that the relatives
+    shared by many people are searched once.
+    """
+
+    def __init__(self, db, current_date, limit=0):
+        super().__init__()
+        self.db = db
+        self.current_date = current_date
+        self.limit = limit
+        self.engine = ProbablyAlive(_get_base_db(db))
+
+    def __missing__(self, handle):
+        person = self.db.get_person_from_handle(handle)
+        date_range = self.engine.probably_alive_range(person)
+        alive, _birth, _death, explain, _relative = _check_range(
+            date_range, self.current_date, self.limit
+        )
+        self[handle] = (alive, explain)
+        return (alive, explain)
+
+
+# AliveMaps by database, with the change count of the real database
+_ALIVE_MAPS = weakref.WeakKeyDictionary()
+
+
+def get_alive_map(db, current_date=None, limit=0):
+    """
+    Return an :class:`AliveMap` of the people of a database.
+
+    The map is shared by the callers asking for the same date and limit,
+    until the database changes.
+
+    :param db: the database, which may be a proxy database
+    :param current_date: a date object that is not estimated or modified
+                         (defaults to today)
+    :param limit: number of years to check beyond death_date
+    """
+    if current_date is None:
+        current_date = Today()
+    count = _get_base_db(db).get_change_count()
+    if count is None:
+        return AliveMap(db, current_date, limit)
+    key = (
+        current_date.serialize(),
+        limit,
+        _MAX_SIB_AGE_DIFF,
+        _MAX_AGE_PROB_ALIVE,
+        _AVG_GENERATION_GAP,
+    )
+    maps = _ALIVE_MAPS.get(db)
+    if maps is None or maps[0] != count:
+        maps = (count, {})
+        _ALIVE_MAPS[db] = maps
+    if key not in maps[1]:
+        # the map must not keep the database alive
+        maps[1][key] = AliveMap(weakref.proxy(db), current_date, limit)
+    return maps[1][key]
+
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
@@ -0,0 +1,572 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Find possible duplicate people.
+
+The people are grouped in blocks of people of the same gender group (male,
+or not male) with the same key of their surnames, and only the people of a
+block are compared.  The data used by the comparison is read once for each
+person, as a :class:`PersonFeatures` tuple, so that the pairs of a block
+can be scored without the database, by a pool of worker processes for
+large databases.
+
+The people of a block whose birth dates, or death dates, are both simple
+dates of different years are not compared, since their score is -1.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import os
+from collections import deque, namedtuple
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..const import GRAMPS_LOCALE as glocale
+from ..lib import Date, Person
+from ..soundex import compare, soundex
+from .parallel import run_tasks
+
+_ = glocale.translation.sgettext
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+
+# Number of people of a block whose pairs are scored by each task, and
+# maximum number of worker processes scoring them.  Smaller databases are
+# scored without worker processes.
+SCORE_CHUNK_SIZE = 200
+SCORE_MAX_WORKERS = 8
+SCORE_MIN_PEOPLE = 5000
+
+#: The data of a person used to score the pairs of people.
+#:
+#: name, and the names of the parents and spouses, are (surnames, suffix,
+#: first name) tuples, or None.  The places are (handle, title) pairs.
+#: parents is None if the person has no main parent family, or a (father
+#: name, mother name) pair.  families is a list of (father handle, father
+#: name, mother handle, mother name) tuples, one for each family in which
+#: the person is a parent.
+PersonFeatures = namedtuple(
+    "PersonFeatures",
+    [
+        "handle",
+        "gender",
+        "name",
+        "birth_date",
+        "death_date",
+        "birth_place",
+        "death_place",
+        "parents",
+        "families",
+    ],
+)
+
+
+# -------------------------------------------------------------------------
+#
+# Scoring
+#
+# -------------------------------------------------------------------------
+def is_initial(name):
+    """
+    Return whether a given name is an initial.
+    """
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == ".":
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return " ".join([surn.get_surname() for surn in name.get_surname_list()])
+
+
+def get_block_key(surnames, use_soundex):
+    """
+    Return the key of the block of people with the given surnames.
+    """
+    if use_soundex:
+        try:
+            return soundex(surnames)
+        except UnicodeEncodeError:
+            return surnames
+    return surnames
+
+
+def name_compare(s1, s2, use_soundex):
+    """
+    Return whether two names are the same, or sound the same.
+    """
+    if use_soundex:
+        try:
+            return compare(s1, s2)
+        except UnicodeEncodeError:
+            return s1 == s2
+    return s1 == s2
+
+
+def date_match(date1, date2):
+    """
+    Score the match of two dates.
+    """
+    if date1.is_empty() or date2.is_empty():
+        return 0
+    if date1.is_equal(date2):
+        return 1
+
+    if date1.is_compound() or date2.is_compound():
+        return range_compare(date1, date2)
+
+    if date1.get_year() == date2.get_year():
+        if date1.get_month() == date2.get_month():
+            return 0.75
+        if not date1.get_month_valid() or not date2.get_month_valid():
+            return 0.75
+        else:
+            return -1
+    else:
+        return -1
+
+
+def range_compare(date1, date2):
+    """
+    Score the match of two dates, one of them at least being compound.
+    """
+    start_date_1 = date1.get_start_date()[0:3]
+    start_date_2 = date2.get_start_date()[0:3]
+    stop_date_1 = date1.get_stop_date()[0:3]
+    stop_date_2 = date2.get_stop_date()[0:3]
+    if date1.is_compound() and date2.is_compound():
+        if (
+            start_date_2 <= start_date_1 <= stop_date_2
+            or start_date_1 <= start_date_2 <= stop_date_1
+            or start_date_2 <= stop_date_1 <= stop_date_2
+            or start_date_1 <= stop_date_2 <= stop_date_1
+        ):
+            return 0.5
+        else:
+            return -1
+    elif date2.is_compound():
+        if start_date_2 <= start_date_1 <= stop_date_2:
+            return 0.5
+        else:
+            return -1
+    else:
+        if start_date_1 <= start_date_2 <= stop_date_1:
+            return 0.5
+        else:
+            return -1
+
+
+def name_match(name, name1, use_soundex):
+    """
+    Score the match of two (surnames, suffix, first name) tuples.
+    """
+    if not name1 or not name:
+        return 0
+
+    srn1, sfx1, first1 = name
+    srn2, sfx2, first2 = name1
+
+    if not name_compare(srn1, srn2, use_soundex):
+        return -1
+    if sfx1 != sfx2:
+        if sfx1 != "" and sfx2 != "":
+            return -1
+
+    if first1 == first2:
+        return 1
+    else:
+        list1 = first1.split()
+        list2 = first2.split()
+
+        if len(list1) < len(list2):
+            return list_reduce(list1, list2, use_soundex)
+        else:
+            return list_reduce(list2, list1, use_soundex)
+
+
+def place_match(place1, place2, use_soundex):
+    """
+    Score the match of two (handle, title) pairs of places.
+    """
+    p1_id, name1 = place1
+    p2_id, name2 = place2
+    if p1_id == p2_id:
+        return 1
+
+    if not (name1 and name2):
+        return 0
+    if name1 == name2:
+        return 1
+
+    list1 = name1.replace(",", " ").split()
+    list2 = name2.replace(",", " ").split()
+
+    value = 0
+    for name in list1:
+        for name2 in list2:
+            if name == name2:
+                value += 0.5
+            elif name[0] == name2[0] and name_compare(name, name2, use_soundex):
+                value += 0.25
+    return min(value, 1) if value else -1
+
+
+def list_reduce(list1, list2, use_soundex):
+    """
+    Score the match of two lists of given names.
+    """
+    value = 0
+    for name in list1:
+        for name2 in list2:
+            if is_initial(name) and name[0] == name2[0]:
+                value += 0.25
+            elif is_initial(name2) and name2[0] == name[0]:
+                value += 0.25
+            elif name == name2:
+                value += 0.5
+            elif name[0] == name2[0] and name_compare(name, name2, use_soundex):
+                value += 0.25
+    return min(value, 1) if value else -1
+
+
+def compare_features(f1, f2, use_soundex):
+    """
+    Return the score of the match of two people, without checking whether
+    one is an ancestor of the other.
+    """
+    chance = name_match(f1.name, f2.name, use_soundex)
+    if chance == -1:
+        return -1
+
+    for value in (
+        date_match(f1.birth_date, f2.birth_date),
+        date_match(f1.death_date, f2.death_date),
+        place_match(f1.birth_place, f2.birth_place, use_soundex),
+        place_match(f1.death_place, f2.death_place, use_soundex),
+    ):
+        if value == -1:
+            return -1
+        chance += value
+
+    if f1.parents and f2.parents:
+        for name1, name2 in zip(f1.parents, f2.parents):
+            value = name_match(name1, name2, use_soundex)
+            if value == -1:
+                return -1
+            chance += value
+
+    for family1 in f1.families:
+        for family2 in f2.families:
+            if f1.gender == Person.FEMALE:
+                # compare the fathers
+                handle1, name1 = family1[0:2]
+                handle2, name2 = family2[0:2]
+            else:
+                # compare the mothers
+                handle1, name1 = family1[2:4]
+                handle2, name2 = family2[2:4]
+            if handle1 and handle2:
+                if handle1 == handle2:
+                    chance += 1
+                else:
+                    value = name_match(name1, name2, use_soundex)
+                    if value != -1:
+                        chance += value
+    return chance
+
+
+def _get_year(date):
+    """
+    Return the year of a date whose year must match, or None.
+    """
+    if date.is_empty() or date.is_compound():
+        return None
+    return date.get_year()
+
+
+def _may_match(f1, f2):
+    """
+    Return False if the dates of two people do not match, see
+    :func:`date_match`.
+    """
+    for date1, date2 in (
+        (f1.birth_date, f2.birth_date),
+        (f1.death_date, f2.death_date),
+    ):
+        year1 = _get_year(date1)
+        year2 = _get_year(date2)
+        if year1 is not None and year2 is not None and year1 != year2:
+            return False
+    return True
+
+
+def score_block(block, start, stop, threshold, use_soundex):
+    """
+    Score the pairs of people of a block whose first person is at a position
+    from start to stop in the block.
+
+    This runs in the worker processes, so it only takes and returns
+    picklable values.
+
+    :returns: (position 1, position 2, score) tuples for the pairs whose
+              score reaches the threshold, in the order of the positions.
+    """
+    scores = []
+    for index1 in range(start, stop):
+        f1 = block[index1]
+        for index2, f2 in enumerate(block):
+            if index1 != index2 and _may_match(f1, f2):
+                chance = compare_features(f1, f2, use_soundex)
+                if chance >= threshold:
+                    scores.append((index1, index2, chance))
+    return scores
+
+
+# -------------------------------------------------------------------------
+#
+# DuplicateFinder
+#
+# -------------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Find the possible duplicates of the people of a database.
+    """
+
+    def __init__(self, db, use_soundex=True, user=None):
+        self.db = db
+        self.use_soundex = use_soundex
+        self.user = user
+        self.ancestors = {}
+
+    def get_name(self, name):
+        """
+        Return the (surnames, suffix, first name) tuple of a name.
+        """
+        if not name:
+            return None
+        return (get_surnames(name), name.get_suffix(), name.get_first_name())
+
+    def get_person_name(self, handle):
+        """
+        Return the tuple of the primary name of a person, or None.
+        """
+        if not handle:
+            return None
+        person = self.db.get_person_from_handle(handle)
+        if person:
+            return self.get_name(person.get_primary_name())
+        return None
+
+    def get_event(self, event_ref):
+        """
+        Return the date and the place of an event, empty if there is no
+        event.
+        """
+        if not event_ref:
+            return Date(), ("", "")
+        event = self.db.get_event_from_handle(event_ref.ref)
+        place_handle = event.get_place_handle()
+        title = ""
+        if place_handle:
+            title = self.db.get_place_from_handle(place_handle).get_title()
+        return event.get_date_object(), (place_handle, title)
+
+    def get_features(self, person):
+        """
+        Return the features of a person.
+        """
+        birth_date, birth_place = self.get_event(person.get_birth_ref())
+        death_date, death_place = self.get_event(person.get_death_ref())
+        parents = None
+        family_handle = person.get_main_parents_family_handle()
+        if family_handle:
+            family = self.db.get_family_from_handle(family_handle)
+            parents = (
+                self.get_person_name(family.get_father_handle()),
+                self.get_person_name(family.get_mother_handle()),
+            )
+        families = []
+        for family in self.db.get_family_from_handles(person.get_family_handle_list()):
+            father_handle = family.get_father_handle()
+            mother_handle = family.get_mother_handle()
+            families.append(
+                (
+                    father_handle,
+                    self.get_person_name(father_handle),
+                    mother_handle,
+                    self.get_person_name(mother_handle),
+                )
+            )
+        return PersonFeatures(
+            person.handle,
+            person.get_gender(),
+            self.get_name(person.get_primary_name()),
+            birth_date,
+            death_date,
+            birth_place,
+            death_place,
+            parents,
+            families,
+        )
+
+    def get_blocks(self):
+        """
+        Return the blocks of the people, as lists of their features, and
+        the list of the handles of the people, in the order of the database.
+        """
+        males = {}
+        females = {}
+        handles = list(self.db.iter_person_handles())
+        for person in self.db.get_person_from_handles(handles):
+            self._step()
+            key = get_block_key(
+                get_surnames(person.get_primary_name()), self.use_soundex
+            )
+            blocks = males if person.get_gender() == Person.MALE else females
+            features = self.get_features(person)
+            if key in blocks:
+                blocks[key].append(features)
+            else:
+                blocks[key] = [features]
+        return list(males.values()) + list(females.values()), handles
+
+    def is_ancestor(self, handle, ancestor):
+        """
+        Return whether a person is an ancestor of another one, or the same
+        person.
+        """
+        ancestors = self.ancestors.get(handle)
+        if ancestors is None:
+            ancestors = set()
+            todo = [handle]
+            while todo:
+                person_handle = todo.pop()
+                if not person_handle or person_handle in ancestors:
+                    continue
+                ancestors.add(person_handle)
+                person = self.db.get_person_from_handle(person_handle)
+                family_handle = person.get_main_parents_family_handle()
+                if family_handle:
+                    family = self.db.get_family_from_handle(family_handle)
+                    todo.append(family.get_mother_handle())
+                    todo.append(family.get_father_handle())
+            self.ancestors[handle] = ancestors
+        return ancestor in ancestors
+
+    def find(self, threshold):
+        """
+        Return the possible duplicates of the people, as a dictionary of
+        handle -> (handle of the duplicate, score).
+
+        Each person is paired with at most one other person, with the lowest
+        score reaching the threshold, and a person is not paired with a
+        person already paired with it.
+        """
+        total = self.db.get_number_of_people()
+        self._begin(_("Pass 1: Building preliminary lists"), total)
+        blocks, handles = self.get_blocks()
+        self._end()
+
+        self._begin(
+            _("Pass 2: Calculating potential matches"),
+            sum(len(block) for block in blocks if len(block) > 1),
+        )
+        # handle -> the (handle, score) pairs of its possible duplicates, in
+        # the order of the block
+        candidates = {}
+        workers = min(os.cpu_count() or 1, SCORE_MAX_WORKERS)
+        if total < SCORE_MIN_PEOPLE:
+            workers = 0
+        self._score_blocks(blocks, threshold, workers, candidates)
+
+        matches = {}
+        for p1key in handles:
+            for p2key, chance in candidates.get(p1key, ()):
+                if p2key in matches and matches[p2key][0] == p1key:
+                    continue
+                if self.is_ancestor(p1key, p2key) or self.is_ancestor(p2key, p1key):
+                    continue
+                if p1key not in matches or matches[p1key][1] > chance:
+                    matches[p1key] = (p2key, chance)
+        self._end()
+        return matches
+
+    def _iter_tasks(self, blocks):
+        """
+        Iterate over the (block, start, stop) tasks of the blocks with
+        several people.
+        """
+        for block in blocks:
+            if len(block) > 1:
+                for start in range(0, len(block), SCORE_CHUNK_SIZE):
+                    yield block, start, min(start + SCORE_CHUNK_SIZE, len(block))
+
+    def _score_blocks(self, blocks, threshold, workers, candidates):
+        """
+        Score the pairs of the blocks with the given number of worker
+        processes, or in this process if 0, and add the pairs reaching the
+        threshold to the candidates.
+        """
+
+        # The (block, start, stop) tasks whose scores are pending
+        pending = deque()
+
+        def iter_tasks():
+            for block, start, stop in self._iter_tasks(blocks):
+                pending.append((block, start, stop))
+                yield block, start, stop, threshold, self.use_soundex
+
+        for scores in run_tasks(score_block, iter_tasks(), workers):
+            block, start, stop = pending.popleft()
+            for index1, index2, chance in scores:
+                candidates.setdefault(block[index1].handle, []).append(
+                    (block[index2].handle, chance)
+                )
+            self._step(stop - start)
+
+    def _begin(self, message, total):
+        if self.user:
+            self.user.begin_progress(_("Find Duplicates"), message, total)
+
+    def _step(self, count=1):
+        if self.user:
+            for dummy in range(count):
+                self.user.step_progress()
+
+    def _end(self):
+        if self.user:
+            self.user.end_progress()
@@ -0,0 +1,84 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Run tasks in a pool of worker processes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+LOG = logging.getLogger(".parallel")
+
+
+def run_tasks(func, tasks, workers):
+    """
+    Iterate over the results of func(*task) for each task of an iterable,
+    in the order of the tasks.
+
+    With more than one worker, the tasks run in a pool of worker processes,
+    a bounded number of them ahead, so that the tasks and results are not
+    all held in memory.  The processes are started with the spawn method,
+    so that they do not inherit the threads and open connections of this
+    process: the tasks and results must be picklable, and func must be
+    defined in a module which imports only the gramps.gen package.
+
+    If the pool cannot be started, or a worker process dies, the remaining
+    tasks run in this process.  Frozen applications, whose executable cannot
+    start worker processes, run all tasks in this process.
+
+    :param func: The function run for each task.
+    :type func: function
+    :param tasks: The arguments of each call of func.
+    :type tasks: iterable of tuples
+    :param workers: The number of worker processes.
+    :type workers: int
+    """
+    tasks = iter(tasks)
+    pending = deque()
+    if workers > 1 and not getattr(sys, "frozen", False):
+        context = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(workers, mp_context=context) as executor:
+                for task in tasks:
+                    pending.append((task, executor.submit(func, *task)))
+                    if len(pending) > 2 * workers:
+                        result = pending[0][1].result()
+                        pending.popleft()
+                        yield result
+                while pending:
+                    result = pending[0][1].result()
+                    pending.popleft()
+                    yield result
+        except (BrokenProcessPool, OSError) as err:
+            LOG.warning("Running the tasks without worker processes: %s", err)
+    for task, _future in pending:
+        yield func(*task)
+    for task in tasks:
+        yield func(*task)
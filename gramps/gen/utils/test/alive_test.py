@@ -0,0 +1,96 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Date
+from ...proxy import LivingProxyDb
+from ...user import User
+from ..alive import get_alive_map, probably_alive
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+# -------------------------------------------------------------------------
+#
+# AliveMapTest class
+#
+# -------------------------------------------------------------------------
+class AliveMapTest(unittest.TestCase):
+    """
+    Compare the alive map with probably_alive.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def check_map(self, current_date, limit=0):
+        alive = get_alive_map(self.db, current_date, limit)
+        for person in self.db.iter_people():
+            result = probably_alive(
+                person, self.db, current_date, limit, return_range=True
+            )
+            self.assertEqual(alive[person.handle], (result[0], result[3]))
+
+    def test_today(self):
+        self.check_map(None)
+
+    def test_date(self):
+        date = Date()
+        date.set_year(1850)
+        self.check_map(date)
+        self.check_map(date, limit=10)
+
+    def test_shared(self):
+        date = Date()
+        date.set_year(1900)
+        alive = get_alive_map(self.db, date)
+        self.assertIs(get_alive_map(self.db, date), alive)
+        self.assertIsNot(get_alive_map(self.db), alive)
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL, 1900)
+        self.assertEqual(len(alive), 0)
+        living = self.db.get_number_of_people() - len(list(proxy.iter_people()))
+        self.assertEqual(living, sum(result[0] for result in alive.values()))
+        self.assertIs(get_alive_map(self.db, date), alive)
+
+        person = self.db.get_person_from_gramps_id("I0044")
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertIsNot(get_alive_map(self.db, date), alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
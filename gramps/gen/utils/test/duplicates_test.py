@@ -0,0 +1,93 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import unittest
+from unittest import mock
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...const import DATA_DIR
+from ...db.utils import import_as_dict
+from ...user import User
+from .. import duplicates, parallel
+from ..duplicates import DuplicateFinder, compare_features, score_block
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+# -------------------------------------------------------------------------
+#
+# DuplicateFinderTest class
+#
+# -------------------------------------------------------------------------
+class DuplicateFinderTest(unittest.TestCase):
+    """
+    Test the duplicate finder.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_find(self):
+        matches = DuplicateFinder(self.db).find(1.0)
+        self.assertEqual(len(matches), 222)
+        for p1key, (p2key, chance) in matches.items():
+            self.assertNotEqual(p1key, p2key)
+            self.assertGreaterEqual(chance, 1.0)
+        self.assertEqual(len(DuplicateFinder(self.db, use_soundex=False).find(1.0)), 90)
+
+    @mock.patch("os.cpu_count", return_value=2)
+    def test_workers(self, _cpu_count):
+        finder = DuplicateFinder(self.db)
+        matches = finder.find(0.25)
+        with mock.patch.multiple(
+            duplicates, SCORE_MIN_PEOPLE=0, SCORE_CHUNK_SIZE=7
+        ), mock.patch.object(
+            parallel, "ProcessPoolExecutor", wraps=parallel.ProcessPoolExecutor
+        ) as executor:
+            self.assertEqual(DuplicateFinder(self.db).find(0.25), matches)
+            executor.assert_called_once_with(2, mp_context=mock.ANY)
+
+    def test_blocks(self):
+        # The pairs which are not compared have a score of -1.
+        blocks, handles = DuplicateFinder(self.db).get_blocks()
+        self.assertEqual(len(handles), self.db.get_number_of_people())
+        block = max(blocks, key=len)
+        scores = score_block(block, 0, len(block), -1, True)
+        compared = {(index1, index2) for index1, index2, chance in scores}
+        for index1, f1 in enumerate(block):
+            for index2, f2 in enumerate(block):
+                if index1 != index2 and (index1, index2) not in compared:
+                    self.assertEqual(compare_features(f1, f2, True), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
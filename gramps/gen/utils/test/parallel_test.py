@@ -0,0 +1,100 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for running tasks in worker processes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import multiprocessing
+import os
+import unittest
+from unittest import mock
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .. import parallel
+from ..parallel import run_tasks
+
+TASKS = [(number, 3) for number in range(20)]
+RESULTS = [number * 3 for number in range(20)]
+
+
+def multiply(number, factor):
+    """
+    Return the product of two numbers.
+    """
+    return number * factor
+
+
+def multiply_in_parent(number, factor):
+    """
+    Return the product of two numbers, or end a worker process.
+    """
+    if number == 5 and multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return number * factor
+
+
+class RunTasksTest(unittest.TestCase):
+    """
+    Test running tasks in worker processes.
+    """
+
+    def test_workers(self):
+        with mock.patch.object(
+            parallel, "ProcessPoolExecutor", wraps=parallel.ProcessPoolExecutor
+        ) as executor:
+            self.assertEqual(list(run_tasks(multiply, TASKS, 2)), RESULTS)
+        executor.assert_called_once_with(2, mp_context=mock.ANY)
+        context = executor.call_args.kwargs["mp_context"]
+        self.assertEqual(context.get_start_method(), "spawn")
+
+    def test_no_workers(self):
+        with mock.patch.object(parallel, "ProcessPoolExecutor") as executor:
+            self.assertEqual(list(run_tasks(multiply, TASKS, 1)), RESULTS)
+        executor.assert_not_called()
+
+    def test_frozen(self):
+        with mock.patch.object(
+            parallel, "ProcessPoolExecutor"
+        ) as executor, mock.patch.object(parallel.sys, "frozen", True, create=True):
+            self.assertEqual(list(run_tasks(multiply, TASKS, 2)), RESULTS)
+        executor.assert_not_called()
+
+    def test_start_error(self):
+        with mock.patch.object(parallel, "ProcessPoolExecutor", side_effect=OSError):
+            self.assertEqual(list(run_tasks(multiply, iter(TASKS), 2)), RESULTS)
+
+    def test_broken_pool(self):
+        with self.assertLogs(".parallel", "WARNING"):
+            results = list(run_tasks(multiply_in_parent, iter(TASKS), 2))
+        self.assertEqual(results, RESULTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1860,6 +1860,12 @@ class GrampsPreferences(ConfigureDialog):
         """
         config.set("preferences.february-29", obj.get_active())
 
+    def sqlite_profile_changed(self, obj):
+        """
+        Save "SQLite profile" option on change.
+        """
+        config.set("database.sqlite-profile", obj.get_active_id())
+
     def autobackup_changed(self, obj):
         """
         Save "Autobackup" option on change.
@@ -2228,6 +2234,25 @@ class GrampsPreferences(ConfigureDialog):
         obox = self.__create_backend_combo()
         grid.attach(obox, 2, row, 1, 1)
 
+        row += 1
+        obox = Gtk.ComboBoxText()
+        obox.append("default", _("SQLite defaults"))
+        obox.append("performance", _("Performance"))
+        obox.append("bulk", _("Performance and fast batch imports"))
+        obox.set_active_id(config.get("database.sqlite-profile"))
+        obox.set_tooltip_text(
+            _(
+                "Tuning of SQLite family trees, applied when a tree is loaded. "
+                "The performance profiles use write-ahead logging and larger "
+                "caches. The batch import profile also relaxes durability "
+                "during batch changes, such as imports."
+            )
+        )
+        obox.connect("changed", self.sqlite_profile_changed)
+        lwidget = BasicLabel(_("%s: ") % _("SQLite profile"))
+        grid.attach(lwidget, 1, row, 1, 1)
+        grid.attach(obox, 2, row, 1, 1)
+
         row += 1
         label = self.add_text(
             grid,
@@ -924,7 +924,7 @@ class ListView(NavigationView):
             cput = perf_counter()
             # store selected handles
             self._sel_handles_before_update = self.selected_handles()
-            list(map(self.model.update_row_by_handle, handle_list))
+            self.model.update_rows_by_handles(handle_list)
             LOG.debug(
                 "   "
                 + self.__class__.__name__
@@ -59,6 +59,9 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
     Flat citation model.  (Original code in CitationBaseModel).
     """
 
+    text_class = "Citation"
+    text_columns = ("citation_page", "citation_id")
+
     def __init__(
         self,
         db,
@@ -72,6 +72,9 @@ INVALID_DATE_FORMAT = config.get("preferences.invalid-date-format")
 #
 # -------------------------------------------------------------------------
 class EventModel(FlatBaseModel):
+    text_class = "Event"
+    text_columns = ("column_description", "column_id", "column_type")
+
     def __init__(
         self,
         db,
@@ -449,6 +449,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # Class name of the objects of the rows, and names of the column methods
+    # returning one of the texts of the objects, which are searched with the
+    # full-text index of the database, if any.
+    text_class = None
+    text_columns = ()
+
     def __init__(
         self,
         db,
@@ -519,6 +525,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # you reattach the model to the treeview so that the treeview updates
           with the new entries
         """
+        self.search_column = None
         if search:
             if search[0]:
                 # following is None if no data given in filter sidebar
@@ -530,6 +537,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     col = search[1][0]
                     text = search[1][1]
                     inv = search[1][2]
+                    self.search_column = col
                     func = lambda x: self._get_value(x, col) or UEMPTY
                     if search[2]:
                         self.search = ExactSearchFilter(func, text, inv)
@@ -591,10 +599,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             if not allkeys:
                 allkeys = self.sort_keys()
             if self.search and self.search.text:
+                candidates = self._search_candidates()
                 dlist = [
                     h
                     for h in allkeys
-                    if self.search.match(h[1], self.db)
+                    if (candidates is None or h[1] in candidates)
+                    and self.search.match(h[1], self.db)
                     and h[1] not in self.skip
                     and h[1] != ignore
                 ]
@@ -613,6 +623,19 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.node_map.clear_map()
         self._in_build = False
 
+    def _search_candidates(self):
+        """
+        Return the handles of the objects which may match the search text of
+        the top search bar, or None if all objects must be tested.
+        """
+        if (
+            self.search.invert
+            or self.search_column is None
+            or self.fmap[self.search_column].__name__ not in self.text_columns
+        ):
+            return None
+        return self.db.search_text(self.text_class, self.search.text)
+
     def _rebuild_filter(self, ignore=None):
         """function called when view must be build, given filter options
         in the filter sidebar
@@ -653,9 +676,16 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert isinstance(handle, str)
         if self.node_map.get_path_from_handle(handle) is not None:
             return  # row is already displayed
+        self._insert_row(handle, not self.search or self.search.match(handle, self.db))
+
+    def _insert_row(self, handle, visible):
+        """
+        Insert the object in the model, and add its row to the view if it is
+        visible.
+        """
         data = self.map(handle)
         insert_val = (self.sort_func(data), handle)
-        if not self.search or (self.search and self.search.match(handle, self.db)):
+        if visible:
             # row needs to be added to the model
             insert_path = self.node_map.insert(insert_val)
 
@@ -678,23 +708,59 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
     def update_row_by_handle(self, handle):
         """
         Update a row, called after the object with handle is changed
+
+        With a search or filter, the object is tested again, so that its row
+        is added or removed as needed.
         """
-        if self.node_map.get_path_from_handle(handle) is None:
-            return  # row is not currently displayed
         self.clear_cache(handle)
         oldsortkey = self.node_map.get_sortkey(handle)
+        if oldsortkey is None:
+            # the row is not displayed, but the object may match now
+            if self.search and handle not in self.skip:
+                self.node_map.delete(handle)
+                self._insert_row(handle, self.search.match(handle, self.db))
+            return
+        visible = not self.search or self.search.match(handle, self.db)
         newsortkey = self.sort_func(self.map(handle))
-        if oldsortkey is None or oldsortkey != newsortkey:
-            # or the changed object is not present in the view due to filtering
+        if not visible or oldsortkey != newsortkey:
+            # the object no longer matches the filter,
             # or the order of the object must change.
             self.delete_row_by_handle(handle)
-            self.add_row_by_handle(handle)
+            self._insert_row(handle, visible)
         else:
             # the row is visible in the view, is changed, but the order is fixed
             path = self.node_map.get_path_from_handle(handle)
             node = self.do_get_iter(path)[1]
             self.row_changed(path, node)
 
+    def update_rows_by_handles(self, handles):
+        """
+        Update the rows, called after the objects with the handles are
+        changed.  The rows of the other objects whose match of the search or
+        filter may change are updated too, see :meth:`get_affected_handles`.
+        """
+        for handle in self.get_affected_handles(handles):
+            self.update_row_by_handle(handle)
+
+    def get_affected_handles(self, handles):
+        """
+        Return the handles of the changed objects, followed by the handles
+        of the other objects whose match of the search or filter may change.
+
+        If the filter cannot tell them, only the changed objects are
+        returned, and the other rows are kept until the view is built again.
+        """
+        if not self.search:
+            return handles
+        affected = self.search.get_affected_handles(self.db, handles)
+        if affected is None:
+            return handles
+        return list(handles) + [
+            handle
+            for handle in affected.difference(handles)
+            if self.map(handle) is not None
+        ]
+
     def get_iter_from_handle(self, handle):
         """
         Get the iter for a gramps handle.
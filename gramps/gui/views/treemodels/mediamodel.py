@@ -54,6 +54,9 @@ from .flatbasemodel import FlatBaseModel
 #
 # -------------------------------------------------------------------------
 class MediaModel(FlatBaseModel):
+    text_class = "Media"
+    text_columns = ("column_description", "column_id", "column_path")
+
     def __init__(
         self,
         db,
@@ -54,6 +54,9 @@ from gramps.gen.lib import Note, NoteType, StyledText
 class NoteModel(FlatBaseModel):
     """ """
 
+    text_class = "Note"
+    text_columns = ("column_id",)
+
     def __init__(
         self,
         db,
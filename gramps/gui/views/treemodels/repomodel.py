@@ -51,6 +51,9 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class RepositoryModel(FlatBaseModel):
+    text_class = "Repository"
+    text_columns = ("column_name", "column_id", "column_type")
+
     def __init__(
         self,
         db,
@@ -50,6 +50,15 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
+    text_class = "Source"
+    text_columns = (
+        "column_title",
+        "column_id",
+        "column_author",
+        "column_abbrev",
+        "column_pubinfo",
+    )
+
     def __init__(
         self,
         db,
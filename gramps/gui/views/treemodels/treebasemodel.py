@@ -851,17 +851,56 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         at the change active, we tell listview not to change active.
         The add_row below changes to current active again so we end up in right
         place.
+
+        With a search or filter, the object is tested again, so that its row
+        is added or removed as needed.
         """
         assert isinstance(handle, str)
         self.clear_cache(handle)
         if self._get_node(handle) is None:
-            return  # row not currently displayed
+            # the row is not displayed, but the object may match now
+            if self.search or (self.has_secondary and self.search2):
+                self.add_row_by_handle(handle)
+            return
 
         self.dont_change_active = True
         self.delete_row_by_handle(handle)
         self.dont_change_active = False
         self.add_row_by_handle(handle)
 
+    def update_rows_by_handles(self, handles):
+        """
+        Update the rows, called after the objects with the handles are
+        changed.  The rows of the other objects whose match of the search or
+        filter may change are updated too, see :meth:`get_affected_handles`.
+        """
+        for handle in self.get_affected_handles(handles):
+            self.update_row_by_handle(handle)
+
+    def get_affected_handles(self, handles):
+        """
+        Return the handles of the changed objects, followed by the handles
+        of the other objects whose match of the search or filter may change.
+
+        If the filter cannot tell them, only the changed objects are
+        returned, and the other rows are kept until the view is built again.
+        """
+        searches = [self.search]
+        if self.has_secondary and self.search2 is not self.search:
+            searches.append(self.search2)
+        affected = set()
+        for search in searches:
+            if search:
+                search_handles = search.get_affected_handles(self.db, handles)
+                if search_handles is None:
+                    return handles
+                affected.update(search_handles)
+        return list(handles) + [
+            handle
+            for handle in affected.difference(handles)
+            if self.map(handle) or (self.has_secondary and self.map2(handle))
+        ]
+
     def _new_iter(self, nodeid):
         """
         Return a new iter containing the nodeid in the nodemap
@@ -29,9 +29,13 @@ Database API interface
 #
 # -------------------------------------------------------------------------
 import logging
+import os
 import pickle
 import time
+from collections import deque
+from itertools import islice
 
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 # ------------------------------------------------------------------------
@@ -40,18 +44,25 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    CLASS_TO_KEY_MAP,
     DBLOGNAME,
+    EVENT_KEY,
+    FAMILY_KEY,
     KEY_TO_CLASS_MAP,
     KEY_TO_NAME_MAP,
+    PERSON_KEY,
     REFERENCE_KEY,
     TXNADD,
     TXNDEL,
     TXNUPD,
 )
+from gramps.gen.db.exceptions import DbUpgradeRequiredError
 from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.serializer import get_serializer
 from gramps.gen.lib import (
     Citation,
     Event,
+    EventType,
     Family,
     Media,
     Note,
@@ -62,11 +73,68 @@ from gramps.gen.lib import (
     Tag,
 )
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.lib.rawrefs import get_raw_references, get_reference_rows
+from gramps.gen.soundex import PHONETIC_METHODS, SOUNDEX, phonetic_codes
 from gramps.gen.updatecallback import UpdateCallback
+from gramps.gen.utils.parallel import run_tasks
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+# Number of objects whose references are buffered during a batch
+# transaction before they are written to the reference table.
+BULK_CHUNK_SIZE = 5000
+
+# Number of handles in the IN clause of a multi-handle fetch.  Old SQLite
+# versions allow at most 999 parameters per statement.
+FETCH_CHUNK_SIZE = 500
+
+# Number of records decoded by each task of a reference map rebuild, and
+# maximum number of worker processes decoding them.  Smaller databases are
+# rebuilt without worker processes.
+REINDEX_CHUNK_SIZE = 2000
+REINDEX_MAX_WORKERS = 8
+
+# Schema version from which the data derived from the objects is maintained:
+# the edge tables, the date columns of the person table, the phonetic table
+# and the full-text index.  Older versions of Gramps refuse to open these
+# databases, so that their derived data is always current.
+DERIVED_DATA_VERSION = 21
+
+# Schema version from which the records may be written by other serializers
+# than pickle, which older versions of Gramps cannot read.
+SERIALIZER_VERSION = 21
+
+# Tables of the edges of the family tree, derived from the people and
+# families, with the object type they are derived from.  Each row links an
+# object (obj_handle) to a person or family (ref_handle):
+#   person_family: a person to the families in which it is a parent
+#   person_parent_family: a person to its main parent family
+#   family_parent: a family to its father and mother
+#   family_child: a family to its children
+EDGE_TABLES = {
+    "person_family": PERSON_KEY,
+    "person_parent_family": PERSON_KEY,
+    "family_parent": FAMILY_KEY,
+    "family_child": FAMILY_KEY,
+}
+
+# Columns of the person table holding the dates of the birth and death of
+# each person, derived from its events, with their SQL types:
+#   birth_sortval, death_sortval: sort values of the dates of the birth and
+#       death events, NULL if the person has none
+#   birth_place_handle: place of the birth event
+#   birth_fallback_sortval, death_fallback_sortval: sort values of the dates
+#       of the birth and death events or of their fallbacks, as found by
+#       get_birth_or_fallback and get_death_or_fallback
+PERSON_DATE_COLUMNS = {
+    "birth_sortval": "INTEGER",
+    "birth_place_handle": "VARCHAR(50)",
+    "death_sortval": "INTEGER",
+    "birth_fallback_sortval": "INTEGER",
+    "death_fallback_sortval": "INTEGER",
+}
+
 
 # -------------------------------------------------------------------------
 #
@@ -78,6 +146,30 @@ class DBAPI(DbGeneric):
     Database backends class for DB-API 2.0 databases
     """
 
+    def __init__(self, directory=None):
+        # obj_handle -> (obj_class, references) for objects committed in a
+        # batch transaction whose references have not been written yet.
+        self._bulk_references = {}
+        # Whether the derived data exists and is current, None if not checked
+        # yet.
+        self._has_derived_data = None
+        # Handles of the events changed, and of the people referencing
+        # events which did not exist when they were committed, in the
+        # current transaction.  The date columns of these people are
+        # refreshed when it is committed.
+        self._changed_events = set()
+        self._pending_people = set()
+        self.serializer = get_serializer("pickle")
+        super().__init__(directory)
+
+    def load(self, directory, *args, **kwargs):
+        """
+        Load the database and select the serializer used to write records.
+        """
+        self._has_derived_data = None
+        super().load(directory, *args, **kwargs)
+        self.serializer = get_serializer(self._get_metadata("serializer", "pickle"))
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -227,8 +319,270 @@ class DBAPI(DbGeneric):
         self.dbapi.execute("CREATE INDEX note_gramps_id ON note(gramps_id)")
         self.dbapi.execute("CREATE INDEX reference_obj_handle ON reference(obj_handle)")
 
+        self._reset_derived_data()
+
+        self.dbapi.execute(
+            "INSERT INTO metadata (setting, value) VALUES (?, ?)",
+            ["serializer", pickle.dumps(config.get("database.serializer"))],
+        )
+
         self.dbapi.commit()
 
+    def _derived_data_exists(self):
+        """
+        Return True if the database has the data derived from the objects,
+        see :data:`DERIVED_DATA_VERSION`.
+
+        Databases of older versions may lack it, or have it out of date if
+        an older version of Gramps changed them.  They are upgraded when
+        opened for writing, and the derived data is ignored otherwise.
+        """
+        if self._has_derived_data is None:
+            self._has_derived_data = self.get_schema_version() >= DERIVED_DATA_VERSION
+        return self._has_derived_data
+
+    def _reset_derived_data(self):
+        """
+        Create the tables and columns of the data derived from the objects,
+        or empty them, before they are filled by :meth:`rebuild_secondary`.
+        Does not commit.
+        """
+        if self.dbapi.table_exists("family_child"):
+            for table in EDGE_TABLES:
+                self.dbapi.execute(f"DELETE FROM {table}")
+        else:
+            self._create_edge_tables()
+        # Backends which cannot check columns only have the date columns
+        # in databases of the current version, which are not reset.
+        column_exists = getattr(self.dbapi, "column_exists", None)
+        if column_exists is None or not column_exists("person", "birth_sortval"):
+            self._create_person_date_columns()
+        if self.dbapi.table_exists("person_phonetic"):
+            self.dbapi.execute("DELETE FROM person_phonetic")
+        else:
+            self._create_phonetic_table()
+        self._reset_text_index()
+        self._has_derived_data = True
+
+    def _create_edge_tables(self):
+        """
+        Create the tables of the edges of the family tree.
+        """
+        for table in EDGE_TABLES:
+            self.dbapi.execute(
+                f"CREATE TABLE {table} "
+                "("
+                "obj_handle VARCHAR(50), "
+                "ref_handle VARCHAR(50)"
+                ")"
+            )
+            self.dbapi.execute(
+                f"CREATE INDEX {table}_obj_handle ON {table}(obj_handle)"
+            )
+
+    def _create_person_date_columns(self):
+        """
+        Create the date columns of the person table, see
+        :data:`PERSON_DATE_COLUMNS`.
+        """
+        for column, sql_type in PERSON_DATE_COLUMNS.items():
+            self.dbapi.execute(f"ALTER TABLE person ADD COLUMN {column} {sql_type}")
+        self.dbapi.execute("CREATE INDEX person_birth_sortval ON person(birth_sortval)")
+        self.dbapi.execute("CREATE INDEX person_death_sortval ON person(death_sortval)")
+
+    def _get_person_dates(self, person):
+        """
+        Given a Person, return the values of the date columns, in the order
+        of :data:`PERSON_DATE_COLUMNS`.
+
+        A person referencing events which do not exist yet, as during an
+        import, is refreshed when the transaction is committed.
+        """
+
+        def get_event(event_ref):
+            data = self._get_raw_data(EVENT_KEY, event_ref.ref)
+            if data is None:
+                self._pending_people.add(person.handle)
+                return None
+            return Event.create(data)
+
+        def get_sortval(event):
+            if event is None:
+                return None
+            return event.get_date_object().get_sort_value()
+
+        def get_fallback(event, is_fallback):
+            if event is not None:
+                return event
+            for event_ref in person.get_primary_event_ref_list():
+                event = get_event(event_ref)
+                if event and is_fallback(event.get_type()):
+                    return event
+            return None
+
+        birth_ref = person.get_birth_ref()
+        birth = get_event(birth_ref) if birth_ref else None
+        death_ref = person.get_death_ref()
+        death = get_event(death_ref) if death_ref else None
+        birth_fallback = get_fallback(birth, EventType.is_birth_fallback)
+        death_fallback = get_fallback(death, EventType.is_death_fallback)
+        return [
+            get_sortval(birth),
+            (birth.get_place_handle() or None) if birth else None,
+            get_sortval(death),
+            get_sortval(birth_fallback),
+            get_sortval(death_fallback),
+        ]
+
+    def _update_person_dates(self, person):
+        """
+        Update the date columns of a person.
+        Does not commit.
+        """
+        sets = ", ".join(f"{column} = ?" for column in PERSON_DATE_COLUMNS)
+        self.dbapi.execute(
+            f"UPDATE person SET {sets} WHERE handle = ?",
+            self._get_person_dates(person) + [person.handle],
+        )
+
+    def _refresh_person_dates(self, final=True):
+        """
+        Update the date columns of the people referencing the events changed
+        in the current transaction, and of the people whose events were
+        missing when they were committed.
+        Does not commit.
+
+        :param final: Whether the transaction is committed.  Otherwise the
+                      people whose events are still missing are refreshed
+                      again later.
+        :type final: bool
+        """
+        if not self._changed_events and not self._pending_people:
+            return
+        handles = set(self._pending_people)
+        events = list(self._changed_events)
+        self._changed_events.clear()
+        self._pending_people.clear()
+        for start in range(0, len(events), FETCH_CHUNK_SIZE):
+            chunk = events[start : start + FETCH_CHUNK_SIZE]
+            self.dbapi.execute(
+                "SELECT obj_handle FROM reference "
+                "WHERE obj_class = 'Person' "
+                f"AND ref_handle IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            handles.update(row[0] for row in self.dbapi.fetchall())
+        for person in self.get_person_from_handles(handles):
+            self._update_person_dates(person)
+        if final:
+            # The events which are still missing are dangling references.
+            self._pending_people.clear()
+
+    def _create_phonetic_table(self):
+        """
+        Create the table of the phonetic codes of the names of the people.
+
+        Each row holds a code of a part of a name of a person (obj_handle):
+        the index of the name, 0 for the primary name and then the alternate
+        names, the part of the name ("surname", "given", "call", "nick" or
+        "family_nick"), the phonetic method, see
+        :data:`~gramps.gen.soundex.PHONETIC_METHODS`, and the code.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE person_phonetic "
+            "("
+            "obj_handle VARCHAR(50), "
+            "name_index INTEGER, "
+            "part VARCHAR(20), "
+            "method VARCHAR(20), "
+            "code VARCHAR(10)"
+            ")"
+        )
+        self.dbapi.execute(
+            "CREATE INDEX person_phonetic_obj_handle ON person_phonetic(obj_handle)"
+        )
+        self.dbapi.execute("CREATE INDEX person_phonetic_code ON person_phonetic(code)")
+
+    def _get_phonetic_rows(self, person):
+        """
+        Return the rows of the phonetic table of a person.  Empty parts of
+        names have no codes.
+        """
+        rows = {}
+        names = [person.get_primary_name()] + person.get_alternate_names()
+        for index, name in enumerate(names):
+            parts = [
+                ("given", name.get_first_name()),
+                ("call", name.get_call_name()),
+                ("nick", name.get_nick_name()),
+                ("family_nick", name.get_family_nick_name()),
+            ]
+            parts += [
+                ("surname", surname.get_surname())
+                for surname in name.get_surname_list()
+            ]
+            for part, value in parts:
+                if not value:
+                    continue
+                for method in PHONETIC_METHODS:
+                    for code in phonetic_codes(value, method):
+                        rows[(person.handle, index, part, method, code)] = None
+        return list(rows)
+
+    def _update_phonetic(self, obj):
+        """
+        Replace the phonetic codes of a person by its current ones.
+        Does not commit.
+        """
+        if not isinstance(obj, Person) or not self._derived_data_exists():
+            return
+        self.dbapi.execute(
+            "DELETE FROM person_phonetic WHERE obj_handle = ?", [obj.handle]
+        )
+        self._insert_phonetic_rows(self._get_phonetic_rows(obj))
+
+    def _insert_phonetic_rows(self, rows):
+        """
+        Insert rows in the phonetic table.
+        Does not commit.
+        """
+        if rows:
+            self._executemany(
+                "INSERT INTO person_phonetic "
+                "(obj_handle, name_index, part, method, code) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _remove_phonetic(self, obj_key, handle):
+        """
+        Remove the phonetic codes of a person.
+        Does not commit.
+        """
+        if obj_key == PERSON_KEY and self._derived_data_exists():
+            self.dbapi.execute(
+                "DELETE FROM person_phonetic WHERE obj_handle = ?", [handle]
+            )
+
+    def _reset_text_index(self):
+        """
+        Create the full-text index of the texts of the objects, or empty it,
+        before it is filled.  Backends with full-text search override it.
+        Does not commit.
+        """
+
+    def _update_text_index(self, obj):
+        """
+        Replace the texts of an object in the full-text index.
+        Does not commit.
+        """
+
+    def _remove_text_index(self, handle):
+        """
+        Remove the texts of an object from the full-text index.
+        Does not commit.
+        """
+
     def _close(self):
         self.dbapi.close()
 
@@ -248,6 +602,7 @@ class DBAPI(DbGeneric):
         """
         if self.transaction is None:
             _LOG.debug("    DBAPI %s transaction commit", hex(id(self)))
+            self._refresh_person_dates()
             self.dbapi.commit()
 
     def _txn_abort(self):
@@ -256,6 +611,8 @@ class DBAPI(DbGeneric):
         Executes a db ROLLBACK;
         """
         if self.transaction is None:
+            self._changed_events.clear()
+            self._pending_people.clear()
             self.dbapi.rollback()
 
     def _collation(self, locale):
@@ -298,6 +655,8 @@ class DBAPI(DbGeneric):
         )
 
         action = {TXNADD: "-add", TXNUPD: "-update", TXNDEL: "-delete", None: "-delete"}
+        self._flush_bulk_references()
+        self._refresh_person_dates()
         self.dbapi.commit()
         if not transaction.batch:
             # Now, emit signals:
@@ -326,6 +685,9 @@ class DBAPI(DbGeneric):
                         if handles:
                             signal = KEY_TO_NAME_MAP[obj_type] + action[trans_type]
                             self.emit(signal, (handles,))
+        else:
+            # no signals tell about the changes
+            self._change_count += 1
         self.transaction = None
         msg = transaction.get_description()
         self.undodb.commit(transaction, msg)
@@ -337,7 +699,11 @@ class DBAPI(DbGeneric):
         """
         Executed after a batch operation abort.
         """
+        self._bulk_references.clear()
+        self._changed_events.clear()
+        self._pending_people.clear()
         self.dbapi.rollback()
+        self.cache.clear()
         self.transaction = None
         transaction.clear()
         transaction.first = None
@@ -582,7 +948,7 @@ class DBAPI(DbGeneric):
         self.dbapi.execute("SELECT blob_data FROM tag WHERE name = ?", [name])
         row = self.dbapi.fetchone()
         if row:
-            return Tag.create(pickle.loads(row[0]))
+            return Tag.create(self.serializer.loads(row[0]))
         return None
 
     def _get_number_of(self, obj_key):
@@ -631,29 +997,100 @@ class DBAPI(DbGeneric):
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
 
+        if trans.batch:
+            return self._commit_bulk(obj, obj_key, trans)
+
+        data = obj.serialize()
         if self._has_handle(obj_key, obj.handle):
             old_data = self._get_raw_data(obj_key, obj.handle)
+            if obj_key == EVENT_KEY:
+                self._changed_events.add(obj.handle)
             # update the object:
             self.dbapi.execute(
                 f"UPDATE {table} SET blob_data = ? WHERE handle = ?",
-                [pickle.dumps(obj.serialize()), obj.handle],
+                [self.serializer.dumps(data), obj.handle],
             )
         else:
             # Insert the object:
             self.dbapi.execute(
                 f"INSERT INTO {table} (handle, blob_data) VALUES (?, ?)",
-                [obj.handle, pickle.dumps(obj.serialize())],
+                [obj.handle, self.serializer.dumps(data)],
             )
+        self.cache.discard(obj_key, obj.handle)
         self._update_secondary_values(obj)
-        self._update_backlinks(obj, trans)
-        if not trans.batch:
-            if old_data:
-                trans.add(obj_key, TXNUPD, obj.handle, old_data, obj.serialize())
-            else:
-                trans.add(obj_key, TXNADD, obj.handle, None, obj.serialize())
+        self._update_edges(obj)
+        self._update_phonetic(obj)
+        self._update_text_index(obj)
+        self._update_backlinks(obj, trans, data)
+        if old_data:
+            trans.add(obj_key, TXNUPD, obj.handle, old_data, data)
+        else:
+            trans.add(obj_key, TXNADD, obj.handle, None, data)
+
+        return old_data
 
+    def _commit_bulk(self, obj, obj_key, trans):
+        """
+        Commit the specified object as part of a batch transaction.
+
+        The object row and its secondary values are written at once by
+        :meth:`_upsert_object`, so that the object is immediately visible to
+        readers in the same transaction.  Its references are buffered and
+        written in chunks by :meth:`_flush_bulk_references`.
+        """
+        old_data = None
+        if obj_key == PERSON_KEY:
+            # commit_person needs the old data to maintain the gender
+            # statistics and surname list.
+            old_data = self._get_raw_data(obj_key, obj.handle)
+        elif obj_key == EVENT_KEY and self._has_handle(obj_key, obj.handle):
+            self._changed_events.add(obj.handle)
+
+        data = obj.serialize()
+        self._upsert_object(obj_key, obj, data)
+        self.cache.discard(obj_key, obj.handle)
+        self._update_edges(obj)
+        self._update_phonetic(obj)
+        self._update_text_index(obj)
+        self._update_backlinks(obj, trans, data)
         return old_data
 
+    def _upsert_object(self, obj_key, obj, data):
+        """
+        Insert or update the row of an object, with its secondary values.
+        Does not commit.
+
+        Backends which support it override this with a single UPSERT
+        statement.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        if self._has_handle(obj_key, obj.handle):
+            self.dbapi.execute(
+                f"UPDATE {table} SET blob_data = ? WHERE handle = ?",
+                [self.serializer.dumps(data), obj.handle],
+            )
+        else:
+            self.dbapi.execute(
+                f"INSERT INTO {table} (handle, blob_data) VALUES (?, ?)",
+                [obj.handle, self.serializer.dumps(data)],
+            )
+        self._update_secondary_values(obj)
+
+    def _executemany(self, query, rows):
+        """
+        Execute a statement once for each row of parameters.
+        Does not commit.
+
+        Uses the executemany method of the connection of the backend, if it
+        has one.
+        """
+        executemany = getattr(self.dbapi, "executemany", None)
+        if executemany is not None:
+            executemany(query, rows)
+        else:
+            for row in rows:
+                self.dbapi.execute(query, row)
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
@@ -666,16 +1103,26 @@ class DBAPI(DbGeneric):
             # update the object:
             self.dbapi.execute(
                 f"UPDATE {table} SET blob_data = ? WHERE handle = ?",
-                [pickle.dumps(data), handle],
+                [self.serializer.dumps(data), handle],
             )
         else:
             # Insert the object:
             self.dbapi.execute(
                 f"INSERT INTO {table} (handle, blob_data) VALUES (?, ?)",
-                [handle, pickle.dumps(data)],
+                [handle, self.serializer.dumps(data)],
             )
+        self.cache.discard(obj_key, handle)
+
+    def _update_backlinks(self, obj, transaction, data=None):
+        """
+        Update the references of an object.
 
-    def _update_backlinks(self, obj, transaction):
+        :param data: The serialized data of the object, if the caller has
+                     it already.
+        """
+        if data is None:
+            data = obj.serialize()
+        obj_class = obj.__class__.__name__
         if not transaction.batch:
             # Find existing references
             self.dbapi.execute(
@@ -687,7 +1134,7 @@ class DBAPI(DbGeneric):
             # Once we have the list of rows that already have a reference
             # we need to compare it with the list of objects that are
             # still references from the primary object.
-            current_references = set(obj.get_referenced_handles_recursively())
+            current_references = set(get_raw_references(obj_class, data))
             no_longer_required_references = existing_references.difference(
                 current_references
             )
@@ -704,41 +1151,54 @@ class DBAPI(DbGeneric):
                     "INSERT INTO reference "
                     "(obj_handle, obj_class, ref_handle, ref_class) "
                     "VALUES(?, ?, ?, ?)",
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
+                    [obj.handle, obj_class, ref_handle, ref_class_name],
                 )
 
             # Add new references to the transaction
             for ref_class_name, ref_handle in new_references:
                 key = (obj.handle, ref_handle)
-                data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
-                transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
+                new_data = (obj.handle, obj_class, ref_handle, ref_class_name)
+                transaction.add(REFERENCE_KEY, TXNADD, key, None, new_data)
 
             # Add old references to the transaction
             for ref_class_name, ref_handle in no_longer_required_references:
                 key = (obj.handle, ref_handle)
-                old_data = (
-                    obj.handle,
-                    obj.__class__.__name__,
-                    ref_handle,
-                    ref_class_name,
-                )
+                old_data = (obj.handle, obj_class, ref_handle, ref_class_name)
                 transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
         else:  # batch mode
-            current_references = set(obj.get_referenced_handles_recursively())
-
-            # Delete the existing references
-            self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
+            self._bulk_references[obj.handle] = (
+                obj_class,
+                set(get_raw_references(obj_class, data)),
             )
+            if len(self._bulk_references) >= BULK_CHUNK_SIZE:
+                self._flush_bulk_references()
 
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                self.dbapi.execute(
-                    "INSERT INTO reference "
-                    "(obj_handle, obj_class, ref_handle, ref_class) "
-                    "VALUES(?, ?, ?, ?)",
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
+    def _flush_bulk_references(self):
+        """
+        Write the references buffered during a batch transaction.
+
+        The previous references of all buffered objects are deleted and the
+        current ones inserted, each with a single executemany call.
+        """
+        if not self._bulk_references:
+            return
+        self._executemany(
+            "DELETE FROM reference WHERE obj_handle = ?",
+            [[handle] for handle in self._bulk_references],
+        )
+        self._executemany(
+            "INSERT INTO reference "
+            "(obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES(?, ?, ?, ?)",
+            [
+                [obj_handle, obj_class, ref_handle, ref_class_name]
+                for obj_handle, (obj_class, references) in (
+                    self._bulk_references.items()
                 )
+                for ref_class_name, ref_handle in references
+            ],
+        )
+        self._bulk_references.clear()
 
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
@@ -749,6 +1209,12 @@ class DBAPI(DbGeneric):
             self._remove_backlinks(obj_class, handle, transaction)
             table = KEY_TO_NAME_MAP[obj_key]
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            self.cache.discard(obj_key, handle)
+            self._remove_edges(obj_key, handle)
+            self._remove_phonetic(obj_key, handle)
+            self._remove_text_index(handle)
+            if obj_key == EVENT_KEY:
+                self._changed_events.add(handle)
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -756,6 +1222,7 @@ class DBAPI(DbGeneric):
         """
         Removes all references from this object (backlinks).
         """
+        self._bulk_references.pop(obj_handle, None)
         # collect backlinks from this object for undo
         self.dbapi.execute(
             "SELECT ref_class, ref_handle FROM reference WHERE obj_handle = ?",
@@ -771,6 +1238,57 @@ class DBAPI(DbGeneric):
                 old_data = (obj_handle, obj_class, ref_handle, ref_class_name)
                 transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
 
+    def _get_edges(self, obj):
+        """
+        Return a dictionary of the edge tables derived from a person or a
+        family, with the handles linked to the object in each table.
+        """
+        if isinstance(obj, Person):
+            return {
+                "person_family": obj.get_family_handle_list(),
+                "person_parent_family": obj.get_parent_family_handle_list()[:1],
+            }
+        if isinstance(obj, Family):
+            return {
+                "family_parent": [
+                    handle
+                    for handle in (obj.get_father_handle(), obj.get_mother_handle())
+                    if handle
+                ],
+                "family_child": [ref.ref for ref in obj.get_child_ref_list()],
+            }
+        return {}
+
+    def _update_edges(self, obj):
+        """
+        Replace the edges of a person or family by its current ones.
+        Does not commit.
+        """
+        if not self._derived_data_exists():
+            return
+        for table, handles in self._get_edges(obj).items():
+            self.dbapi.execute(
+                f"DELETE FROM {table} WHERE obj_handle = ?", [obj.handle]
+            )
+            if handles:
+                self._executemany(
+                    f"INSERT INTO {table} (obj_handle, ref_handle) VALUES (?, ?)",
+                    [[obj.handle, handle] for handle in handles],
+                )
+
+    def _remove_edges(self, obj_key, handle):
+        """
+        Remove the edges of a person or family.
+        Does not commit.
+        """
+        if not self._derived_data_exists():
+            return
+        for table, table_key in EDGE_TABLES.items():
+            if table_key == obj_key:
+                self.dbapi.execute(
+                    f"DELETE FROM {table} WHERE obj_handle = ?", [handle]
+                )
+
     def find_backlink_handles(self, handle, include_classes=None):
         """
         Find all objects that hold a reference to the object handle.
@@ -788,6 +1306,7 @@ class DBAPI(DbGeneric):
 
             result_list = list(find_backlink_handles(handle))
         """
+        self._flush_bulk_references()
         self.dbapi.execute(
             "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?",
             [handle],
@@ -797,6 +1316,165 @@ class DBAPI(DbGeneric):
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
 
+    def get_backlink_map(self):
+        """
+        Return the backlinks of all objects, read with a single scan of the
+        reference table.
+        """
+        self._flush_bulk_references()
+        backlinks = {}
+        with self.dbapi.cursor() as cursor:
+            cursor.execute("SELECT ref_handle, obj_class, obj_handle FROM reference")
+            for rows in iter(cursor.fetchmany, []):
+                for ref_handle, obj_class, obj_handle in rows:
+                    backlinks.setdefault(ref_handle, []).append((obj_class, obj_handle))
+        return backlinks
+
+    def _get_generation_handles_sql(self, handle, tables, max_gen, min_gen):
+        """
+        Return the handles of the people reached from a person by following
+        two edge tables, from a person to a family and from the family to
+        people, for between min_gen and max_gen generations.
+
+        With a maximum, the search is bounded by the number of generations.
+        Without one, the generations are only counted up to min_gen, and the
+        search then continues by handle, so that it ends on loops in the
+        family tree.
+        """
+        person_table, family_table = tables
+        step = (
+            f"JOIN {person_table} AS p ON p.obj_handle = g.handle "
+            f"JOIN {family_table} AS f ON f.obj_handle = p.ref_handle"
+        )
+        if max_gen is not None:
+            self.dbapi.execute(
+                "WITH RECURSIVE gen(handle, num) AS ("
+                "SELECT ?, 0 "
+                "UNION "
+                f"SELECT f.ref_handle, g.num + 1 FROM gen AS g {step} "
+                "WHERE g.num < ?"
+                ") "
+                "SELECT DISTINCT handle FROM gen WHERE num >= ?",
+                [handle, max_gen, min_gen],
+            )
+        else:
+            self.dbapi.execute(
+                "WITH RECURSIVE gen(handle, num) AS ("
+                "SELECT ?, 0 "
+                "UNION "
+                f"SELECT f.ref_handle, g.num + 1 FROM gen AS g {step} "
+                "WHERE g.num < ?"
+                "), "
+                "more(handle) AS ("
+                "SELECT handle FROM gen WHERE num = ? "
+                "UNION "
+                f"SELECT f.ref_handle FROM more AS g {step}"
+                ") "
+                "SELECT handle FROM more",
+                [handle, min_gen, min_gen],
+            )
+        return {row[0] for row in self.dbapi.fetchall()}
+
+    def get_ancestor_handles(self, handle, max_gen=None, min_gen=0):
+        """
+        Return the set of handles of the ancestors of a person.
+
+        See :meth:`~gramps.gen.db.base.DbReadBase.get_ancestor_handles`.
+        The ancestors are found with a recursive query on the edge tables.
+        """
+        if not self._derived_data_exists():
+            return super().get_ancestor_handles(handle, max_gen, min_gen)
+        return self._get_generation_handles_sql(
+            handle, ("person_parent_family", "family_parent"), max_gen, min_gen
+        )
+
+    def get_descendant_handles(self, handle, max_gen=None, min_gen=0):
+        """
+        Return the set of handles of the descendants of a person.
+
+        See :meth:`~gramps.gen.db.base.DbReadBase.get_descendant_handles`.
+        The descendants are found with a recursive query on the edge tables.
+        """
+        if not self._derived_data_exists():
+            return super().get_descendant_handles(handle, max_gen, min_gen)
+        return self._get_generation_handles_sql(
+            handle, ("person_family", "family_child"), max_gen, min_gen
+        )
+
+    def select_handles(self, class_name, where=None, args=None):
+        """
+        Return the handles of the objects of a primary class which match a
+        SQL predicate.
+
+        See :meth:`~gramps.gen.db.base.DbReadBase.select_handles`.
+        """
+        if class_name == "Person" and not self._derived_data_exists():
+            # The predicates may use the date columns and the phonetic table,
+            # which a read-only database of an older version may lack.
+            return None
+        self._flush_bulk_references()
+        if class_name == "Person":
+            self._refresh_person_dates(final=False)
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[class_name]]
+        query = f"SELECT handle FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        self.dbapi.execute(query, args or [])
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def find_people_by_phonetic(self, surname, given=None, method=SOUNDEX):
+        """
+        Return the handles of the people with a name whose surname, and
+        given name if one is given, sound like the given ones.
+
+        See :meth:`~gramps.gen.db.base.DbReadBase.find_people_by_phonetic`.
+        """
+        if not self._derived_data_exists():
+            return None
+        surname_codes = phonetic_codes(surname, method)
+        query = "SELECT DISTINCT surname.obj_handle FROM person_phonetic AS surname "
+        args = []
+        if given:
+            given_codes = phonetic_codes(given, method)
+            query += (
+                "JOIN person_phonetic AS given "
+                "ON given.obj_handle = surname.obj_handle "
+                "AND given.name_index = surname.name_index "
+                "AND given.part = 'given' AND given.method = ? "
+                f"AND given.code IN ({', '.join('?' * len(given_codes))}) "
+            )
+            args += [method] + given_codes
+        query += (
+            "WHERE surname.part = 'surname' AND surname.method = ? "
+            f"AND surname.code IN ({', '.join('?' * len(surname_codes))})"
+        )
+        args += [method] + surname_codes
+        self.dbapi.execute(query, args)
+        return {row[0] for row in self.dbapi.fetchall()}
+
+    def get_person_sortvals(self, handle):
+        """
+        Return the sort values of the dates of the birth and death of a
+        person, or of their fallbacks, as a (birth, death) tuple.
+
+        See :meth:`~gramps.gen.db.base.DbReadBase.get_person_sortvals`.
+        """
+        if (
+            not self._derived_data_exists()
+            or self._changed_events
+            or self._pending_people
+        ):
+            return None
+        self.dbapi.execute(
+            "SELECT birth_fallback_sortval, death_fallback_sortval "
+            "FROM person WHERE handle = ?",
+            [handle],
+        )
+        row = self.dbapi.fetchone()
+        if row is None:
+            return None
+        return (row[0] or 0, row[1] or 0)
+
     def find_initial_person(self):
         """
         Returns first person in the database
@@ -818,10 +1496,13 @@ class DBAPI(DbGeneric):
         Return an iterator over handles in the database
         """
         table = KEY_TO_NAME_MAP[obj_key]
-        self.dbapi.execute(f"SELECT handle FROM {table}")
-        rows = self.dbapi.fetchall()
-        for row in rows:
-            yield row[0]
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(f"SELECT handle FROM {table}")
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield row[0]
+                rows = cursor.fetchmany()
 
     def _iter_raw_data(self, obj_key):
         """
@@ -833,7 +1514,7 @@ class DBAPI(DbGeneric):
             rows = cursor.fetchmany()
             while rows:
                 for row in rows:
-                    yield (row[0], pickle.loads(row[1]))
+                    yield (row[0], self.serializer.loads(row[1]))
                 rows = cursor.fetchmany()
 
     def _iter_raw_place_tree_data(self):
@@ -849,66 +1530,76 @@ class DBAPI(DbGeneric):
             rows = self.dbapi.fetchall()
             for row in rows:
                 to_do.append(row[0])
-                yield (row[0], pickle.loads(row[1]))
+                yield (row[0], self.serializer.loads(row[1]))
 
     def reindex_reference_map(self, callback):
         """
         Reindex all primary records in the database.
+
+        The reference indexes are dropped during the rebuild and recreated
+        afterwards.  The records are read in chunks, which are decoded by a
+        pool of worker processes for large databases, and the references of
+        each chunk are inserted with a single executemany call.
         """
+        self._bulk_references.clear()
         self._txn_begin()
         self.dbapi.execute("DELETE FROM reference")
+        self.dbapi.execute("DROP INDEX IF EXISTS reference_ref_handle")
+        self.dbapi.execute("DROP INDEX IF EXISTS reference_obj_handle")
         total = 0
-        for tbl in (
-            "people",
-            "families",
-            "events",
-            "places",
-            "sources",
-            "citations",
-            "media",
-            "repositories",
-            "notes",
-            "tags",
-        ):
-            total += self.method("get_number_of_%s", tbl)()
+        for obj_key in KEY_TO_NAME_MAP:
+            if obj_key != REFERENCE_KEY:
+                total += self._get_number_of(obj_key)
         UpdateCallback.__init__(self, callback)
         self.set_total(total)
-        primary_table = (
-            (self.get_person_cursor, Person),
-            (self.get_family_cursor, Family),
-            (self.get_event_cursor, Event),
-            (self.get_place_cursor, Place),
-            (self.get_source_cursor, Source),
-            (self.get_citation_cursor, Citation),
-            (self.get_media_cursor, Media),
-            (self.get_repository_cursor, Repository),
-            (self.get_note_cursor, Note),
-            (self.get_tag_cursor, Tag),
-        )
-        # Now we use the functions and classes defined above
-        # to loop through each of the primary object tables.
-        for cursor_func, class_func in primary_table:
-            logging.info("Rebuilding %s reference map", class_func.__name__)
-            with cursor_func() as cursor:
-                for _, val in cursor:
-                    obj = class_func.create(val)
-                    references = set(obj.get_referenced_handles_recursively())
-                    # handle addition of new references
-                    for ref_class_name, ref_handle in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [
-                                obj.handle,
-                                obj.__class__.__name__,
-                                ref_handle,
-                                ref_class_name,
-                            ],
-                        )
-                    self.update()
+
+        workers = min(os.cpu_count() or 1, REINDEX_MAX_WORKERS)
+        if total <= 2 * REINDEX_CHUNK_SIZE:
+            workers = 0
+        # The numbers of objects of the chunks whose references are pending
+        counts = deque()
+
+        def iter_tasks():
+            for class_name, rows in self._iter_record_chunks():
+                counts.append(len(rows))
+                yield self.serializer.loads, class_name, rows
+
+        done = 0
+        for references in run_tasks(get_reference_rows, iter_tasks(), workers):
+            self._executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                references,
+            )
+            done += counts.popleft()
+            self.update(done)
+
+        self.dbapi.execute("CREATE INDEX reference_ref_handle ON reference(ref_handle)")
+        self.dbapi.execute("CREATE INDEX reference_obj_handle ON reference(obj_handle)")
         self._txn_commit()
 
+    def _iter_record_chunks(self):
+        """
+        Iterate over (class name, rows) pairs, where rows is a list of
+        (handle, blob_data) rows of a primary object table.
+        """
+        for obj_key, table in KEY_TO_NAME_MAP.items():
+            if obj_key == REFERENCE_KEY:
+                continue
+            class_name = KEY_TO_CLASS_MAP[obj_key]
+            logging.info("Rebuilding %s reference map", class_name)
+            with self.dbapi.cursor() as cursor:
+                cursor.execute(f"SELECT handle, blob_data FROM {table}")
+                rows = []
+                for chunk in iter(cursor.fetchmany, []):
+                    rows += chunk
+                    if len(rows) >= REINDEX_CHUNK_SIZE:
+                        yield class_name, rows
+                        rows = []
+                if rows:
+                    yield class_name, rows
+
     def rebuild_secondary(self, callback=None):
         """
         Rebuild secondary indices
@@ -935,6 +1626,7 @@ class DBAPI(DbGeneric):
 
         # First, expand blob to individual fields:
         self._txn_begin()
+        self._reset_derived_data()
         for obj_type in (
             "Person",
             "Family",
@@ -950,6 +1642,9 @@ class DBAPI(DbGeneric):
             for handle in self.method("get_%s_handles", obj_type)():
                 obj = self.method("get_%s_from_handle", obj_type)(handle)
                 self._update_secondary_values(obj)
+                self._update_edges(obj)
+                self._update_phonetic(obj)
+                self._update_text_index(obj)
                 self.update()
         self._txn_commit()
 
@@ -957,6 +1652,66 @@ class DBAPI(DbGeneric):
         gstats = self.get_gender_stats()
         self.genderStats = GenderStats(gstats)
 
+    def set_serializer(self, name, callback=None):
+        """
+        Select the serializer used to write records and rewrite all existing
+        records with it.
+
+        :param name: Name of the serializer, see
+                     :data:`~.serializer.SERIALIZERS`.
+        :type name: str
+        :param callback: Progress callback.
+        :type callback: function
+        :raises DbUpgradeRequiredError: if the schema version of the database
+                                        does not allow other serializers than
+                                        pickle.
+        """
+        if self.readonly:
+            return
+
+        version = self.get_schema_version()
+        if version < SERIALIZER_VERSION:
+            raise DbUpgradeRequiredError(version, self.VERSION[0])
+
+        serializer = get_serializer(name)
+        total = 0
+        for obj_key in KEY_TO_NAME_MAP:
+            if obj_key != REFERENCE_KEY:
+                total += self._get_number_of(obj_key)
+        UpdateCallback.__init__(self, callback)
+        self.set_total(total)
+
+        done = 0
+        self._txn_begin()
+        for obj_key, table in KEY_TO_NAME_MAP.items():
+            if obj_key == REFERENCE_KEY:
+                continue
+            with self.dbapi.cursor() as cursor:
+                cursor.execute(f"SELECT handle, blob_data FROM {table}")
+                rows = cursor.fetchmany()
+                while rows:
+                    self._executemany(
+                        f"UPDATE {table} SET blob_data = ? WHERE handle = ?",
+                        [
+                            [serializer.dumps(serializer.loads(blob)), handle]
+                            for handle, blob in rows
+                        ],
+                    )
+                    done += len(rows)
+                    self.update(done)
+                    rows = cursor.fetchmany()
+        self._txn_commit()
+        self.cache.clear()
+
+        self._set_metadata("serializer", serializer.name)
+        self.serializer = serializer
+
+    def get_serializer_name(self):
+        """
+        Return the name of the serializer used to write records.
+        """
+        return self.serializer.name
+
     def _has_handle(self, obj_key, handle):
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT 1 FROM {table} WHERE handle = ?", [handle])
@@ -973,12 +1728,57 @@ class DBAPI(DbGeneric):
         return [row[0] for row in self.dbapi.fetchall()]
 
     def _get_raw_data(self, obj_key, handle):
+        """
+        Return the raw data of an object.
+
+        The stored records are kept in the record cache, rather than their
+        raw data, because the objects created from raw data share its lists.
+        """
+        blob = self.cache.get(obj_key, handle)
+        if blob is None:
+            table = KEY_TO_NAME_MAP[obj_key]
+            self.dbapi.execute(
+                f"SELECT blob_data FROM {table} WHERE handle = ?", [handle]
+            )
+            row = self.dbapi.fetchone()
+            if not row:
+                return None
+            blob = row[0]
+            self.cache.put(obj_key, handle, blob)
+        return self.serializer.loads(blob)
+
+    def _get_raw_data_many(self, obj_key, handles):
+        """
+        Iterate over (handle, raw data) pairs for the given handles, in the
+        same order, skipping the handles of objects which do not exist.
+
+        The handles are processed in chunks.  The objects of a chunk which
+        are not in the record cache are fetched with a single query.
+        """
         table = KEY_TO_NAME_MAP[obj_key]
-        self.dbapi.execute(f"SELECT blob_data FROM {table} WHERE handle = ?", [handle])
-        row = self.dbapi.fetchone()
-        if row:
-            return pickle.loads(row[0])
-        return None
+        handles = iter(handles)
+        chunk = list(islice(handles, FETCH_CHUNK_SIZE))
+        while chunk:
+            blobs = {}
+            for handle in chunk:
+                blob = self.cache.get(obj_key, handle)
+                if blob is not None:
+                    blobs[handle] = blob
+            missing = [handle for handle in dict.fromkeys(chunk) if handle not in blobs]
+            if missing:
+                self.dbapi.execute(
+                    f"SELECT handle, blob_data FROM {table} "
+                    f"WHERE handle IN ({', '.join('?' * len(missing))})",
+                    missing,
+                )
+                for handle, blob in self.dbapi.fetchall():
+                    blobs[handle] = blob
+                    self.cache.put(obj_key, handle, blob)
+            for handle in chunk:
+                blob = blobs.get(handle)
+                if blob is not None:
+                    yield (handle, self.serializer.loads(blob))
+            chunk = list(islice(handles, FETCH_CHUNK_SIZE))
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
         table = KEY_TO_NAME_MAP[obj_key]
@@ -987,7 +1787,7 @@ class DBAPI(DbGeneric):
         )
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return self.serializer.loads(row[0])
         return None
 
     def get_gender_stats(self):
@@ -1037,21 +1837,30 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        self.cache.discard(obj_key, handle)
+        if obj_key == EVENT_KEY:
+            self._changed_events.add(handle)
         if data is None:
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            self._remove_edges(obj_key, handle)
+            self._remove_phonetic(obj_key, handle)
+            self._remove_text_index(handle)
         else:
             if self._has_handle(obj_key, handle):
                 self.dbapi.execute(
                     f"UPDATE {table} SET blob_data = ? WHERE handle = ?",
-                    [pickle.dumps(data), handle],
+                    [self.serializer.dumps(data), handle],
                 )
             else:
                 self.dbapi.execute(
                     f"INSERT INTO {table} (handle, blob_data) VALUES (?, ?)",
-                    [handle, pickle.dumps(data)],
+                    [handle, self.serializer.dumps(data)],
                 )
             obj = self._get_table_func(cls)["class_func"].create(data)
             self._update_secondary_values(obj)
+            self._update_edges(obj)
+            self._update_phonetic(obj)
+            self._update_text_index(obj)
 
     def get_surname_list(self):
         """
@@ -1103,34 +1912,41 @@ class DBAPI(DbGeneric):
                         f"ALTER TABLE {table_name} ADD COLUMN {field} {sql_type}"
                     )
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_values(self, obj):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Given a primary object return a list of its secondary field names,
+        including the derived fields, and a list of their values.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append(f"{field} = ?")
-            values.append(getattr(obj, field))
+        fields = [
+            field[0] for field in obj.get_secondary_fields() if field[0] != "handle"
+        ]
+        values = [getattr(obj, field) for field in fields]
 
         # Derived fields
         if table == "Person":
             given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
+            fields += ["given_name", "surname"]
+            values += [given_name, surname]
+            if self._derived_data_exists():
+                fields += list(PERSON_DATE_COLUMNS)
+                values += self._get_person_dates(obj)
         if table == "Place":
-            handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
-            values.append(handle)
+            fields.append("enclosed_by")
+            values.append(self._get_place_data(obj))
+        return fields, values
+
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        fields, values = self._get_secondary_values(obj)
+        sets = [f"{field} = ?" for field in fields]
 
         if len(values) > 0:
-            table_name = table.lower()
+            table_name = obj.__class__.__name__.lower()
             self.dbapi.execute(
                 f'UPDATE {table_name} SET {", ".join(sets)} where handle = ?',
                 self._sql_cast_list(values) + [obj.handle],
@@ -30,22 +30,62 @@ Backend for SQLite database.
 # -------------------------------------------------------------------------
 import logging
 import os
+import pickle
 import re
 import sqlite3
+import threading
+import weakref
+from urllib.request import pathname2url
 
 # -------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
-from gramps.gen.db.dbconst import ARRAYSIZE
-from gramps.plugins.db.dbapi.dbapi import DBAPI
+from gramps.gen.db.dbconst import ARRAYSIZE, CLASS_TO_KEY_MAP, KEY_TO_NAME_MAP
+from gramps.gen.utils.configmanager import ConfigManager
+from gramps.plugins.db.dbapi.dbapi import BULK_CHUNK_SIZE, DBAPI, FETCH_CHUNK_SIZE
 
 _ = glocale.translation.gettext
 
+LOG = logging.getLogger(".sqlite")
+
 sqlite3.paramstyle = "qmark"
 
+# Connection tuning profiles.  Each profile gives the size of the prepared
+# statement cache of the connection, the pragmas set when the database is
+# opened, and the pragmas set for the duration of batch transactions, whose
+# previous values are restored afterwards.
+_PERFORMANCE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+PROFILES = {
+    "default": {
+        "cached_statements": 128,
+        "pragmas": {},
+        "batch_pragmas": {},
+    },
+    "performance": {
+        "cached_statements": 512,
+        "pragmas": _PERFORMANCE_PRAGMAS,
+        "batch_pragmas": {},
+    },
+    "bulk": {
+        "cached_statements": 512,
+        "pragmas": _PERFORMANCE_PRAGMAS,
+        "batch_pragmas": {
+            "synchronous": "OFF",
+            "cache_size": -256 * 1024,
+        },
+    },
+}
+
 
 # -------------------------------------------------------------------------
 #
@@ -71,12 +111,297 @@ class SQLite(DBAPI):
         )
         return summary
 
+    def __init__(self, directory=None):
+        # Whether the full-text index exists, None if not checked yet.
+        self._has_text_index = None
+        # Language of the texts of the full-text index, "" if the texts were
+        # written in several languages.
+        self._text_index_lang = ""
+        # handle -> (obj_class, text) for objects committed in a batch
+        # transaction whose texts have not been indexed yet.
+        self._bulk_texts = {}
+        super().__init__(directory)
+
+    def load(self, directory, *args, **kwargs):
+        """
+        Load the database.
+        """
+        self._has_text_index = None
+        super().load(directory, *args, **kwargs)
+
     def _initialize(self, directory, username, password):
         if directory == ":memory:":
             path_to_db = ":memory:"
         else:
             path_to_db = os.path.join(directory, "sqlite.db")
-        self.dbapi = Connection(path_to_db)
+        self.profile = self._get_profile_name(directory)
+        profile = PROFILES[self.profile]
+        self.dbapi = Connection(
+            path_to_db, cached_statements=profile["cached_statements"]
+        )
+        pragmas = dict(profile["pragmas"])
+        if self.readonly:
+            # Changing the journal mode writes to the database.
+            pragmas.pop("journal_mode", None)
+        self.dbapi.set_pragmas(pragmas)
+        self._saved_pragmas = {}
+
+    def _get_profile_name(self, directory):
+        """
+        Return the name of the tuning profile of the family tree.
+
+        The profile is given by the "database.profile" setting of the
+        settings.ini file of the family tree, if any, and by the
+        "database.sqlite-profile" config key otherwise.
+        """
+        name = config.get("database.sqlite-profile")
+        if directory != ":memory:":
+            settings = ConfigManager(os.path.join(directory, "settings.ini"))
+            settings.register("database.profile", "")
+            settings.load()
+            name = settings.get("database.profile") or name
+        if name not in PROFILES:
+            LOG.warning("Unknown SQLite profile '%s', using 'default'", name)
+            name = "default"
+        return name
+
+    def _text_index_exists(self):
+        """
+        Return True if the database has the full-text index, and it is
+        current.
+        """
+        if self._has_text_index is None:
+            self._has_text_index = self._derived_data_exists() and (
+                self.dbapi.table_exists("text_key")
+            )
+            if self._has_text_index:
+                self._text_index_lang = self._get_metadata("text_index_lang", "")
+        return self._has_text_index
+
+    def _set_text_index_lang(self, lang):
+        """
+        Store the language of the texts of the full-text index.
+        Does not commit.
+        """
+        self.dbapi.execute(
+            "DELETE FROM metadata WHERE setting = ?", ["text_index_lang"]
+        )
+        self.dbapi.execute(
+            "INSERT INTO metadata (setting, value) VALUES (?, ?)",
+            ["text_index_lang", pickle.dumps(lang)],
+        )
+        self._text_index_lang = lang
+
+    def _reset_text_index(self):
+        """
+        Create the full-text index of the texts of the objects, or empty it,
+        before it is filled.  Does not commit.
+
+        The texts are indexed by trigrams, so that any string of at least
+        three characters can be searched, as by
+        :meth:`~.BaseObject.matches_string`.  SQLite versions without the
+        FTS5 extension, or older than 3.34, have no full-text index.
+        """
+        self._bulk_texts.clear()
+        if self.dbapi.table_exists("text_key"):
+            self.dbapi.execute("DELETE FROM text_index")
+            self.dbapi.execute("DELETE FROM text_key")
+        else:
+            try:
+                self.dbapi.execute(
+                    "CREATE VIRTUAL TABLE text_index "
+                    "USING fts5(text, tokenize = 'trigram')"
+                )
+            except sqlite3.OperationalError as err:
+                LOG.warning("No full-text index: %s", err)
+                self._has_text_index = False
+                return
+            self.dbapi.execute(
+                "CREATE TABLE text_key "
+                "("
+                "id INTEGER PRIMARY KEY, "
+                "handle VARCHAR(50) UNIQUE, "
+                "obj_class VARCHAR(20)"
+                ")"
+            )
+        self._has_text_index = True
+        self._set_text_index_lang(glocale.lang)
+
+    def _update_text_index(self, obj):
+        """
+        Replace the texts of an object in the full-text index.
+        Does not commit.
+        """
+        if not self._text_index_exists():
+            return
+        if self._text_index_lang and self._text_index_lang != glocale.lang:
+            # The names of the types are translated: the index can no longer
+            # be searched until it is rebuilt.
+            self._set_text_index_lang("")
+        text = "\n".join(obj.get_text_data_list_recursively()).upper()
+        if self.transaction is not None and self.transaction.batch:
+            # Objects are often committed several times during an import:
+            # only their last texts are indexed.
+            self._bulk_texts[obj.handle] = (obj.__class__.__name__, text)
+            if len(self._bulk_texts) >= BULK_CHUNK_SIZE:
+                self._flush_bulk_texts()
+            return
+        self._remove_text_index(obj.handle)
+        self.dbapi.execute(
+            "INSERT INTO text_key (handle, obj_class) VALUES (?, ?)",
+            [obj.handle, obj.__class__.__name__],
+        )
+        self.dbapi.execute(
+            "INSERT INTO text_index (rowid, text) VALUES (last_insert_rowid(), ?)",
+            [text],
+        )
+
+    def _flush_bulk_texts(self):
+        """
+        Index the texts buffered during a batch transaction.
+
+        The previous texts of the buffered objects, if any, are deleted and the
+        current ones inserted, each with a single executemany call.  Deleting
+        from the index is costly even without matching rows, so the previous
+        texts are searched first.  Does not commit.
+        """
+        if not self._bulk_texts:
+            return
+        handles = list(self._bulk_texts)
+        ids = []
+        for start in range(0, len(handles), FETCH_CHUNK_SIZE):
+            chunk = handles[start : start + FETCH_CHUNK_SIZE]
+            self.dbapi.execute(
+                "SELECT id FROM text_key "
+                f"WHERE handle IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            ids.extend(self.dbapi.fetchall())
+        if ids:
+            self._executemany("DELETE FROM text_index WHERE rowid = ?", ids)
+            self._executemany("DELETE FROM text_key WHERE id = ?", ids)
+        self._executemany(
+            "INSERT INTO text_key (handle, obj_class) VALUES (?, ?)",
+            [
+                [handle, obj_class]
+                for (handle, (obj_class, _text)) in self._bulk_texts.items()
+            ],
+        )
+        self._executemany(
+            "INSERT INTO text_index (rowid, text) "
+            "SELECT id, ? FROM text_key WHERE handle = ?",
+            [
+                [text, handle]
+                for (handle, (_obj_class, text)) in self._bulk_texts.items()
+            ],
+        )
+        self._bulk_texts.clear()
+
+    def _remove_text_index(self, handle):
+        """
+        Remove the texts of an object from the full-text index.
+        Does not commit.
+        """
+        if not self._text_index_exists():
+            return
+        self._bulk_texts.pop(handle, None)
+        self.dbapi.execute("SELECT id FROM text_key WHERE handle = ?", [handle])
+        row = self.dbapi.fetchone()
+        if row:
+            self.dbapi.execute("DELETE FROM text_index WHERE rowid = ?", row)
+            self.dbapi.execute("DELETE FROM text_key WHERE id = ?", row)
+
+    def _upsert_object(self, obj_key, obj, data):
+        """
+        Insert or update the row of an object, with its secondary values,
+        with a single UPSERT statement.
+        Does not commit.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        fields, values = self._get_secondary_values(obj)
+        columns = ["handle", "blob_data"] + fields
+        updates = ", ".join(f"{field} = excluded.{field}" for field in columns[1:])
+        self.dbapi.execute(
+            f'INSERT INTO {table} ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))}) '
+            f"ON CONFLICT (handle) DO UPDATE SET {updates}",
+            [obj.handle, self.serializer.dumps(data)] + self._sql_cast_list(values),
+        )
+
+    def search_text(self, class_name, text):
+        """
+        Return the handles of the objects of a primary class whose texts may
+        contain a string, ignoring case, or None if the database has no
+        full-text index or cannot search the string.
+
+        The words of the string are searched, so the returned objects may
+        have other characters between them.  Words shorter than three
+        characters are ignored, and None is returned if all are shorter.
+        """
+        if not self._text_index_exists() or self._text_index_lang != glocale.lang:
+            return None
+        self._flush_bulk_texts()
+        words = [word for word in text.upper().split() if len(word) >= 3]
+        if not words:
+            return None
+        query = " AND ".join('"%s"' % word.replace('"', '""') for word in words)
+        self.dbapi.execute(
+            "SELECT handle FROM text_key WHERE obj_class = ? AND id IN "
+            "(SELECT rowid FROM text_index WHERE text_index MATCH ?)",
+            [class_name, query],
+        )
+        return {row[0] for row in self.dbapi.fetchall()}
+
+    def get_raw_data_in_handle_order(self, class_name):
+        """
+        Return an iterator over the (handle, raw data) pairs of all objects of
+        a primary class, in the order of their handles.
+
+        The handles are compared with the default binary collation of SQLite,
+        which orders UTF-8 text as Python orders strings.
+        """
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[class_name]]
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(f"SELECT handle, blob_data FROM {table} ORDER BY handle")
+            for rows in iter(cursor.fetchmany, []):
+                for handle, blob_data in rows:
+                    yield (handle, self.serializer.loads(blob_data))
+
+    def transaction_begin(self, transaction):
+        """
+        Apply the batch pragmas of the profile to batch transactions.
+        """
+        if transaction.batch:
+            pragmas = PROFILES[self.profile]["batch_pragmas"]
+            self._saved_pragmas = self.dbapi.get_pragmas(pragmas)
+            self.dbapi.set_pragmas(pragmas)
+        return super().transaction_begin(transaction)
+
+    def transaction_commit(self, transaction):
+        """
+        Index the buffered texts, and restore the pragmas changed for a batch
+        transaction.
+        """
+        try:
+            self._flush_bulk_texts()
+            super().transaction_commit(transaction)
+        finally:
+            self._restore_pragmas()
+
+    def transaction_abort(self, transaction):
+        """
+        Restore the pragmas changed for a batch transaction.
+        """
+        self._bulk_texts.clear()
+        try:
+            super().transaction_abort(transaction)
+        finally:
+            self._restore_pragmas()
+
+    def _restore_pragmas(self):
+        if self._saved_pragmas:
+            self.dbapi.set_pragmas(self._saved_pragmas)
+            self._saved_pragmas = {}
 
 
 # -------------------------------------------------------------------------
@@ -88,6 +413,16 @@ class Connection:
     """
     The Sqlite class is an interface between the DBAPI class which is the Gramps
     backend for the DBAPI interface and the sqlite3 python module.
+
+    The thread which creates the Connection uses the writer connection.
+    Other threads use their own cursor on the writer connection, so that
+    they see the uncommitted changes of an open transaction.  Outside of
+    transactions, with the write-ahead log journal mode (see
+    :data:`PROFILES`), they use their own read-only connection instead, so
+    that reports, exports and gramplets can read the database in worker
+    threads without blocking editing.  The read-only connection of a thread
+    is opened on first use and closed when the thread ends, or with the
+    Connection.
     """
 
     def __init__(self, *args, **kwargs):
@@ -104,13 +439,89 @@ class Connection:
         :type kwargs: list
         """
         self.log = logging.getLogger(".sqlite")
-        self.__connection = sqlite3.connect(*args, **kwargs)
-        self.__cursor = self.__connection.cursor()
-        self.__connection.create_function("regexp", 2, regexp)
-        self.__collations = []
+        connection = sqlite3.connect(*args, check_same_thread=False, **kwargs)
+        connection.create_function("regexp", 2, regexp)
+        self.__writer = ThreadState(connection, set())
+        self.__thread = threading.get_ident()
+        path = args[0] if args else kwargs.get("database")
+        if path == ":memory:":
+            # Other connections would open a new, empty database.
+            self.__reader_uri = None
+        else:
+            self.__reader_uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+        self.__reader_kwargs = {
+            key: value for key, value in kwargs.items() if key != "database"
+        }
+        self.__wal = self.__get_journal_mode() == "wal"
+        self.__local = threading.local()
+        self.__readers = []
+        self.__lock = threading.Lock()
+        self.__pragmas = {}
+        self.__collations = {}
         self.__tmap = str.maketrans("-.@=;", "_____")
         self.check_collation(glocale)
 
+    def __get_journal_mode(self):
+        """
+        Return the journal mode of the writer connection, in lower case.
+        """
+        self.__writer.cursor.execute("PRAGMA journal_mode")
+        return self.__writer.cursor.fetchone()[0].lower()
+
+    def __get_state(self):
+        """
+        Return the connection, cursor and registered collations used by the
+        current thread for its next statement.
+        """
+        if threading.get_ident() == self.__thread:
+            return self.__writer
+        if (
+            self.__wal
+            and self.__reader_uri is not None
+            and not self.__writer.connection.in_transaction
+        ):
+            state = getattr(self.__local, "reader", None)
+            if state is None:
+                state = self.__open_reader()
+        else:
+            state = getattr(self.__local, "shared", None)
+            if state is None:
+                state = ThreadState(self.__writer.connection, self.__writer.collations)
+                self.__local.shared = state
+        return state
+
+    def __get_current_state(self):
+        """
+        Return the state used by the last statement of the current thread,
+        whose results are fetched.
+        """
+        if threading.get_ident() == self.__thread:
+            return self.__writer
+        state = getattr(self.__local, "current", None)
+        if state is None:
+            state = self.__get_state()
+        return state
+
+    def __open_reader(self):
+        """
+        Open the read-only connection of the current thread, which is closed
+        when the thread ends.
+        """
+        self.log.debug("opening read-only connection...")
+        kwargs = dict(self.__reader_kwargs, uri=True, check_same_thread=False)
+        connection = sqlite3.connect(self.__reader_uri, **kwargs)
+        connection.create_function("regexp", 2, regexp)
+        for name, value in self.__pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        for collation, function in self.__collations.items():
+            connection.create_collation(collation, function)
+        state = ThreadState(connection, set(self.__collations))
+        self.__local.reader = state
+        with self.__lock:
+            self.__readers = [reader for reader in self.__readers if reader.alive]
+            self.__readers.append(weakref.finalize(state, connection.close))
+        return state
+
     def check_collation(self, locale):
         """
         Checks that a collation exists and if not creates it.
@@ -122,9 +533,11 @@ class Connection:
         # collation names so first translate any old-style Unicode locale
         # delimiters to underscores.
         collation = locale.get_collation().translate(self.__tmap)
-        if collation not in self.__collations:
-            self.__connection.create_collation(collation, locale.strcoll)
-            self.__collations.append(collation)
+        self.__collations.setdefault(collation, locale.strcoll)
+        state = self.__get_state()
+        if collation not in state.collations:
+            state.connection.create_collation(collation, locale.strcoll)
+            state.collations.add(collation)
         return collation
 
     def execute(self, *args, **kwargs):
@@ -137,21 +550,70 @@ class Connection:
         :type kwargs: list
         """
         self.log.debug(args)
-        self.__cursor.execute(*args, **kwargs)
+        state = self.__get_state()
+        self.__local.current = state
+        state.cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement against all parameter sequences.
+
+        :param args: arguments to be passed to the sqlite3 executemany
+                     statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany
+                       statement
+        :type kwargs: list
+        """
+        self.log.debug(args[0])
+        state = self.__get_state()
+        self.__local.current = state
+        state.cursor.executemany(*args, **kwargs)
 
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
         or None when no more data is available.
         """
-        return self.__cursor.fetchone()
+        return self.__get_current_state().cursor.fetchone()
 
     def fetchall(self):
         """
         Fetches the next set of rows of a query result, returning a list. An
         empty list is returned when no more rows are available.
         """
-        return self.__cursor.fetchall()
+        return self.__get_current_state().cursor.fetchall()
+
+    def set_pragmas(self, pragmas):
+        """
+        Set SQLite pragmas.
+
+        :param pragmas: pragma values, by pragma name.
+        :type pragmas: dict
+        """
+        for name, value in pragmas.items():
+            self.execute(f"PRAGMA {name} = {value}")
+            self.fetchall()
+            if threading.get_ident() != self.__thread:
+                continue
+            if name == "journal_mode":
+                self.__wal = self.__get_journal_mode() == "wal"
+            else:
+                # Also used for the read-only connections opened later.
+                self.__pragmas[name] = value
+
+    def get_pragmas(self, names):
+        """
+        Return the current values of SQLite pragmas, by pragma name.
+
+        :param names: pragma names.
+        :type names: iterable of str
+        """
+        pragmas = {}
+        for name in names:
+            self.execute(f"PRAGMA {name}")
+            pragmas[name] = self.fetchone()[0]
+        return pragmas
 
     def begin(self):
         """
@@ -166,14 +628,14 @@ class Connection:
         Commit the current transaction.
         """
         self.log.debug("COMMIT;")
-        self.__connection.commit()
+        self.__get_current_state().connection.commit()
 
     def rollback(self):
         """
         Roll back any changes to the database since the last call to commit().
         """
         self.log.debug("ROLLBACK;")
-        self.__connection.rollback()
+        self.__get_current_state().connection.rollback()
 
     def table_exists(self, table):
         """
@@ -191,18 +653,52 @@ class Connection:
         )
         return self.fetchone()[0] != 0
 
+    def column_exists(self, table, column):
+        """
+        Test whether the specified SQL database table has a column.
+
+        :param table: table name to check.
+        :type table: str
+        :param column: column name to check.
+        :type column: str
+        :returns: True if the column exists, false otherwise.
+        :rtype: bool
+        """
+        self.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in self.fetchall())
+
     def close(self):
         """
         Close the current database.
         """
         self.log.debug("closing database...")
-        self.__connection.close()
+        with self.__lock:
+            for reader in self.__readers:
+                reader()
+            self.__readers.clear()
+        self.__writer.connection.close()
 
     def cursor(self):
         """
-        Return a new cursor.
+        Return a new cursor, on the connection of the current thread.
         """
-        return Cursor(self.__connection)
+        return Cursor(self.__get_state().connection)
+
+
+# -------------------------------------------------------------------------
+#
+# ThreadState class
+#
+# -------------------------------------------------------------------------
+class ThreadState:
+    """
+    The connection, cursor and registered collations used by a thread.
+    """
+
+    def __init__(self, connection, collations):
+        self.connection = connection
+        self.cursor = connection.cursor()
+        self.collations = collations
 
 
 # -------------------------------------------------------------------------
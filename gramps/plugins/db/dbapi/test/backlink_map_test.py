@@ -0,0 +1,69 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the backlink map"""
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import CLASS_TO_KEY_MAP, DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Note, Person
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class BacklinkMapTest(unittest.TestCase):
+    """
+    Compare the backlink map with the backlinks of each object.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_backlinks(self):
+        backlinks = self.db.get_backlink_map()
+        count = 0
+        for class_name in CLASS_TO_KEY_MAP:
+            for handle in self.db.method("get_%s_handles", class_name)():
+                expected = sorted(self.db.find_backlink_handles(handle))
+                self.assertEqual(sorted(backlinks.get(handle, [])), expected)
+                count += len(expected)
+        self.assertEqual(sum(len(blinks) for blinks in backlinks.values()), count)
+
+    def test_batch(self):
+        note = Note()
+        person = Person()
+        with DbTxn("Import", self.db, batch=True) as trans:
+            self.db.add_note(note, trans)
+            person.add_note(note.handle)
+            self.db.add_person(person, trans)
+            backlinks = self.db.get_backlink_map()
+            self.assertEqual(backlinks[note.handle], [("Person", person.handle)])
+            self.db.remove_person(person.handle, trans)
+            self.db.remove_note(note.handle, trans)
+
+
+if __name__ == "__main__":
+    unittest.main()
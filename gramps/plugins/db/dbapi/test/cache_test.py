@@ -0,0 +1,152 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+import sys
+import unittest
+
+from gramps.gen.db import DbTxn, PERSON_KEY
+from gramps.gen.db.cache import DbCache
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person, Surname
+
+
+class DbCacheTest(unittest.TestCase):
+    """
+    Tests of the record cache.
+    """
+
+    def test_stats(self):
+        cache = DbCache(1024)
+        self.assertIsNone(cache.get(PERSON_KEY, "A"))
+        cache.put(PERSON_KEY, "A", b"data")
+        self.assertEqual(cache.get(PERSON_KEY, "A"), b"data")
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["size"], sys.getsizeof(b"data"))
+
+    def test_eviction(self):
+        value = b"x" * 100
+        size = sys.getsizeof(value)
+        cache = DbCache(size * 3)
+        for handle in "ABC":
+            cache.put(PERSON_KEY, handle, value)
+        cache.get(PERSON_KEY, "A")
+        cache.put(PERSON_KEY, "D", value)
+        self.assertIsNone(cache.get(PERSON_KEY, "B"))
+        self.assertIsNotNone(cache.get(PERSON_KEY, "A"))
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.size, size * 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_disabled(self):
+        cache = DbCache(0)
+        cache.put(PERSON_KEY, "A", b"data")
+        self.assertIsNone(cache.get(PERSON_KEY, "A"))
+        self.assertEqual(cache.size, 0)
+
+
+class DbGenericCacheTest(unittest.TestCase):
+    """
+    Tests of the invalidation of the record cache of a database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.db.cache.set_max_size(1024 * 1024)
+        person = Person()
+        person.primary_name.add_surname(Surname())
+        person.primary_name.set_first_name("Anna")
+        with DbTxn("Add", self.db) as trans:
+            self.handle = self.db.add_person(person, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def get_first_name(self):
+        person = self.db.get_person_from_handle(self.handle)
+        return person.primary_name.get_first_name()
+
+    def set_first_name(self, name):
+        person = self.db.get_person_from_handle(self.handle)
+        person.primary_name.set_first_name(name)
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_person(person, trans)
+
+    def test_hits(self):
+        self.db.cache.reset_stats()
+        self.get_first_name()
+        self.get_first_name()
+        stats = self.db.get_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+    def test_commit(self):
+        self.get_first_name()
+        self.set_first_name("Berta")
+        self.assertEqual(self.get_first_name(), "Berta")
+
+    def test_batch_commit(self):
+        self.get_first_name()
+        person = self.db.get_person_from_handle(self.handle)
+        person.primary_name.set_first_name("Berta")
+        with DbTxn("Edit", self.db, batch=True) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.get_first_name(), "Berta")
+
+    def test_remove(self):
+        self.get_first_name()
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(self.handle, trans)
+        self.assertIsNone(self.db.get_raw_person_data(self.handle))
+
+    def test_undo_redo(self):
+        self.set_first_name("Berta")
+        self.assertEqual(self.get_first_name(), "Berta")
+        self.db.undo()
+        self.assertEqual(self.get_first_name(), "Anna")
+        self.db.redo()
+        self.assertEqual(self.get_first_name(), "Berta")
+
+    def test_abort(self):
+        person = self.db.get_person_from_handle(self.handle)
+        person.primary_name.set_first_name("Berta")
+        trans = DbTxn("Edit", self.db, batch=True)
+        self.db.transaction_begin(trans)
+        self.db.commit_person(person, trans)
+        self.assertEqual(self.get_first_name(), "Berta")
+        self.db.transaction_abort(trans)
+        self.assertEqual(self.get_first_name(), "Anna")
+
+    def test_signals(self):
+        self.get_first_name()
+        self.assertEqual(len(self.db.cache), 1)
+        self.db.emit("person-update", ([self.handle],))
+        self.assertEqual(len(self.db.cache), 0)
+        self.get_first_name()
+        self.db.emit("person-rebuild")
+        self.assertEqual(len(self.db.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the connections of worker threads """
+
+import gc
+import sqlite3
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Family, Person, Surname
+
+
+class ConnectionCheck:
+    """
+    Tests of reading a database from worker threads, with the SQLite
+    profile of the class.
+    """
+
+    def setUp(self):
+        self.saved_profile = config.get("database.sqlite-profile")
+        config.set("database.sqlite-profile", self.profile)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+        with DbTxn("Add", self.db) as trans:
+            for name in ("Anna", "Berta", "Clara"):
+                self.add_person(name, trans)
+        self.pool = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+        self.db.close(update=False)
+        self.tmpdir.cleanup()
+        config.set("database.sqlite-profile", self.saved_profile)
+
+    def add_person(self, name, trans):
+        person = Person()
+        person.primary_name.add_surname(Surname())
+        person.primary_name.set_first_name(name)
+        return self.db.add_person(person, trans)
+
+    def in_worker(self, func):
+        return self.pool.submit(func).result()
+
+    def in_thread(self, func):
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+
+    def readers(self):
+        return [reader for reader in self.db.dbapi._Connection__readers if reader.alive]
+
+    def first_names(self):
+        return sorted(
+            self.db.get_person_from_handle(handle).primary_name.get_first_name()
+            for handle in self.db.iter_person_handles()
+        )
+
+    def test_read(self):
+        self.assertEqual(self.in_worker(self.first_names), self.first_names())
+
+    def test_uncommitted(self):
+        with DbTxn("Add", self.db) as trans:
+            self.add_person("Dora", trans)
+            self.assertEqual(self.db.get_number_of_people(), 4)
+            # Inside a transaction, workers read the writer connection.
+            self.assertEqual(self.in_worker(self.db.get_number_of_people), 4)
+            self.assertEqual(len(self.in_worker(self.first_names)), 4)
+        self.assertEqual(self.in_worker(self.db.get_number_of_people), 4)
+
+    def test_batch(self):
+        # Reading the backlinks writes the buffered references.
+        with DbTxn("Import", self.db, batch=True) as trans:
+            handle = self.add_person("Dora", trans)
+            family = Family()
+            family.set_father_handle(handle)
+            family_handle = self.db.add_family(family, trans)
+            self.assertEqual(
+                list(self.in_worker(lambda: self.db.find_backlink_handles(handle))),
+                [("Family", family_handle)],
+            )
+        self.assertEqual(
+            list(self.in_worker(lambda: self.db.find_backlink_handles(handle))),
+            [("Family", family_handle)],
+        )
+
+    def test_cache(self):
+        handle = self.db.get_person_handles()[0]
+        self.db.cache.reset_stats()
+        self.in_worker(lambda: self.db.get_person_from_handle(handle))
+        self.assertEqual(len(self.db.cache), 0)
+        self.assertEqual(self.db.get_cache_stats()["misses"], 0)
+
+
+class ReaderConnectionTest(ConnectionCheck, unittest.TestCase):
+    """
+    Test the read-only connections of worker threads, with the write-ahead
+    log journal mode.
+    """
+
+    profile = "performance"
+
+    def test_thread_end(self):
+        self.in_worker(self.first_names)
+        self.assertEqual(len(self.readers()), 1)
+        self.in_thread(self.first_names)
+        self.assertEqual(len(self.readers()), 1)
+
+    def test_read_only(self):
+        def add():
+            with DbTxn("Add", self.db) as trans:
+                self.add_person("Dora", trans)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            self.in_worker(add)
+
+
+class DefaultProfileTest(ConnectionCheck, unittest.TestCase):
+    """
+    Test reading a database from worker threads, without the write-ahead log
+    journal mode.
+    """
+
+    profile = "default"
+
+    def test_no_readers(self):
+        # Read-only connections would wait for the commits.
+        self.in_worker(self.first_names)
+        self.in_thread(self.first_names)
+        self.assertEqual(self.readers(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
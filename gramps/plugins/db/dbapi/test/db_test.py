@@ -32,7 +32,10 @@ import unittest
 # -------------------------------------------------------------------------
 from gramps.gen.db import DbTxn
 from gramps.gen.db.utils import make_database
+from gramps.gen.proxy import LivingProxyDb, PrivateProxyDb
+from gramps.plugins.db.dbapi.dbapi import DBAPI
 from gramps.gen.lib import (
+    ChildRef,
     Person,
     Family,
     Event,
@@ -899,5 +902,190 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved["Mary"], (1, 3, 1))
 
 
+# -------------------------------------------------------------------------
+#
+# DbBatchTest class
+#
+# -------------------------------------------------------------------------
+class DbBatchTest(unittest.TestCase):
+    """
+    Tests of commits made in batch transactions.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def __add_family(self, trans):
+        father = Person()
+        father.gender = Person.MALE
+        child = Person()
+        father_handle = self.db.add_person(father, trans)
+        child_handle = self.db.add_person(child, trans)
+        family = Family()
+        family.set_father_handle(father_handle)
+        childref = ChildRef()
+        childref.ref = child_handle
+        family.add_child_ref(childref)
+        family_handle = self.db.add_family(family, trans)
+        father.add_family_handle(family_handle)
+        self.db.commit_person(father, trans)
+        child.add_parent_family_handle(family_handle)
+        self.db.commit_person(child, trans)
+        return father_handle, child_handle, family_handle
+
+    def test_backlinks(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+            # pending references are visible inside the transaction
+            self.assertEqual(
+                sorted(self.db.find_backlink_handles(family)),
+                sorted([("Person", father), ("Person", child)]),
+            )
+        self.assertEqual(
+            sorted(self.db.find_backlink_handles(father)), [("Family", family)]
+        )
+        self.assertEqual(
+            sorted(self.db.find_backlink_handles(child)), [("Family", family)]
+        )
+
+    def test_secondary_values(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+        person = self.db.get_person_from_handle(father)
+        self.assertEqual(
+            self.db.get_person_from_gramps_id(person.gramps_id).handle, father
+        )
+        family_obj = self.db.get_family_from_handle(family)
+        self.assertEqual(family_obj.get_father_handle(), father)
+        self.assertEqual(self.db.get_number_of_people(), 2)
+
+    def test_update_and_remove(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father, child, family = self.__add_family(trans)
+            family_obj = self.db.get_family_from_handle(family)
+            family_obj.set_child_ref_list([])
+            self.db.commit_family(family_obj, trans)
+            self.db.remove_person(child, trans)
+        self.assertEqual(list(self.db.find_backlink_handles(child)), [])
+        self.assertEqual(
+            list(self.db.find_backlink_handles(father)), [("Family", family)]
+        )
+        self.assertFalse(self.db.has_person_handle(child))
+
+
+class DbFetchManyTest(unittest.TestCase):
+    """
+    Tests of the multi-handle fetch methods.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+        with DbTxn("Add people", cls.db, batch=True) as trans:
+            for _ in range(1200):
+                person = Person()
+                person.set_privacy(len(cls.db.get_person_handles()) % 3 == 0)
+                cls.db.add_person(person, trans)
+        cls.handles = cls.db.get_person_handles()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+
+    def test_order(self):
+        handles = list(reversed(self.handles))
+        self.db.cache.clear()
+        people = list(self.db.get_person_from_handles(iter(handles)))
+        self.assertEqual([person.handle for person in people], handles)
+        for handle, data in self.db.get_raw_person_data_many(handles[:10]):
+            self.assertEqual(data, self.db.get_raw_person_data(handle))
+
+    def test_missing_and_duplicates(self):
+        handles = [self.handles[0], "missing", self.handles[1], self.handles[0]]
+        self.assertEqual(
+            [person.handle for person in self.db.get_person_from_handles(handles)],
+            [self.handles[0], self.handles[1], self.handles[0]],
+        )
+        self.assertEqual(list(self.db.get_family_from_handles([])), [])
+
+    def test_lazy(self):
+        person = next(self.db.get_person_from_handles(self.handles[:1], lazy=True))
+        self.assertFalse(person.is_unpacked())
+        self.assertEqual(
+            person.serialize(), self.db.get_raw_person_data(self.handles[0])
+        )
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        expected = [
+            person.serialize()
+            for person in map(proxy.get_person_from_handle, self.handles)
+            if person is not None
+        ]
+        self.assertEqual(
+            [
+                person.serialize()
+                for person in proxy.get_person_from_handles(self.handles)
+            ],
+            expected,
+        )
+        self.assertEqual(
+            [data for _, data in proxy.get_raw_person_data_many(self.handles)],
+            expected,
+        )
+        proxy = LivingProxyDb(proxy, LivingProxyDb.MODE_EXCLUDE_ALL)
+        self.assertEqual(list(proxy.get_person_from_handles(self.handles)), [])
+
+
+class PlainConnection:
+    """
+    A connection with only the methods which all DB-API backends provide.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __getattr__(self, name):
+        if name in ("executemany", "column_exists"):
+            raise AttributeError(name)
+        return getattr(self.connection, name)
+
+
+# -------------------------------------------------------------------------
+#
+# DbPlainBatchTest class
+#
+# -------------------------------------------------------------------------
+class DbPlainBatchTest(DbBatchTest):
+    """
+    Tests of commits made in batch transactions, without the features
+    specific to the SQLite backend.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.db.dbapi = PlainConnection(self.db.dbapi)
+        self.db._upsert_object = lambda *args: DBAPI._upsert_object(self.db, *args)
+
+    def tearDown(self):
+        self.db.dbapi = self.db.dbapi.connection
+        super().tearDown()
+
+    def test_rewrite(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father, child, family = self._DbBatchTest__add_family(trans)
+        self.db.reindex_reference_map(None)
+        self.db.set_serializer("marshal")
+        self.assertEqual(
+            sorted(self.db.find_backlink_handles(family)),
+            sorted([("Person", father), ("Person", child)]),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
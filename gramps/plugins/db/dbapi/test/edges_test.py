@@ -0,0 +1,191 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the ancestor and descendant queries """
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.base import DbReadBase
+from gramps.gen.db.utils import import_as_dict, make_database
+from gramps.gen.lib import ChildRef, Family, Person, Surname
+from gramps.gen.proxy import LivingProxyDb
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi.dbapi import EDGE_TABLES
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+# (max_gen, min_gen) pairs used for the comparisons
+GENERATIONS = ((None, 0), (None, 1), (None, 4), (0, 0), (1, 1), (3, 0), (5, 2))
+
+
+class ExampleEdgesTest(unittest.TestCase):
+    """
+    Compare the recursive queries with the generic traversal on the example
+    database.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_ancestors(self):
+        for handle in self.db.get_person_handles():
+            for max_gen, min_gen in GENERATIONS:
+                self.assertEqual(
+                    self.db.get_ancestor_handles(handle, max_gen, min_gen),
+                    DbReadBase.get_ancestor_handles(self.db, handle, max_gen, min_gen),
+                )
+
+    def test_descendants(self):
+        for handle in self.db.get_person_handles()[:200]:
+            for max_gen, min_gen in GENERATIONS:
+                self.assertEqual(
+                    self.db.get_descendant_handles(handle, max_gen, min_gen),
+                    DbReadBase.get_descendant_handles(
+                        self.db, handle, max_gen, min_gen
+                    ),
+                )
+
+    def test_proxy(self):
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL)
+        handle = self.db.get_default_handle()
+        ancestors = proxy.get_ancestor_handles(handle)
+        self.assertTrue(ancestors)
+        self.assertTrue(ancestors <= self.db.get_ancestor_handles(handle))
+        self.assertTrue(all(proxy.has_person_handle(handle) for handle in ancestors))
+
+    def test_rebuild(self):
+        handle = self.db.get_default_handle()
+        ancestors = self.db.get_ancestor_handles(handle)
+        self.db.dbapi.begin()
+        self.db.dbapi.execute("DELETE FROM person_parent_family")
+        self.db.dbapi.commit()
+        self.assertEqual(self.db.get_ancestor_handles(handle), {handle})
+        self.db.rebuild_secondary()
+        self.assertEqual(self.db.get_ancestor_handles(handle), ancestors)
+
+
+class EdgesTest(unittest.TestCase):
+    """
+    Test the maintenance of the edge tables.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_person(self, trans):
+        person = Person()
+        person.primary_name.add_surname(Surname())
+        self.db.add_person(person, trans)
+        return person
+
+    def add_family(self, father, mother, children, trans):
+        family = Family()
+        family.set_father_handle(father.handle)
+        family.set_mother_handle(mother.handle)
+        self.db.add_family(family, trans)
+        for person in (father, mother):
+            person.add_family_handle(family.handle)
+            self.db.commit_person(person, trans)
+        for child in children:
+            child_ref = ChildRef()
+            child_ref.ref = child.handle
+            family.add_child_ref(child_ref)
+            child.add_parent_family_handle(family.handle)
+            self.db.commit_person(child, trans)
+        self.db.commit_family(family, trans)
+        return family
+
+    def make_tree(self, batch=False):
+        """
+        Three generations: a and b are the parents of c, c and d the parents
+        of e.
+        """
+        with DbTxn("Add", self.db, batch=batch) as trans:
+            people = [self.add_person(trans) for _ in range(5)]
+            a, b, c, d, e = people
+            self.add_family(a, b, [c], trans)
+            family = self.add_family(c, d, [e], trans)
+        return [person.handle for person in people], family
+
+    def test_commit(self):
+        (a, b, c, d, e), _ = self.make_tree()
+        self.assertEqual(self.db.get_ancestor_handles(e), {a, b, c, d, e})
+        self.assertEqual(self.db.get_ancestor_handles(e, min_gen=2), {a, b})
+        self.assertEqual(self.db.get_ancestor_handles(e, max_gen=1), {c, d, e})
+        self.assertEqual(self.db.get_descendant_handles(a, min_gen=1), {c, e})
+        self.assertEqual(self.db.get_descendant_handles(d, max_gen=0), {d})
+
+    def test_batch_commit(self):
+        (a, b, c, d, e), _ = self.make_tree(batch=True)
+        self.assertEqual(self.db.get_ancestor_handles(e, min_gen=1), {a, b, c, d})
+        self.assertEqual(self.db.get_descendant_handles(b, min_gen=1), {c, e})
+
+    def test_remove_undo(self):
+        (a, b, c, d, e), family = self.make_tree()
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_family_relationships(family.handle, trans)
+        self.assertEqual(self.db.get_ancestor_handles(e), {e})
+        self.assertEqual(self.db.get_descendant_handles(a), {a, c})
+        self.db.undo()
+        self.assertEqual(self.db.get_ancestor_handles(e), {a, b, c, d, e})
+        self.db.redo()
+        self.assertEqual(self.db.get_descendant_handles(a), {a, c})
+
+    def test_loop(self):
+        (a, b, c, d, e), _ = self.make_tree()
+        # make e the father of a
+        with DbTxn("Loop", self.db) as trans:
+            person_a = self.db.get_person_from_handle(a)
+            person_e = self.db.get_person_from_handle(e)
+            self.add_family(person_e, self.add_person(trans), [person_a], trans)
+        self.assertIn(e, self.db.get_ancestor_handles(e, min_gen=1))
+        self.assertIn(e, self.db.get_ancestor_handles(e, max_gen=3, min_gen=3))
+        self.assertNotIn(e, self.db.get_ancestor_handles(e, max_gen=2, min_gen=1))
+        for max_gen, min_gen in GENERATIONS:
+            self.assertEqual(
+                self.db.get_descendant_handles(a, max_gen, min_gen),
+                DbReadBase.get_descendant_handles(self.db, a, max_gen, min_gen),
+            )
+
+    def test_old_version(self):
+        # The edge tables of databases of older versions may be out of date.
+        (a, b, c, d, e), _ = self.make_tree()
+        self.db.dbapi.begin()
+        for table in EDGE_TABLES:
+            self.db.dbapi.execute(f"DELETE FROM {table}")
+        self.db.dbapi.commit()
+        self.db.set_schema_version(20)
+        self.db._has_derived_data = None
+        self.assertEqual(self.db.get_ancestor_handles(e, min_gen=2), {a, b})
+        with DbTxn("Add", self.db) as trans:
+            self.add_person(trans)
+
+
+if __name__ == "__main__":
+    unittest.main()
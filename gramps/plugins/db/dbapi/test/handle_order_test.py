@@ -0,0 +1,79 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the reading of objects in handle order"""
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import CLASS_TO_KEY_MAP, DbTxn
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Note
+from gramps.gen.proxy import PrivateProxyDb
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class HandleOrderTest(unittest.TestCase):
+    """
+    Compare the objects read in handle order with the sorted handles.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_order(self):
+        for class_name in CLASS_TO_KEY_MAP:
+            get_raw_data = self.db.method("get_raw_%s_data", class_name)
+            handles = sorted(self.db.method("get_%s_handles", class_name)())
+            pairs = list(self.db.get_raw_data_in_handle_order(class_name))
+            self.assertEqual([handle for (handle, _data) in pairs], handles)
+            for handle, data in pairs:
+                self.assertEqual(data, get_raw_data(handle))
+
+    def test_unicode_handles(self):
+        notes = [Note(text) for text in ("a", "B", "é", "\U0001f600", "_")]
+        with DbTxn("Add notes", self.db) as trans:
+            for note in notes:
+                note.set_handle("Z" + note.get())
+                self.db.add_note(note, trans)
+        try:
+            handles = [
+                handle
+                for (handle, _data) in self.db.get_raw_data_in_handle_order("Note")
+            ]
+            self.assertEqual(handles, sorted(self.db.get_note_handles()))
+        finally:
+            with DbTxn("Remove notes", self.db) as trans:
+                for note in notes:
+                    self.db.remove_note(note.handle, trans)
+
+    def test_proxy(self):
+        self.assertIsNone(
+            PrivateProxyDb(self.db).get_raw_data_in_handle_order("Person")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
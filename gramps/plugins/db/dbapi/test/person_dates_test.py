@@ -0,0 +1,220 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the date columns of the person table"""
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DBMODE_R, EVENT_KEY, DbTxn
+from gramps.gen.db.utils import import_as_dict, make_database
+from gramps.gen.filters.rules.person import NoBirthdate, NoDeathdate
+from gramps.gen.lib import Date, Event, EventRef, EventType, Person
+from gramps.gen.user import User
+from gramps.gen.utils.db import get_birth_or_fallback, get_death_or_fallback
+from gramps.gen.utils.id import create_id
+from gramps.plugins.db.dbapi.dbapi import PERSON_DATE_COLUMNS
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+def get_sortval(event):
+    """
+    Return the sort value of the date of an event, 0 for no event.
+    """
+    if event is None:
+        return 0
+    return event.get_date_object().get_sort_value()
+
+
+class ExampleDatesTest(unittest.TestCase):
+    """
+    Compare the date columns with the dates found from the events.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_sortvals(self):
+        for person in self.db.iter_people():
+            birth = get_birth_or_fallback(self.db, person)
+            death = get_death_or_fallback(self.db, person)
+            self.assertEqual(
+                self.db.get_person_sortvals(person.handle),
+                (get_sortval(birth), get_sortval(death)),
+            )
+
+    def test_rules(self):
+        for rule in (NoBirthdate([]), NoDeathdate([])):
+            where, args = rule.get_sql()
+            handles = self.db.select_handles("Person", where, args)
+            matches = [
+                person.handle
+                for person in self.db.iter_people()
+                if rule.apply(self.db, person)
+            ]
+            self.assertEqual(sorted(handles), sorted(matches))
+
+
+class PersonDatesTest(unittest.TestCase):
+    """
+    Test the maintenance of the date columns.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+        self.birth = self.make_event(EventType.BIRTH, 1900)
+        self.person = Person()
+        self.add_event_ref(self.person, self.birth)
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_event(self.birth, trans)
+            self.db.add_person(self.person, trans)
+
+    def tearDown(self):
+        self.db.close(update=False)
+        self.tmpdir.cleanup()
+
+    def make_event(self, event_type, year):
+        event = Event()
+        event.set_handle(create_id())
+        event.set_type(event_type)
+        date = Date()
+        date.set_yr_mon_day(year, 1, 1)
+        event.set_date_object(date)
+        return event
+
+    def add_event_ref(self, person, event):
+        event_ref = EventRef()
+        event_ref.set_reference_handle(event.handle)
+        person.add_event_ref(event_ref)
+        if event.get_type() == EventType.BIRTH:
+            person.set_birth_ref(event_ref)
+
+    def get_columns(self):
+        self.db.dbapi.execute(
+            "SELECT birth_sortval, death_sortval, birth_fallback_sortval "
+            "FROM person WHERE handle = ?",
+            [self.person.handle],
+        )
+        return tuple(self.db.dbapi.fetchone())
+
+    def test_commit(self):
+        sortval = self.birth.get_date_object().get_sort_value()
+        self.assertEqual(self.get_columns(), (sortval, None, sortval))
+        self.assertEqual(self.db.get_person_sortvals(self.person.handle), (sortval, 0))
+
+    def test_event_change(self):
+        old_columns = self.get_columns()
+        self.birth.get_date_object().set_yr_mon_day(1910, 1, 1)
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_event(self.birth, trans)
+        sortval = self.birth.get_date_object().get_sort_value()
+        self.assertEqual(self.get_columns(), (sortval, None, sortval))
+
+        self.db.undo()
+        self.assertEqual(self.get_columns(), old_columns)
+        self.db.redo()
+        self.assertEqual(self.get_columns(), (sortval, None, sortval))
+
+    def test_event_remove(self):
+        old_columns = self.get_columns()
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_event(self.birth.handle, trans)
+        self.assertEqual(self.get_columns(), (None, None, None))
+        self.db.undo()
+        self.assertEqual(self.get_columns(), old_columns)
+
+    def test_select_handles(self):
+        # The people of the changed events are refreshed before the query.
+        where, args = NoBirthdate([]).get_sql()
+        self.assertEqual(self.db.select_handles("Person", where, args), [])
+        self.birth.set_date_object(Date())
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_event(self.birth, trans)
+            self.assertEqual(
+                self.db.select_handles("Person", where, args), [self.person.handle]
+            )
+        self.assertEqual(
+            self.db.select_handles("Person", where, args), [self.person.handle]
+        )
+
+    def test_select_handles_batch(self):
+        # People whose events are still missing are refreshed on commit.
+        birth = self.make_event(EventType.BIRTH, 1901)
+        person = Person()
+        self.add_event_ref(person, birth)
+        where, args = NoBirthdate([]).get_sql()
+        with DbTxn("Import", self.db, batch=True) as trans:
+            self.db.add_person(person, trans)
+            self.assertIn(person.handle, self.db.select_handles("Person", where, args))
+            self.db.add_event(birth, trans)
+        self.assertNotIn(person.handle, self.db.select_handles("Person", where, args))
+
+    def test_batch(self):
+        # The person is committed before its events.
+        baptism = self.make_event(EventType.BAPTISM, 1901)
+        person = Person()
+        self.add_event_ref(person, baptism)
+        with DbTxn("Import", self.db, batch=True) as trans:
+            self.db.add_person(person, trans)
+            self.db.add_event(baptism, trans)
+        sortval = baptism.get_date_object().get_sort_value()
+        self.assertEqual(self.db.get_person_sortvals(person.handle), (sortval, 0))
+
+    def test_upgrade(self):
+        # Databases of older versions get the columns when upgraded.
+        sortvals = self.db.get_person_sortvals(self.person.handle)
+        self.db.dbapi.begin()
+        for column in ("birth_sortval", "death_sortval"):
+            self.db.dbapi.execute(f"DROP INDEX person_{column}")
+        for column in PERSON_DATE_COLUMNS:
+            self.db.dbapi.execute(f"ALTER TABLE person DROP COLUMN {column}")
+        self.db.dbapi.commit()
+        self.db.set_schema_version(20)
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, mode=DBMODE_R)
+        self.assertIsNone(self.db.get_person_sortvals(self.person.handle))
+        self.assertIsNone(self.db.select_handles("Person", "1", []))
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, force_schema_upgrade=True)
+        self.assertEqual(self.db.get_person_sortvals(self.person.handle), sortvals)
+
+    def test_upgrade_stale(self):
+        # An older version may have changed the events since the columns
+        # were written.
+        self.birth.get_date_object().set_yr_mon_day(1910, 1, 1)
+        self.db.dbapi.begin()
+        self.db._commit_raw(self.birth.serialize(), EVENT_KEY)
+        self.db.dbapi.commit()
+        self.db.set_schema_version(20)
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, force_schema_upgrade=True)
+        sortval = self.birth.get_date_object().get_sort_value()
+        self.assertEqual(self.get_columns(), (sortval, None, sortval))
+
+
+if __name__ == "__main__":
+    unittest.main()
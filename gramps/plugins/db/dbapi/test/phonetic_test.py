@@ -0,0 +1,177 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the phonetic codes of the names of the people"""
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DBMODE_R, DbTxn
+from gramps.gen.db.utils import import_as_dict, make_database
+from gramps.gen.filters.rules.person import HasSoundexName
+from gramps.gen.lib import Name, Person, Surname
+from gramps.gen.soundex import DAITCH_MOKOTOFF, phonetic_codes
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+def sounds_like(name, surname, given, method):
+    """
+    Return True if a name has a surname, and the given name if not None,
+    with a phonetic code of the given ones.
+    """
+    codes = set(phonetic_codes(surname, method))
+    if not any(
+        codes & set(phonetic_codes(item.get_surname(), method))
+        for item in name.get_surname_list()
+        if item.get_surname()
+    ):
+        return False
+    if given is None:
+        return True
+    return bool(
+        name.get_first_name()
+        and set(phonetic_codes(given, method))
+        & set(phonetic_codes(name.get_first_name(), method))
+    )
+
+
+class ExamplePhoneticTest(unittest.TestCase):
+    """
+    Compare the people found with the phonetic codes with the people found
+    from their names.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def check_find(self, surname, given=None, method="soundex"):
+        handles = self.db.find_people_by_phonetic(surname, given, method)
+        matches = {
+            person.handle
+            for person in self.db.iter_people()
+            if any(
+                sounds_like(name, surname, given, method)
+                for name in [person.get_primary_name()] + person.get_alternate_names()
+            )
+        }
+        self.assertTrue(matches)
+        self.assertEqual(handles, matches)
+
+    def test_surname(self):
+        self.check_find("Garnor")
+        self.check_find("Garnor", method=DAITCH_MOKOTOFF)
+
+    def test_given(self):
+        self.check_find("Garner", "Lewis")
+        self.check_find("Garner", "Lewis", method=DAITCH_MOKOTOFF)
+
+    def test_rule(self):
+        rule = HasSoundexName(["Garnor"])
+        rule.prepare(self.db, User())
+        where, args = rule.get_sql()
+        handles = self.db.select_handles("Person", where, args)
+        matches = [
+            person.handle
+            for person in self.db.iter_people()
+            if rule.apply(self.db, person)
+        ]
+        self.assertEqual(sorted(handles), sorted(matches))
+
+
+class PhoneticTest(unittest.TestCase):
+    """
+    Test the maintenance of the phonetic table.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+        self.person = Person()
+        self.person.set_primary_name(self.make_name("Anna", "Moskowitz"))
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_person(self.person, trans)
+
+    def tearDown(self):
+        self.db.close(update=False)
+        self.tmpdir.cleanup()
+
+    def make_name(self, given, surname):
+        name = Name()
+        name.set_first_name(given)
+        name.add_surname(Surname())
+        name.get_primary_surname().set_surname(surname)
+        return name
+
+    def find(self, surname, given=None):
+        return self.db.find_people_by_phonetic(surname, given, DAITCH_MOKOTOFF)
+
+    def test_commit(self):
+        self.assertEqual(self.find("Moskovitz"), {self.person.handle})
+        self.assertEqual(self.find("Moskovitz", "Ana"), {self.person.handle})
+        self.assertEqual(self.find("Moskovitz", "Berta"), set())
+
+        self.person.add_alternate_name(self.make_name("Berta", "Lipshitz"))
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_person(self.person, trans)
+        self.assertEqual(self.find("Lipschitz", "Bertha"), {self.person.handle})
+        # The given name and surname must be in the same name.
+        self.assertEqual(self.find("Moskovitz", "Berta"), set())
+
+    def test_remove(self):
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(self.person.handle, trans)
+        self.assertEqual(self.find("Moskovitz"), set())
+        self.db.undo()
+        self.assertEqual(self.find("Moskovitz"), {self.person.handle})
+
+    def test_upgrade(self):
+        # Databases of older versions get the table when upgraded.
+        self.db.dbapi.begin()
+        self.db.dbapi.execute("DROP TABLE person_phonetic")
+        self.db.dbapi.commit()
+        self.db.set_schema_version(20)
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, mode=DBMODE_R)
+        self.assertIsNone(self.find("Moskovitz"))
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, force_schema_upgrade=True)
+        self.assertEqual(self.find("Moskovitz"), {self.person.handle})
+
+    def test_upgrade_stale(self):
+        # An older version may have changed the names since the table was
+        # written.
+        self.db.dbapi.begin()
+        self.db.dbapi.execute("DELETE FROM person_phonetic")
+        self.db.dbapi.commit()
+        self.db.set_schema_version(20)
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, force_schema_upgrade=True)
+        self.assertEqual(self.find("Moskovitz"), {self.person.handle})
+
+
+if __name__ == "__main__":
+    unittest.main()
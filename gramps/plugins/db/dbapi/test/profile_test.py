@@ -0,0 +1,104 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the SQLite tuning profiles """
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person, Surname
+
+
+class SQLiteProfileTest(unittest.TestCase):
+    """
+    Test the pragmas set by the SQLite tuning profiles.
+    """
+
+    def setUp(self):
+        self.saved_profile = config.get("database.sqlite-profile")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = None
+
+    def tearDown(self):
+        if self.db is not None:
+            self.db.close(update=False)
+        self.tmpdir.cleanup()
+        config.set("database.sqlite-profile", self.saved_profile)
+
+    def load(self, profile=None, settings=None):
+        if profile:
+            config.set("database.sqlite-profile", profile)
+        if settings:
+            with open(
+                os.path.join(self.tmpdir.name, "settings.ini"), "w", encoding="utf8"
+            ) as ini_file:
+                ini_file.write(settings)
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+
+    def pragma(self, name):
+        return self.db.dbapi.get_pragmas([name])[name]
+
+    def add_person(self, batch):
+        person = Person()
+        person.primary_name.add_surname(Surname())
+        with DbTxn("Add", self.db, batch=batch) as trans:
+            self.db.add_person(person, trans)
+            synchronous = self.pragma("synchronous")
+        return synchronous
+
+    def test_default(self):
+        self.load("default")
+        self.assertEqual(self.db.profile, "default")
+        self.assertEqual(self.pragma("journal_mode"), "delete")
+        self.assertEqual(self.add_person(True), self.pragma("synchronous"))
+
+    def test_performance(self):
+        self.load("performance")
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma("temp_store"), 2)  # MEMORY
+        self.assertEqual(self.pragma("cache_size"), -64 * 1024)
+        self.assertEqual(self.add_person(True), 1)
+
+    def test_bulk(self):
+        self.load("bulk")
+        self.assertEqual(self.add_person(False), 1)
+        self.assertEqual(self.add_person(True), 0)  # OFF
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.db.get_number_of_people(), 2)
+
+    def test_tree_settings(self):
+        self.load("default", "[database]\nprofile='performance'\n")
+        self.assertEqual(self.db.profile, "performance")
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+
+    def test_unknown(self):
+        with self.assertLogs(".sqlite", "WARNING"):
+            self.load("fastest")
+        self.assertEqual(self.db.profile, "default")
+
+
+if __name__ == "__main__":
+    unittest.main()
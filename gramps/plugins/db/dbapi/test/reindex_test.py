@@ -0,0 +1,90 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the reference map rebuild """
+
+import os
+import unittest
+from unittest import mock
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from gramps.gen.utils import parallel
+from gramps.plugins.db.dbapi import dbapi
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ReindexTest(unittest.TestCase):
+    """
+    Compare the rebuilt reference map with the one written on import.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.references = cls.get_references()
+
+    @classmethod
+    def get_references(cls):
+        cls.db.dbapi.execute(
+            "SELECT obj_handle, obj_class, ref_handle, ref_class FROM reference"
+        )
+        return sorted(cls.db.dbapi.fetchall())
+
+    def get_indexes(self):
+        self.db.dbapi.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'reference'"
+        )
+        return sorted(row[0] for row in self.db.dbapi.fetchall())
+
+    def reindex(self):
+        progress = []
+        self.db.reindex_reference_map(lambda percent: progress.append(percent))
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual(self.get_references(), self.references)
+        self.assertEqual(
+            self.get_indexes(), ["reference_obj_handle", "reference_ref_handle"]
+        )
+
+    def test_reindex(self):
+        self.reindex()
+
+    @mock.patch.object(dbapi, "REINDEX_CHUNK_SIZE", 500)
+    @mock.patch("os.cpu_count", return_value=2)
+    def test_reindex_workers(self, _cpu_count):
+        with mock.patch.object(
+            parallel, "ProcessPoolExecutor", wraps=parallel.ProcessPoolExecutor
+        ) as executor:
+            self.reindex()
+            executor.assert_called_once_with(2, mp_context=mock.ANY)
+
+    @mock.patch.object(dbapi, "REINDEX_CHUNK_SIZE", 500)
+    @mock.patch("os.cpu_count", return_value=2)
+    @mock.patch.object(parallel, "ProcessPoolExecutor", side_effect=OSError)
+    def test_reindex_no_workers(self, _executor, _cpu_count):
+        self.reindex()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the record serializers.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import pickle
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.exceptions import DbUpgradeRequiredError
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Date, Event, Note, Person, StyledText, Surname
+from gramps.gen.db.serializer import (
+    MARSHAL_TUPLE_CODES,
+    MarshalSerializer,
+    PickleSerializer,
+    loads,
+)
+
+VALUES = [
+    (),
+    (None, True, False),
+    (0, 127, -1, -40000, 70000, 2**40, -(2**40), 2**70),
+    (1.5, "", "a" * 31, "é" * 200, "x" * 70000),
+    tuple(range(300)),
+    ([], list(range(300))),
+    ([(1, "a", [None, (True,)])],),
+]
+
+
+# -------------------------------------------------------------------------
+#
+# SerializerTest class
+#
+# -------------------------------------------------------------------------
+class SerializerTest(unittest.TestCase):
+    """
+    Round trip tests of the record formats.
+    """
+
+    def test_round_trip(self):
+        for value in VALUES:
+            blob = MarshalSerializer.dumps(value)
+            self.assertIn(blob[0], MARSHAL_TUPLE_CODES)
+            result = loads(blob)
+            self.assertEqual(result, value)
+            self.assertIs(type(result), type(value))
+
+    def test_pickle_records(self):
+        for value in VALUES:
+            blob = PickleSerializer.dumps(value)
+            self.assertNotIn(blob[0], MARSHAL_TUPLE_CODES)
+            self.assertEqual(loads(blob), value)
+
+    def test_fallback_to_pickle(self):
+        for value in ([1, 2], (Date(),)):
+            blob = MarshalSerializer.dumps(value)
+            self.assertEqual(blob, pickle.dumps(value))
+            self.assertEqual(loads(blob), value)
+
+    def test_objects(self):
+        person = Person()
+        person.set_gramps_id("I0001")
+        surname = Surname()
+        surname.set_surname("Smith")
+        person.primary_name.set_surname_list([surname])
+        event = Event()
+        date = Date()
+        date.set_yr_mon_day(1900, 5, 1)
+        event.set_date_object(date)
+        note = Note()
+        note.set_styledtext(StyledText("text"))
+        for obj in (person, event, note):
+            data = obj.serialize()
+            blob = MarshalSerializer.dumps(data)
+            self.assertIn(blob[0], MARSHAL_TUPLE_CODES)
+            self.assertEqual(loads(blob), data)
+            self.assertEqual(obj.__class__.create(loads(blob)).serialize(), data)
+
+
+# -------------------------------------------------------------------------
+#
+# DbSerializerTest class
+#
+# -------------------------------------------------------------------------
+class DbSerializerTest(unittest.TestCase):
+    """
+    Tests of a database using the marshal record format.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_convert(self):
+        with DbTxn("Add", self.db) as trans:
+            handle1 = self.db.add_person(Person(), trans)
+        data1 = self.db.get_raw_person_data(handle1)
+
+        self.assertEqual(self.db.get_serializer_name(), "pickle")
+        self.db.set_serializer("marshal")
+        self.assertEqual(self.db.get_serializer_name(), "marshal")
+        self.assertEqual(self.db._get_metadata("serializer"), "marshal")
+        self.assertEqual(self.db.get_raw_person_data(handle1), data1)
+
+        with DbTxn("Add", self.db) as trans:
+            handle2 = self.db.add_person(Person(), trans)
+        self.db.dbapi.execute(
+            "SELECT blob_data FROM person WHERE handle = ?", [handle2]
+        )
+        self.assertIn(self.db.dbapi.fetchone()[0][0], MARSHAL_TUPLE_CODES)
+        self.assertEqual(self.db.get_number_of_people(), 2)
+
+        self.db.set_serializer("pickle")
+        self.assertEqual(self.db.get_raw_person_data(handle1), data1)
+
+    def test_old_version(self):
+        # Older versions of Gramps only read pickles.
+        self.db.set_schema_version(20)
+        with self.assertRaises(DbUpgradeRequiredError):
+            self.db.set_serializer("marshal")
+        self.assertEqual(self.db.get_serializer_name(), "pickle")
+
+
+if __name__ == "__main__":
+    unittest.main()
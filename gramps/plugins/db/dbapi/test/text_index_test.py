@@ -0,0 +1,181 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the full-text index"""
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DBMODE_R, NOTE_KEY, DbTxn
+from gramps.gen.db.utils import import_as_dict, make_database
+from gramps.gen.lib import Note, StyledText
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class SearchTextTest(unittest.TestCase):
+    """
+    Compare the objects found with the full-text index with the objects
+    matching the string.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def check_search(self, class_name, objects, text, count):
+        handles = self.db.search_text(class_name, text)
+        self.assertIsNotNone(handles)
+        matches = {obj.handle for obj in objects if obj.matches_string(text)}
+        self.assertEqual(len(matches), count)
+        self.assertLessEqual(matches, handles)
+
+    def test_people(self):
+        self.check_search("Person", self.db.iter_people(), "Garner", 71)
+
+    def test_places(self):
+        self.check_search("Place", self.db.iter_places(), "gainesville", 3)
+
+    def test_events(self):
+        self.check_search("Event", self.db.iter_events(), "Birth of Garner", 64)
+
+    def test_sources(self):
+        self.check_search("Source", self.db.iter_sources(), "great FALLS", 1)
+
+    def test_notes(self):
+        self.check_search("Note", self.db.iter_notes(), "the", 14)
+
+    def test_short_words(self):
+        self.assertIsNone(self.db.search_text("Person", "a"))
+        self.assertIsNone(self.db.search_text("Person", "ab cd"))
+
+
+class TextIndexTest(unittest.TestCase):
+    """
+    Test the maintenance of the full-text index.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+        self.note = Note()
+        self.note.set_styledtext(StyledText("An unusual remark"))
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_note(self.note, trans)
+
+    def tearDown(self):
+        self.db.close(update=False)
+        self.tmpdir.cleanup()
+
+    def search(self, text):
+        return self.db.search_text("Note", text)
+
+    def test_commit(self):
+        self.assertEqual(self.search("UNUSUAL"), {self.note.handle})
+        self.assertEqual(self.search("remark unusual"), {self.note.handle})
+        self.assertEqual(self.search("usual remarks"), set())
+        self.assertEqual(self.db.search_text("Person", "unusual"), set())
+
+        self.note.set_styledtext(StyledText("A common remark"))
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.search("unusual"), set())
+        self.assertEqual(self.search("common"), {self.note.handle})
+
+    def test_remove(self):
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_note(self.note.handle, trans)
+        self.assertEqual(self.search("unusual"), set())
+        self.db.undo()
+        self.assertEqual(self.search("unusual"), {self.note.handle})
+        self.db.redo()
+        self.assertEqual(self.search("unusual"), set())
+
+    def test_batch(self):
+        note = Note()
+        note.set_styledtext(StyledText("Another unusual remark"))
+        with DbTxn("Import", self.db, batch=True) as trans:
+            self.db.add_note(note, trans)
+        self.assertEqual(self.search("unusual"), {self.note.handle, note.handle})
+
+    def test_batch_buffer(self):
+        empty = Note()
+        removed = Note()
+        removed.set_styledtext(StyledText("A removed remark"))
+        with DbTxn("Import", self.db, batch=True) as trans:
+            self.db.add_note(empty, trans)
+            self.db.add_note(removed, trans)
+            empty.set_styledtext(StyledText("A later remark"))
+            self.db.commit_note(empty, trans)
+            self.note.set_styledtext(StyledText("A common remark"))
+            self.db.commit_note(self.note, trans)
+            self.assertEqual(self.search("common"), {self.note.handle})
+            self.db.remove_note(removed.handle, trans)
+        self.assertEqual(self.search("remark"), {self.note.handle, empty.handle})
+        self.assertEqual(self.search("later"), {empty.handle})
+        self.assertEqual(self.search("unusual"), set())
+        self.assertEqual(self.search("removed"), set())
+
+    def test_rebuild(self):
+        self.db.dbapi.execute("DELETE FROM text_key")
+        self.db.dbapi.commit()
+        self.assertEqual(self.search("unusual"), set())
+        self.db.rebuild_secondary()
+        self.assertEqual(self.search("unusual"), {self.note.handle})
+
+    def test_upgrade(self):
+        # An older version may have changed the notes since they were indexed.
+        self.note.set_styledtext(StyledText("A common remark"))
+        self.db.dbapi.begin()
+        self.db._commit_raw(self.note.serialize(), NOTE_KEY)
+        self.db.dbapi.commit()
+        self.db.set_schema_version(20)
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, mode=DBMODE_R)
+        self.assertIsNone(self.search("common"))
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name, force_schema_upgrade=True)
+        self.assertEqual(self.search("common"), {self.note.handle})
+        self.assertEqual(self.search("unusual"), set())
+
+    def test_language(self):
+        self.db.dbapi.begin()
+        self.db._set_text_index_lang("xx")
+        self.db.dbapi.commit()
+        self.assertIsNone(self.search("unusual"))
+
+        # Writing texts of another language marks the index as stale.
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_note(self.note, trans)
+        self.db.close(update=False)
+        self.db.load(self.tmpdir.name)
+        self.assertIsNone(self.search("unusual"))
+
+        self.db.rebuild_secondary()
+        self.assertEqual(self.search("unusual"), {self.note.handle})
+
+
+if __name__ == "__main__":
+    unittest.main()
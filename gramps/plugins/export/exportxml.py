@@ -38,8 +38,8 @@ Gramps' XML file format.
 import time
 import shutil
 import os
-import codecs
-from xml.sax.saxutils import escape
+import queue
+import threading
 
 # ------------------------------------------------------------------------
 #
@@ -59,7 +59,19 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 from gramps.gen.const import URL_HOMEPAGE
-from gramps.gen.lib import Date, Person
+from gramps.gen.lib import (
+    Citation,
+    Date,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
 from gramps.version import VERSION
@@ -80,25 +92,116 @@ try:
 except:
     _gzip_ok = 0
 
+# Number of characters of text collected before they are written to the file,
+# and number of chunks of text waiting to be compressed.
+WRITE_CHUNK_SIZE = 1 << 20
+WRITE_QUEUE_SIZE = 4
+
 # table for skipping control chars from XML except 09, 0A, 0D
 strip_dict = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
 
 
 def escxml(d):
+    # Same as xml.sax.saxutils.escape with the &quot; entity, without its
+    # loop over the entities.
     return (
-        escape(
-            d,
-            {
-                '"': "&quot;",
-                "<": "&lt;",
-                ">": "&gt;",
-            },
-        )
+        d.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
         if d
         else ""
     )
 
 
+# -------------------------------------------------------------------------
+#
+# ChunkWriter
+#
+# -------------------------------------------------------------------------
+class ChunkWriter:
+    """
+    Collects the text written to it, and writes it UTF-8 encoded to a binary
+    file in large chunks.
+
+    If threaded, the chunks are written to the file by a separate thread, so
+    that the compression of a chunk by a gzip file runs while the next chunk
+    is collected.
+    """
+
+    def __init__(self, ofile, threaded=False):
+        self.ofile = ofile
+        self.parts = []
+        self.size = 0
+        self.error = None
+        self.queue = None
+        self.thread = None
+        if threaded:
+            self.queue = queue.Queue(WRITE_QUEUE_SIZE)
+            self.thread = threading.Thread(target=self.__write_chunks, daemon=True)
+            self.thread.start()
+
+    def write(self, text):
+        """
+        Write text.
+        """
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= WRITE_CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the collected text to the file, or pass it to the writing
+        thread.
+        """
+        if not self.parts:
+            return
+        chunk = "".join(self.parts).encode("utf-8")
+        self.parts = []
+        self.size = 0
+        if self.thread is None:
+            self.ofile.write(chunk)
+        else:
+            self.__check_error()
+            self.queue.put(chunk)
+
+    def close(self):
+        """
+        Write the collected text and wait for the writing thread to write
+        all chunks.  The file is not closed.
+        """
+        try:
+            self.flush()
+        finally:
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+                self.thread = None
+        self.__check_error()
+
+    def __write_chunks(self):
+        """
+        Write the chunks passed by the collecting thread, until None is
+        passed.  After an error, the chunks are dropped.
+        """
+        for chunk in iter(self.queue.get, None):
+            if self.error is None:
+                try:
+                    self.ofile.write(chunk)
+                except Exception as err:
+                    self.error = err
+
+    def __check_error(self):
+        """
+        Raise the error of the writing thread, if any.
+        """
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+
 # -------------------------------------------------------------------------
 #
 #
@@ -196,11 +299,13 @@ class GrampsXmlWriter(UpdateCallback):
                 raise DbWriteFailure(_("Failure writing %s") % filename, str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
-        if filename != "-":
-            g.close()
+        self.g = ChunkWriter(g, threaded=bool(self.compress))
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.close()
+            if filename != "-":
+                g.close()
         return 1
 
     def write_handle(self, handle):
@@ -216,10 +321,12 @@ class GrampsXmlWriter(UpdateCallback):
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
-        g.close()
+        self.g = ChunkWriter(g, threaded=g is not handle)
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.close()
+            g.close()
         return 1
 
     def write_xml_data(self):
@@ -292,20 +399,16 @@ class GrampsXmlWriter(UpdateCallback):
         # Write table objects
         if tag_len > 0:
             self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
+            for tag in self.iter_objects("Tag", Tag):
+                self.write_tag(tag, 2)
                 self.update()
             self.g.write("  </tags>\n")
 
         # Write primary objects
         if event_len > 0:
             self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event, 2)
+            for event in self.iter_objects("Event", Event):
+                self.write_event(event, 2)
                 self.update()
             self.g.write("  </events>\n")
 
@@ -316,74 +419,57 @@ class GrampsXmlWriter(UpdateCallback):
                 self.g.write(' home="_%s"' % person.handle)
             self.g.write(">\n")
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
+            for person in self.iter_objects("Person", Person):
+                self.write_person(person, 2)
                 self.update()
             self.g.write("  </people>\n")
 
         if family_len > 0:
             self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family, 2)
+            for family in self.iter_objects("Family", Family):
+                self.write_family(family, 2)
                 self.update()
             self.g.write("  </families>\n")
 
         if citation_len > 0:
             self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation, 2)
+            for citation in self.iter_objects("Citation", Citation):
+                self.write_citation(citation, 2)
                 self.update()
             self.g.write("  </citations>\n")
 
         if source_len > 0:
             self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source, 2)
+            for source in self.iter_objects("Source", Source):
+                self.write_source(source, 2)
                 self.update()
             self.g.write("  </sources>\n")
 
         if place_len > 0:
             self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place, 2)
+            for place in self.iter_objects("Place", Place):
+                self.write_place_obj(place, 2)
                 self.update()
             self.g.write("  </places>\n")
 
         if obj_len > 0:
             self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj, 2)
+            for obj in self.iter_objects("Media", Media):
+                self.write_object(obj, 2)
                 self.update()
             self.g.write("  </objects>\n")
 
         if repo_len > 0:
             self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo, 2)
+            for repo in self.iter_objects("Repository", Repository):
+                self.write_repository(repo, 2)
                 self.update()
             self.g.write("  </repositories>\n")
 
         if note_len > 0:
             self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
+            for note in self.iter_objects("Note", Note):
+                self.write_note(note, 2)
                 self.update()
             self.g.write("  </notes>\n")
 
@@ -396,6 +482,18 @@ class GrampsXmlWriter(UpdateCallback):
     #        self.status.end()
     #        self.status = None
 
+    def iter_objects(self, class_name, obj_class):
+        """
+        Iterate over the objects of a primary class in the order of their
+        handles, read with a single query if the database can, and in
+        batches by handle otherwise.
+        """
+        data = self.db.get_raw_data_in_handle_order(class_name)
+        if data is None:
+            handles = sorted(self.db.method("get_%s_handles", class_name)())
+            return self.db.method("get_%s_from_handles", class_name)(handles)
+        return (obj_class.create(raw) for (_handle, raw) in data)
+
     def write_metadata(self):
         """Method to write out metadata of the database"""
         mediapath = self.db.get_mediapath()
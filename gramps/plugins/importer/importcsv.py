@@ -182,6 +182,8 @@ class CSVParser:
         self.fref = {}  # family ref, internal to this sheet
         self.placeref = {}
         self.eventref = {}
+        self.place_titles = None  # place handle by displayed title
+        self.source_titles = None  # source handle by title
         self.place_types = {}
         # Build reverse dictionary, name to type number
         for items in PlaceType().get_map().items():  # (0, 'Custom')
@@ -544,6 +546,7 @@ class CSVParser:
             LOG.debug("New Families: %d" % self.fam_count)
             LOG.debug("New Individuals: %d" % self.indi_count)
             LOG.debug("New Places: %d" % self.place_count)
+            LOG.debug("Rows per second: %d" % (len(data) / max(tym, 0.001)))
         return err_msg
 
     def _check_refs(self):
@@ -573,6 +576,8 @@ class CSVParser:
         self.fref = {}  # family ref, internal to this sheet
         self.placeref = {}
         self.eventref = {}
+        self.place_titles = None
+        self.source_titles = None
         header = None
         line_number = 0
         for row in data:
@@ -1094,6 +1099,9 @@ class CSVParser:
                 placeref.date = _dp.parse(place_date)
         #########################################################
         self.db.commit_place(place, self.trans)
+        # the displayed titles of the place and the places it encloses may
+        # have changed
+        self.place_titles = None
 
     def get_place_type(self, place_type_str):
         if place_type_str in self.place_types:
@@ -1249,32 +1257,41 @@ class CSVParser:
             place = self.lookup("place", place_name)
             return (0, place)
         LOG.debug("get_or_create_place: looking for: %s", place_name)
-        for place_handle in self.db.iter_place_handles():
-            place = self.db.get_place_from_handle(place_handle)
-            place_title = place_displayer.display(self.db, place)
-            if place_title == place_name:
-                return (0, place)
+        if self.place_titles is None:
+            self.place_titles = {}
+            for place_handle in self.db.iter_place_handles():
+                place = self.db.get_place_from_handle(place_handle)
+                place_title = place_displayer.display(self.db, place)
+                self.place_titles.setdefault(place_title, place_handle)
+        place_handle = self.place_titles.get(place_name)
+        if place_handle is not None:
+            return (0, self.db.get_place_from_handle(place_handle))
         place = Place()
         place.set_title(place_name)
         place.name = PlaceName(value=place_name)
         self.db.add_place(place, self.trans)
+        place_title = place_displayer.display(self.db, place)
+        self.place_titles.setdefault(place_title, place.handle)
         self.place_count += 1
         return (1, place)
 
     def get_or_create_source(self, source_text):
         "Return the requested source object tuple-packed with a new indicator."
-        source_list = self.db.get_source_handles(sort_handles=False)
-        LOG.debug("get_or_create_source: list: %s", source_list)
         LOG.debug("get_or_create_source: looking for: %s", source_text)
-        for source_handle in source_list:
-            source = self.db.get_source_from_handle(source_handle)
-            if source.get_title() == source_text:
-                LOG.debug("   returning existing source")
-                return (0, source)
+        if self.source_titles is None:
+            self.source_titles = {}
+            for source_handle in self.db.get_source_handles(sort_handles=False):
+                source = self.db.get_source_from_handle(source_handle)
+                self.source_titles.setdefault(source.get_title(), source_handle)
+        source_handle = self.source_titles.get(source_text)
+        if source_handle is not None:
+            LOG.debug("   returning existing source")
+            return (0, self.db.get_source_from_handle(source_handle))
         LOG.debug("   creating source")
         source = Source()
         source.set_title(source_text)
         self.db.add_source(source, self.trans)
+        self.source_titles[source_text] = source.handle
         return (1, source)
 
     def find_and_set_citation(self, obj, source):
@@ -113,6 +113,7 @@ from gramps.gen.db.dbconst import (
     TAG_KEY,
     CITATION_KEY,
     CLASS_TO_KEY_MAP,
+    KEY_TO_CLASS_MAP,
 )
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.version import VERSION
@@ -570,6 +571,11 @@ class GrampsParser(UpdateCallback):
         # import the Researcher; if the tree was not empty, the existing
         # Researcher is retained
         self.import_researcher = self.db.get_total() == 0
+        # In an empty family tree, the handles and ids can only conflict with
+        # those of the imported data, so the database is not searched for them
+        self.empty_tree = self.import_researcher
+        # The ids in use, by kind of primary object, see get_used_gramps_ids
+        self.used_gramps_ids = {}
         self.ord = None
         self.objref = None
         self.object = None
@@ -803,8 +809,9 @@ class GrampsParser(UpdateCallback):
         This method can be called with an object instance or with a
         class object. Be aware that in the first case the side effect of this
         function is to fill the object instance with the data read from the db.
-        In the second case, an empty object with the correct handle will be
-        created.
+        A new object instance is not added to the database, the caller commits
+        it.  In the second case, an empty object with the correct handle will
+        be created.
 
         :param handle: The handle of the primary object, typically as read
                        directly from the XML attributes.
@@ -857,7 +864,7 @@ class GrampsParser(UpdateCallback):
                 handle = create_id()
                 while handle in self.import_handles:
                     handle = create_id()
-            else:
+            elif not self.empty_tree:
                 has_handle_func = {
                     "person": self.db.has_person_handle,
                     "family": self.db.has_family_handle,
@@ -878,6 +885,10 @@ class GrampsParser(UpdateCallback):
             prim_obj = prim_obj()
         else:
             self.import_handles[orig_handle][target][INSTANTIATED] = True
+            # The caller commits the object once it is read, so it is not
+            # added empty first.
+            prim_obj.set_handle(handle)
+            return handle
         prim_obj.set_handle(handle)
         if target == "tag":
             self.db.add_tag(prim_obj, self.trans)
@@ -982,20 +993,9 @@ class GrampsParser(UpdateCallback):
             "reference",
             self.db.find_next_note_gramps_id,
         ][key]
-        has_gramps_id = [
-            self.db.has_person_gramps_id,
-            self.db.has_family_gramps_id,
-            self.db.has_source_gramps_id,
-            self.db.has_event_gramps_id,
-            self.db.has_media_gramps_id,
-            self.db.has_place_gramps_id,
-            self.db.has_repository_gramps_id,
-            "reference",
-            self.db.has_note_gramps_id,
-        ][key]
 
         gramps_id = self.legalize_id(
-            id_, key, id2id_map, id2user_format, find_next_gramps_id, has_gramps_id
+            id_, key, id2id_map, id2user_format, find_next_gramps_id
         )
         handle = id2handle_map.get(gramps_id)
         if handle:
@@ -1013,9 +1013,7 @@ class GrampsParser(UpdateCallback):
             id2handle_map[gramps_id] = handle
         return handle
 
-    def legalize_id(
-        self, id_, key, gramps_ids, id2user_format, find_next_gramps_id, has_gramps_id
-    ):
+    def legalize_id(self, id_, key, gramps_ids, id2user_format, find_next_gramps_id):
         """
         Given an import id, adjust it so that it fits with the existing data.
 
@@ -1032,15 +1030,42 @@ class GrampsParser(UpdateCallback):
         :type find_next_gramps_id: func
         :returns: The id.
         :rtype: str
+
+        The ids in use are looked up in :meth:`get_used_gramps_ids`, which also
+        holds the ids given to the objects imported so far, even if they are
+        not committed yet.
         """
         gramps_id = id2user_format(id_)
         if gramps_id is None or not gramps_ids.get(id_):
-            if gramps_id is None or has_gramps_id(gramps_id):
-                gramps_ids[id_] = find_next_gramps_id()
-            else:
-                gramps_ids[id_] = gramps_id
+            used_ids = self.get_used_gramps_ids(key)
+            if gramps_id is None or gramps_id in used_ids:
+                gramps_id = find_next_gramps_id()
+                while gramps_id in used_ids:
+                    gramps_id = find_next_gramps_id()
+            used_ids.add(gramps_id)
+            gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
+    def get_used_gramps_ids(self, key):
+        """
+        Return the set of the ids in use for a kind of primary object, read
+        at once from the database on first use.
+
+        :param key: Indicates kind of primary object.
+        :type key: int
+        :returns: The ids in use.
+        :rtype: set
+        """
+        used_ids = self.used_gramps_ids.get(key)
+        if used_ids is None:
+            if self.empty_tree:
+                used_ids = set()
+            else:
+                class_name = KEY_TO_CLASS_MAP[key]
+                used_ids = set(self.db.method("get_%s_gramps_ids", class_name)())
+            self.used_gramps_ids[key] = used_ids
+        return used_ids
+
     def parse(self, ifile, linecount=1, personcount=0):
         """
         Parse the xml file
@@ -1267,7 +1292,6 @@ class GrampsParser(UpdateCallback):
                 self.pidswap,
                 self.db.pid2user_format,
                 self.db.find_next_place_gramps_id,
-                self.db.has_place_gramps_id,
             )
             self.placeobj.set_gramps_id(gramps_id)
             if is_merge_candidate:
@@ -1355,6 +1379,7 @@ class GrampsParser(UpdateCallback):
             note.type.set(NoteType.EVENT)
             note.private = self.event.private
             self.db.add_note(note, self.trans)
+            self.get_used_gramps_ids(NOTE_KEY).add(note.gramps_id)
             # set correct change time
             self.db.commit_note(note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, note)
@@ -1395,6 +1420,7 @@ class GrampsParser(UpdateCallback):
             self.event.type = EventType()
             self.event.type.set_from_xml_str(attrs["type"])
             self.db.add_event(self.event, self.trans)
+            self.get_used_gramps_ids(EVENT_KEY).add(self.event.gramps_id)
             # set correct change time
             self.db.commit_event(self.event, self.trans, self.change)
             self.info.add("new-object", EVENT_KEY, self.event)
@@ -1414,7 +1440,6 @@ class GrampsParser(UpdateCallback):
                     self.eidswap,
                     self.db.eid2user_format,
                     self.db.find_next_event_gramps_id,
-                    self.db.has_event_gramps_id,
                 )
                 self.event.set_gramps_id(gramps_id)
                 if is_merge_candidate:
@@ -1637,7 +1662,6 @@ class GrampsParser(UpdateCallback):
                 self.idswap,
                 self.db.id2user_format,
                 self.db.find_next_person_gramps_id,
-                self.db.has_person_gramps_id,
             )
             self.person.set_gramps_id(gramps_id)
             if is_merge_candidate:
@@ -1773,7 +1797,6 @@ class GrampsParser(UpdateCallback):
                 self.fidswap,
                 self.db.fid2user_format,
                 self.db.find_next_family_gramps_id,
-                self.db.has_family_gramps_id,
             )
             self.family.set_gramps_id(gramps_id)
             if is_merge_candidate:
@@ -2061,7 +2084,6 @@ class GrampsParser(UpdateCallback):
                     self.nidswap,
                     self.db.nid2user_format,
                     self.db.find_next_note_gramps_id,
-                    self.db.has_note_gramps_id,
                 )
                 self.note.set_gramps_id(gramps_id)
                 if is_merge_candidate:
@@ -2148,6 +2170,7 @@ class GrampsParser(UpdateCallback):
                 self.note.private = self.repo.private
 
             self.db.add_note(self.note, self.trans)
+            self.get_used_gramps_ids(NOTE_KEY).add(self.note.gramps_id)
             # set correct change time
             self.db.commit_note(self.note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, self.note)
@@ -2265,7 +2288,6 @@ class GrampsParser(UpdateCallback):
             self.cidswap,
             self.db.cid2user_format,
             self.db.find_next_citation_gramps_id,
-            self.db.has_citation_gramps_id,
         )
         self.citation.set_gramps_id(gramps_id)
         if is_merge_candidate:
@@ -2304,6 +2326,7 @@ class GrampsParser(UpdateCallback):
             self.citation.private = bool(attrs.get("priv"))
 
             citation_handle = self.db.add_citation(self.citation, self.trans)
+            self.get_used_gramps_ids(CITATION_KEY).add(self.citation.gramps_id)
             self.__add_citation(citation_handle)
 
     def start_source(self, attrs):
@@ -2325,7 +2348,6 @@ class GrampsParser(UpdateCallback):
                 self.sidswap,
                 self.db.sid2user_format,
                 self.db.find_next_source_gramps_id,
-                self.db.has_source_gramps_id,
             )
             self.source.set_gramps_id(gramps_id)
             if is_merge_candidate:
@@ -2409,7 +2431,6 @@ class GrampsParser(UpdateCallback):
                 self.oidswap,
                 self.db.oid2user_format,
                 self.db.find_next_media_gramps_id,
-                self.db.has_media_gramps_id,
             )
             self.object.set_gramps_id(gramps_id)
             if is_merge_candidate:
@@ -2452,7 +2473,6 @@ class GrampsParser(UpdateCallback):
                 self.ridswap,
                 self.db.rid2user_format,
                 self.db.find_next_repository_gramps_id,
-                self.db.has_repository_gramps_id,
             )
             self.repo.set_gramps_id(gramps_id)
             if is_merge_candidate:
@@ -2508,6 +2528,7 @@ class GrampsParser(UpdateCallback):
                 self.photo.add_attribute(attr)
         self.photo.set_mime_type(get_type(self.photo.get_path()))
         self.db.add_media(self.photo, self.trans)
+        self.get_used_gramps_ids(MEDIA_KEY).add(self.photo.gramps_id)
         # set correct change time
         self.db.commit_media(self.photo, self.trans, self.change)
         self.info.add("new-object", MEDIA_KEY, self.photo)
@@ -2793,6 +2814,7 @@ class GrampsParser(UpdateCallback):
             note.type.set(NoteType.EVENT)
             note.private = self.event.private
             self.db.add_note(note, self.trans)
+            self.get_used_gramps_ids(NOTE_KEY).add(note.gramps_id)
             # set correct change time
             self.db.commit_note(note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, note)
@@ -2924,6 +2946,7 @@ class GrampsParser(UpdateCallback):
             note.type.set(NoteType.EVENT)
             note.private = self.event.private
             self.db.add_note(note, self.trans)
+            self.get_used_gramps_ids(NOTE_KEY).add(note.gramps_id)
             # set correct change time
             self.db.commit_note(note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, note)
@@ -3159,6 +3182,7 @@ class GrampsParser(UpdateCallback):
         note.set(text)
         note.type.set(NoteType.SOURCE_TEXT)
         self.db.add_note(note, self.trans)
+        self.get_used_gramps_ids(NOTE_KEY).add(note.gramps_id)
         # set correct change time
         self.db.commit_note(note, self.trans, self.change)
         self.info.add("new-object", NOTE_KEY, note)
@@ -3176,6 +3200,7 @@ class GrampsParser(UpdateCallback):
         note.set(text)
         note.type.set(NoteType.CITATION)
         self.db.add_note(note, self.trans)
+        self.get_used_gramps_ids(NOTE_KEY).add(note.gramps_id)
         # set correct change time
         self.db.commit_note(note, self.trans, self.change)
         self.info.add("new-object", NOTE_KEY, note)
@@ -0,0 +1,104 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unit test of the Gramps ids and handles given by the Gramps XML import
+"""
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_from_filename, make_database
+from gramps.gen.lib import Person
+from gramps.gen.user import User
+from gramps.plugins.lib.libgrampsxml import GRAMPS_XML_VERSION
+
+XML = (
+    """<?xml version="1.0" encoding="UTF-8"?>
+<database xmlns="http://gramps-project.org/xml/%s/">
+  <people>
+    <person handle="_P1" change="0" id="I0001">
+      <gender>M</gender>
+      <noteref hlink="_N1"/>
+    </person>
+    <person handle="_P0" change="0" id="I0000">
+      <gender>F</gender>
+    </person>
+  </people>
+  <notes>
+    <note handle="_N1" change="0" id="N0000" type="General">
+      <text>A note</text>
+    </note>
+  </notes>
+</database>
+"""
+    % GRAMPS_XML_VERSION
+)
+
+
+class ImportIdsTest(unittest.TestCase):
+    """
+    Import the same file into an empty family tree and into a family tree
+    whose ids conflict with those of the file.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "ids.gramps")
+        with open(self.filename, "w", encoding="utf-8") as ofile:
+            ofile.write(XML)
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close(update=False)
+        self.tmpdir.cleanup()
+
+    def import_file(self):
+        self.assertTrue(import_from_filename(self.db, self.filename, User()))
+
+    def test_empty_tree(self):
+        self.import_file()
+        self.assertEqual(self.db.get_person_from_handle("P1").gramps_id, "I0001")
+        self.assertEqual(self.db.get_person_from_handle("P0").gramps_id, "I0000")
+        note = self.db.get_note_from_handle("N1")
+        self.assertEqual(note.gramps_id, "N0000")
+        self.assertEqual(note.get(), "A note")
+        self.assertEqual(self.db.get_person_from_handle("P1").note_list, ["N1"])
+
+    def test_conflicts(self):
+        person = Person()
+        person.set_gramps_id("I0001")
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_person(person, trans, set_gid=False)
+        self.import_file()
+        self.import_file()
+        ids = sorted(self.db.get_person_gramps_ids())
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(len(set(self.db.get_note_gramps_ids())), 2)
+        for note in self.db.iter_notes():
+            self.assertEqual(note.get(), "A note")
+
+
+if __name__ == "__main__":
+    unittest.main()
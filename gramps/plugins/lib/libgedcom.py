@@ -96,6 +96,7 @@ import time
 from collections import defaultdict, OrderedDict
 import string
 import mimetypes
+from itertools import chain
 from io import StringIO, TextIOWrapper
 from urllib.parse import urlparse
 
@@ -752,13 +753,17 @@ CUSTOMEVENTTAGS = {
     "_SEPR": _("Separation"),  # Applies to Families
     "_WEIG": _("Weight"),
 }
-# table for skipping illegal control chars in GEDCOM import
+# pattern for skipping illegal control chars in GEDCOM import
 # Only 09, 0A, 0D are allowed.
-STRIP_DICT = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
+STRIP_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
 # The C1 Control characters are not treated in Latin-1 (ISO-8859-1) as
 # undefined, but if they have been used, the file is probably supposed to be
 # cp1252
 DEL_AND_C1 = dict.fromkeys(list(range(0x7F, 0x9F)))
+# number of characters read at once by the readers
+BLOCK_SIZE = 1 << 16
+# number of lines read at once by the readers reading line by line
+BLOCK_LINES = 1000
 
 # -------------------------------------------------------------------------
 #
@@ -884,6 +889,13 @@ CAL = re.compile(r"\s*(ABT|BEF|AFT|FROM|TO)?\s*@#D?([^@]+)@\s*(.*)$")
 RANGE = re.compile(r"\s*BET\s+@#D?([^@]+)@\s*(.*)\s+AND\s+@#D?([^@]+)@\s*(.*)$")
 RANGE1 = re.compile(r"\s*BET\s+\s*(.*)\s+AND\s+@#D?([^@]+)@\s*(.*)$")
 RANGE2 = re.compile(r"\s*BET\s+@#D?([^@]+)@\s*(.*)\s+AND\s+\s*(.*)$")
+# A GEDCOM line without its terminator: the level, then either a xref_id
+# and the value, or a tag and the value.  Lines with a xref_id on a CONT or
+# CONC line are left to Lexer.__split_line.
+LINE_RE = re.compile(
+    r" *(\d+) +(?! )(?:@([^@]*)@(?!\s*CON[CT] )\s*(.*)|([^ @][^ ]*)?(?: (.*))?)",
+    re.DOTALL,
+)
 SPAN = re.compile(r"\s*FROM\s+@#D?([^@]+)@\s*(.*)\s+TO\s+@#D?([^@]+)@\s*(.*)$")
 SPAN1 = re.compile(r"\s*FROM\s+\s*(.*)\s+TO\s+@#D?([^@]+)@\s*(.*)$")
 SPAN2 = re.compile(r"\s*FROM\s+@#D?([^@]+)@\s*(.*)\s+TO\s+\s*(.*)$")
@@ -931,125 +943,137 @@ class Lexer:
 
     def __init__(self, ifile, __add_msg):
         self.ifile = ifile
-        self.current_list = []
-        self.eof = False
-        self.cnv = None
-        self.cnt = 0
-        self.index = 0
-        self.func_map = {
-            TOKEN_CONT: self.__fix_token_cont,
-            TOKEN_CONC: self.__fix_token_conc,
-        }
         self.__add_msg = __add_msg
+        self.__lines = self.__read_lines()
 
     def readline(self):
-        """read a line from file with possibility of putting it back"""
-        if len(self.current_list) <= 1 and not self.eof:
-            self.__readahead()
+        """read the next line from file, with its CONT and CONC lines"""
+        data = next(self.__lines, None)
+        if data is None:
+            return None
         try:
-            return GedLine(self.current_list.pop())
+            return GedLine(data)
         except:
             LOG.debug("Error in reading Gedcom line", exc_info=True)
             return None
 
-    def __fix_token_cont(self, data):
-        line = self.current_list[0]
-        new_value = line[2] + "\n" + data[2]
-        self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
-
-    def __fix_token_conc(self, data):
-        line = self.current_list[0]
-        if len(line[2]) == 4:
-            # This deals with lines of the form
-            # 0 @<XREF:NOTE>@ NOTE
-            #   1 CONC <SUBMITTER TEXT>
-            # The previous line contains only a tag and no data so concat a
-            # space to separate the new line from the tag. This prevents the
-            # first letter of the new line being lost later
-            # in _GedcomParse.__parse_record
-            new_value = line[2] + " " + data[2]
-        else:
-            new_value = line[2] + data[2]
-        self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
-
-    def __readahead(self):
-        while len(self.current_list) < 5:
-            line = self.ifile.readline()
-            self.index += 1
-            if not line:
-                self.eof = True
-                return
-
-            original_line = line
-            try:
-                # According to the GEDCOM 5.5 standard,
-                # Chapter 1 subsection Grammar "leading whitespace preceeding
-                # a GEDCOM line should be ignored"
-                # We will also strip the terminator which is any combination
-                # of carriage_return and line_feed
-                line = line.lstrip(" ").rstrip("\n\r")
-                # split into level+delim+rest
-                line = line.partition(" ")
-                level = int(line[0])
-                # there should only be one space after the level,
-                # but we can ignore more,
-                line = line[2].lstrip(" ")
-                # then split into tag+delim+line_value
-                # or xfef_id+delim+rest
-                # the xref_id can have spaces in it
-                if line.startswith("@"):
-                    line = line.split("@", 2)
-                    # line is now [None, alphanum+pointer_string, rest]
-                    tag = "@" + line[1] + "@"
-                    line_value = line[2].lstrip()
-                    # Ignore meaningless @IDENT@ on CONT or CONC line
-                    # as noted at http://www.tamurajones.net/IdentCONT.xhtml
-                    if line_value.lstrip().startswith(
-                        "CONT "
-                    ) or line_value.lstrip().startswith("CONC "):
-                        line = line_value.lstrip().partition(" ")
-                        tag = line[0]
-                        line_value = line[2]
+    def __read_lines(self):
+        """
+        Generate the tokenized lines of the file, read by blocks of lines.
+        Only the last line is held back, so the values of the CONT and CONC
+        lines that follow it can be added to its value.
+        """
+        readlines = self.ifile.readlines
+        match = LINE_RE.fullmatch
+        tokens = TOKENS
+        pending = None
+        index = 0
+        for line in chain.from_iterable(iter(readlines, [])):
+            index += 1
+            found = match(line)
+            if found:
+                (level, xref, xref_value, tag, line_value) = found.groups()
+                level = int(level)
+                if xref is not None:
+                    tag = "@" + xref + "@"
+                    line_value = xref_value
                 else:
-                    line = line.partition(" ")
-                    tag = line[0]
-                    line_value = line[2]
-            except:
-                problem = _("Line ignored ")
-                text = original_line.rstrip("\n\r")
-                prob_width = 66
-                problem = problem.ljust(prob_width)[0 : (prob_width - 1)]
-                text = text.replace("\n", "\n".ljust(prob_width + 22))
-                message = "%s              %s" % (problem, text)
-                self.__add_msg(message)
-                continue
+                    tag = tag or ""
+                    line_value = line_value or ""
+            else:
+                split = self.__split_line(line)
+                if split is None:
+                    continue
+                (level, tag, line_value) = split
 
             # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
             line_value = line_value.replace("@@", "@")
-            token = TOKENS.get(tag, TOKEN_UNKNOWN)
-            data = (level, token, line_value, tag, self.index)
-
-            func = self.func_map.get(data[1])
-            if func:
-                func(data)
+            token = tokens.get(tag, TOKEN_UNKNOWN)
+
+            if pending is not None and token == TOKEN_CONT:
+                value += "\n" + line_value
+            elif pending is not None and token == TOKEN_CONC:
+                if len(value) == 4:
+                    # This deals with lines of the form
+                    # 0 @<XREF:NOTE>@ NOTE
+                    #   1 CONC <SUBMITTER TEXT>
+                    # The previous line contains only a tag and no data so
+                    # concat a space to separate the new line from the tag.
+                    # This prevents the first letter of the new line being
+                    # lost later in _GedcomParse.__parse_record
+                    value += " " + line_value
+                else:
+                    value += line_value
             else:
+                if pending is not None:
+                    yield pending[:2] + (value,) + pending[2:]
                 # There will normally only be one space between tag and
                 # line_value, but in case there is more then one, remove extra
                 # spaces after CONC/CONT processing
                 # Also, Gedcom spec says there should be no spaces at end of
                 # line, however some programs put them there (FTM), so let's
                 # leave them in place.
-                data = data[:2] + (data[2].lstrip(),) + data[3:]
-                self.current_list.insert(0, data)
+                pending = (level, token, tag, index)
+                value = line_value.lstrip()
+        if pending is not None:
+            yield pending[:2] + (value,) + pending[2:]
+
+    def __split_line(self, line):
+        """
+        Split a line not matched by LINE_RE into its level, tag and value, or
+        report it and return None if it can't be parsed.
+        """
+        original_line = line
+        try:
+            # According to the GEDCOM 5.5 standard,
+            # Chapter 1 subsection Grammar "leading whitespace preceeding
+            # a GEDCOM line should be ignored"
+            # We will also strip the terminator which is any combination
+            # of carriage_return and line_feed
+            line = line.lstrip(" ").rstrip("\n\r")
+            # split into level+delim+rest
+            line = line.partition(" ")
+            level = int(line[0])
+            # there should only be one space after the level,
+            # but we can ignore more,
+            line = line[2].lstrip(" ")
+            # then split into tag+delim+line_value
+            # or xfef_id+delim+rest
+            # the xref_id can have spaces in it
+            if line.startswith("@"):
+                line = line.split("@", 2)
+                # line is now [None, alphanum+pointer_string, rest]
+                tag = "@" + line[1] + "@"
+                line_value = line[2].lstrip()
+                # Ignore meaningless @IDENT@ on CONT or CONC line
+                # as noted at http://www.tamurajones.net/IdentCONT.xhtml
+                if line_value.lstrip().startswith(
+                    "CONT "
+                ) or line_value.lstrip().startswith("CONC "):
+                    line = line_value.lstrip().partition(" ")
+                    tag = line[0]
+                    line_value = line[2]
+            else:
+                line = line.partition(" ")
+                tag = line[0]
+                line_value = line[2]
+        except:
+            problem = _("Line ignored ")
+            text = original_line.rstrip("\n\r")
+            prob_width = 66
+            problem = problem.ljust(prob_width)[0 : (prob_width - 1)]
+            text = text.replace("\n", "\n".ljust(prob_width + 22))
+            message = "%s              %s" % (problem, text)
+            self.__add_msg(message)
+            return None
+        return (level, tag, line_value)
 
     def clean_up(self):
         """
-        Break circular references to parsing methods stored in dictionaries
-        to aid garbage collection
+        Stop the reading of the lines, to break the circular reference to the
+        lexer held by the line generator and aid garbage collection
         """
-        for key in list(self.func_map.keys()):
-            del self.func_map[key]
-        del self.func_map
+        self.__lines.close()
 
 
 # -----------------------------------------------------------------------
@@ -1077,6 +1101,8 @@ class GedLine:
     TOEKN_UKNOWN - Check to see if this is a known event
     """
 
+    __slots__ = ("line", "level", "token", "token_text", "data")
+
     __DATE_CNV = GedcomDateParser()
 
     @staticmethod
@@ -1335,6 +1361,19 @@ class BaseReader:
         """Read a single line"""
         raise NotImplementedError()
 
+    def readlines(self):
+        """
+        Read a block of lines, without their terminators. Return an empty list
+        at the end of the file.
+        """
+        lines = []
+        for i in range(BLOCK_LINES):
+            line = self.readline()
+            if not line:
+                break
+            lines.append(line.rstrip("\n\r"))
+        return lines
+
     def report_error(self, problem, line):
         """Create an error message"""
         line = line.rstrip("\n\r")
@@ -1362,7 +1401,14 @@ class UTF8Reader(BaseReader):
 
     def readline(self):
         line = self.ifile.readline()
-        return line.translate(STRIP_DICT)
+        return STRIP_RE.sub("", line)
+
+    def readlines(self):
+        block = self.ifile.read(BLOCK_SIZE) + self.ifile.readline()
+        lines = STRIP_RE.sub("", block).split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return lines
 
 
 class UTF16Reader(BaseReader):
@@ -1377,7 +1423,14 @@ class UTF16Reader(BaseReader):
 
     def readline(self):
         line = self.ifile.readline()
-        return line.translate(STRIP_DICT)
+        return STRIP_RE.sub("", line)
+
+    def readlines(self):
+        block = self.ifile.read(BLOCK_SIZE) + self.ifile.readline()
+        lines = STRIP_RE.sub("", block).split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return lines
 
 
 class AnsiReader(BaseReader):
@@ -1395,7 +1448,7 @@ class AnsiReader(BaseReader):
             self.report_error(
                 "DEL or C1 control chars in line did you mean " "CHAR cp1252??", line
             )
-        return line.translate(STRIP_DICT)
+        return STRIP_RE.sub("", line)
 
 
 class CP1252Reader(BaseReader):
@@ -1409,7 +1462,14 @@ class CP1252Reader(BaseReader):
 
     def readline(self):
         line = self.ifile.readline()
-        return line.translate(STRIP_DICT)
+        return STRIP_RE.sub("", line)
+
+    def readlines(self):
+        block = self.ifile.read(BLOCK_SIZE) + self.ifile.readline()
+        lines = STRIP_RE.sub("", block).split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return lines
 
 
 class AnselReader(BaseReader):
@@ -2103,13 +2163,15 @@ class IdMapper:
         self.find_next = find_next
         self.id2user_format = id2user_format
         self.swap = {}
+        # the Gramps IDs that are the target of a swap
+        self.targets = set()
 
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
             new_val = self.find_next()
-            while new_val in list(self.swap.values()):
+            while new_val in self.targets:
                 new_val = self.find_next()
         else:
             # remove any @ signs
@@ -2124,17 +2186,16 @@ class IdMapper:
                 # have found it. If we had already encountered I0001 and we are
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
-                if self.has_gid(formatted_gid) or (
-                    formatted_gid in list(self.swap.values())
-                ):
+                if self.has_gid(formatted_gid) or (formatted_gid in self.targets):
                     new_val = self.find_next()
-                    while new_val in list(self.swap.values()):
+                    while new_val in self.targets:
                         new_val = self.find_next()
                 else:
                     new_val = formatted_gid
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
+            self.targets.add(new_val)
         return new_val
 
     def clean(self, gid):
@@ -2226,20 +2287,21 @@ class GedcomParser(UpdateCallback):
     ):
         UpdateCallback.__init__(self, user.callback)
         self.user = user
-        self.set_total(stage_one.get_line_count())
+        # the progress is the position in the file, at each record
+        ifile.seek(0, os.SEEK_END)
+        self.set_total(ifile.tell())
+        ifile.seek(0)
+        self.tell = ifile.tell
         self.repo2id = {}
         self.trans = None
         self.errors = []
         self.number_of_errors = 0
-        self.maxpeople = stage_one.get_person_count()
         self.dbase = dbase
         self.import_researcher = self.dbase.get_total() == 0
         event_ids = []
         for event in dbase.iter_events():
             event_ids.append(event.gramps_id)
         self.emapper = IdFinder(event_ids, dbase.event_prefix)
-        self.famc_map = stage_one.get_famc_map()
-        self.fams_map = stage_one.get_fams_map()
 
         self.place_parser = PlaceParser()
         self.inline_srcs = OrderedDict()
@@ -3416,7 +3478,8 @@ class GedcomParser(UpdateCallback):
         """
         if not self.backoff:
             self.groups = self.lexer.readline()
-            self.update()
+            if self.groups and self.groups.level == 0:
+                self.update(self.tell())
 
             # EOF ?
             if not self.groups:
@@ -3677,12 +3740,15 @@ class GedcomParser(UpdateCallback):
             "NOTE",
         )
 
-        # Check persons membership in referenced families
-        def __input_fid(gramps_id):
-            for key, val in self.fid_map.map().items():
-                if val == gramps_id:
-                    return key
+        # Input ids of the Gramps ids, for the messages
+        input_fids = {}
+        for key, val in self.fid_map.map().items():
+            input_fids.setdefault(val, key)
+        input_pids = {}
+        for key, val in self.pid_map.map().items():
+            input_pids.setdefault(val, key)
 
+        # Check persons membership in referenced families
         for input_id, gramps_id in self.pid_map.map().items():
             person_handle = self.__find_from_handle(gramps_id, self.gid2id)
             person = self.dbase.get_person_from_handle(person_handle)
@@ -3705,17 +3771,12 @@ class GedcomParser(UpdateCallback):
                         )
                         % {
                             "family": family.gramps_id,
-                            "orig_family": __input_fid(family.gramps_id),
+                            "orig_family": input_fids.get(family.gramps_id),
                             "person": person.gramps_id,
                             "orig_person": input_id,
                         }
                     )
 
-        def __input_pid(gramps_id):
-            for key, val in self.pid_map.map().items():
-                if val == gramps_id:
-                    return key
-
         for input_id, gramps_id in self.fid_map.map().items():
             family_handle = self.__find_from_handle(gramps_id, self.fid2id)
             family = self.dbase.get_family_from_handle(family_handle)
@@ -3736,7 +3797,7 @@ class GedcomParser(UpdateCallback):
                             "family": family.gramps_id,
                             "orig_family": input_id,
                             "father": father.gramps_id,
-                            "orig_father": __input_pid(father.gramps_id),
+                            "orig_father": input_pids.get(father.gramps_id),
                         }
                     )
 
@@ -3754,7 +3815,7 @@ class GedcomParser(UpdateCallback):
                             "family": family.gramps_id,
                             "orig_family": input_id,
                             "mother": mother.gramps_id,
-                            "orig_mother": __input_pid(mother.gramps_id),
+                            "orig_mother": input_pids.get(mother.gramps_id),
                         }
                     )
 
@@ -3778,7 +3839,7 @@ class GedcomParser(UpdateCallback):
                                 "family": family.gramps_id,
                                 "orig_family": input_id,
                                 "child": child.gramps_id,
-                                "orig_child": __input_pid(child.gramps_id),
+                                "orig_child": input_pids.get(child.gramps_id),
                             }
                         )
 
@@ -8559,12 +8620,14 @@ class GedcomParser(UpdateCallback):
 # -------------------------------------------------------------------------
 class GedcomStageOne:
     """
-    The GedcomStageOne parser scans the file quickly, looking for a few things.
-     This includes:
+    The GedcomStageOne parser scans the header of the file, looking for the
+    character set encoding.
+
+    On request, it also scans the whole file quickly, looking for a few
+    other things. This includes:
 
-    1. Character set encoding
-    2. Number of people and families in the list
-    3. Child to family references, since Ancestry.com creates GEDCOM files
+    1. Number of people and lines in the file
+    2. Child to family references, since Ancestry.com creates GEDCOM files
        without the FAMC references.
     """
 
@@ -8590,6 +8653,8 @@ class GedcomStageOne:
         self.enc = ""
         self.pcnt = 0
         self.lcnt = 0
+        self.codec = None
+        self.scanned = False
 
     def __detect_file_decoder(self, input_file):
         """
@@ -8604,38 +8669,66 @@ class GedcomStageOne:
         """
         line = input_file.read(2)
         if line == b"\xef\xbb":
-            input_file.read(1)
             self.enc = "utf_8_sig"
-            return TextIOWrapper(
-                input_file, encoding="utf_8_sig", errors="replace", newline=None
-            )
+            self.codec = "utf_8_sig"
         elif line == b"\xff\xfe" or line == b"\xfe\xff":
             self.enc = "UTF16"
-            input_file.seek(0)
-            return TextIOWrapper(
-                input_file, encoding="utf_16", errors="replace", newline=None
-            )
+            self.codec = "utf_16"
         elif not line:
             raise GedcomError(self.__EMPTY_GED)
         elif line == b"\x30\x00" or line == b"\x00\x30":
             raise GedcomError(self.__BAD_UTF16)
         else:
-            input_file.seek(0)
-            return TextIOWrapper(
-                input_file, encoding="utf-8", errors="replace", newline=None
-            )
+            self.codec = "utf-8"
+        input_file.seek(0)
+        return TextIOWrapper(
+            input_file, encoding=self.codec, errors="replace", newline=None
+        )
 
     def parse(self):
         """
-        Parse the input file.
+        Parse the header of the input file.
         """
+        reader = self.__detect_file_decoder(self.ifile)
+
+        in_header = False
+        for line in reader:
+            # Look for actual CHAR Keyword to figure out actual encodeing for
+            # non-unicode file types
+            try:
+                data = line.split(None, 3) + [""]
+                (level, key, value) = data[:3]
+                level = int(level)
+            except:
+                continue
+
+            if level == 0:
+                if in_header:
+                    # the first record after the header
+                    break
+                in_header = True
+            elif key == "CHAR" and not self.enc:
+                self.enc = value
+        reader.detach()  # keep python from autoclosing file
+
+    def __scan(self):
+        """
+        Scan the whole input file, once, for the counts and the family
+        references. The position in the file is kept.
+        """
+        if self.scanned:
+            return
+        self.scanned = True
         current_family_id = ""
 
-        reader = self.__detect_file_decoder(self.ifile)
+        position = self.ifile.tell()
+        self.ifile.seek(0)
+        reader = TextIOWrapper(
+            self.ifile, encoding=self.codec, errors="replace", newline=None
+        )
 
         for line in reader:
-            # Scan for a few items, keep counts.  Also look for actual CHAR
-            # Keyword to figure out actual encodeing for non-unicode file types
+            # Scan for a few items, keep counts.
             line = line.strip()
             if not line:
                 continue
@@ -8659,24 +8752,24 @@ class GedcomStageOne:
                 self.fams[value[1:-1]].append(current_family_id)
             elif key in ("CHIL", "CHILD") and self.__is_xref_value(value):
                 self.famc[value[1:-1]].append(current_family_id)
-            elif key == "CHAR" and not self.enc:
-                assert isinstance(value, str)
-                self.enc = value
         LOG.debug("parse pcnt %d", self.pcnt)
         LOG.debug("parse famc %s", dict(self.famc))
         LOG.debug("parse fams %s", dict(self.fams))
-        self.ifile = reader  # need this to keep python from autoclosing file
+        reader.detach()  # keep python from autoclosing file
+        self.ifile.seek(position)
 
     def get_famc_map(self):
         """
         Return the Person to Child Family map
         """
+        self.__scan()
         return self.famc
 
     def get_fams_map(self):
         """
         Return the Person to Family map (where the person is a spouse)
         """
+        self.__scan()
         return self.fams
 
     def get_encoding(self):
@@ -8696,12 +8789,14 @@ class GedcomStageOne:
         """
         Return the number of INDI records found
         """
+        self.__scan()
         return self.pcnt
 
     def get_line_count(self):
         """
         Return the number of lines in the file
         """
+        self.__scan()
         return self.lcnt
 
 
@@ -76,6 +76,7 @@ from gramps.gen.lib import (
     Tag,
 )
 from gramps.gen.db import DbTxn, CLASS_TO_KEY_MAP
+from gramps.gen.lib.rawrefs import get_raw_references
 from gramps.gen.config import config
 from gramps.gen.utils.id import create_id
 from gramps.gen.utils.db import family_name
@@ -95,6 +96,67 @@ strip_dict = dict.fromkeys(
     list(range(9)) + list(range(11, 13)) + list(range(14, 32)), " "
 )
 
+# Classes of the objects whose references are checked by check_references,
+# with the classes of the objects holding the references.  The links of the
+# notes are checked by check_note_links instead.  The family references of
+# the family lists of the persons are checked by
+# check_for_broken_family_links, so only the ones of their LDS ordinances
+# can be missing here.
+REFERENCE_CHECKS = {
+    "Person": ("Person",),
+    "Family": ("Person",),
+    "Place": ("Person", "Family", "Event", "Place"),
+    "Source": ("Citation",),
+    "Repository": ("Source",),
+    "Citation": (
+        "Person",
+        "Family",
+        "Place",
+        "Citation",
+        "Repository",
+        "Media",
+        "Event",
+    ),
+    "Media": ("Person", "Family", "Place", "Event", "Citation", "Source"),
+    "Note": (
+        "Person",
+        "Family",
+        "Place",
+        "Citation",
+        "Source",
+        "Media",
+        "Event",
+        "Repository",
+    ),
+    "Tag": (
+        "Person",
+        "Family",
+        "Media",
+        "Note",
+        "Event",
+        "Citation",
+        "Source",
+        "Place",
+        "Repository",
+    ),
+}
+
+# Classes whose missing objects are counted in the report by the objects
+# referring to them, rather than by the missing objects themselves.
+REFERRER_CHECKS = ("Person", "Family", "Place", "Source", "Repository")
+
+# Classes whose empty references are replaced by references to new objects.
+# The empty media references and the empty family handles are left alone.
+EMPTY_REFERENCE_CHECKS = (
+    "Person",
+    "Place",
+    "Source",
+    "Repository",
+    "Citation",
+    "Note",
+    "Tag",
+)
+
 
 class ProgressMeter:
     def __init__(self, *args, **kwargs):
@@ -212,12 +274,12 @@ class Check(tool.BatchTool):
             # then. This is done before fixing encoding and missing photos,
             # since otherwise we will be trying to fix empty records which are
             # then going to be deleted.
-            checker.cleanup_empty_objects()
-            checker.fix_encoding()
-            checker.fix_alt_place_names()
-            checker.fix_ctrlchars_in_notes()
-            checker.cleanup_missing_photos(cli)
-            checker.cleanup_deleted_name_formats()
+            checker.timed(checker.cleanup_empty_objects)
+            checker.timed(checker.fix_encoding)
+            checker.timed(checker.fix_alt_place_names)
+            checker.timed(checker.fix_ctrlchars_in_notes)
+            checker.timed(checker.cleanup_missing_photos, cli)
+            checker.timed(checker.cleanup_deleted_name_formats)
 
             prev_total = -1
             total = 0
@@ -225,35 +287,27 @@ class Check(tool.BatchTool):
             while prev_total != total:
                 prev_total = total
 
-                checker.check_for_broken_family_links()
-                checker.check_parent_relationships()
-                checker.cleanup_empty_families(cli)
-                checker.cleanup_duplicate_spouses()
+                checker.timed(checker.check_for_broken_family_links)
+                checker.timed(checker.check_parent_relationships)
+                checker.timed(checker.cleanup_empty_families, cli)
+                checker.timed(checker.cleanup_duplicate_spouses)
 
                 total = checker.family_errors()
 
-            checker.fix_duplicated_grampsid()
-            checker.check_events()
-            checker.check_person_references()
-            checker.check_family_references()
-            checker.check_place_references()
-            checker.check_source_references()
-            checker.check_citation_references()
-            checker.check_media_references()
-            checker.check_repo_references()
-            checker.check_note_references()
-            checker.check_tag_references()
-            checker.check_checksum()
-            checker.check_media_sourceref()
-            checker.check_note_links()
-            checker.check_backlinks()
+            checker.timed(checker.fix_duplicated_grampsid)
+            checker.timed(checker.check_events)
+            checker.timed(checker.check_checksum)
+            checker.timed(checker.check_media_sourceref)
+            # the references, the note links and the backlinks are checked
+            # in a single pass.
+            checker.timed(checker.check_references)
 
         # rebuilding reference maps needs to be done outside of a transaction
         # to avoid nesting transactions.
         if checker.bad_backlinks:
             checker.progress.set_pass(_("Rebuilding reference maps..."), 6)
             logging.info("Rebuilding reference maps...")
-            self.db.reindex_reference_map(checker.callback)
+            checker.timed(self.db.reindex_reference_map, checker.callback)
         else:
             logging.info("    OK: no backlink problems found")
 
@@ -263,6 +317,8 @@ class Check(tool.BatchTool):
         errs = checker.build_report(uistate)
         if errs:
             CheckReport(uistate, checker.text.getvalue(), cli)
+        if cli:
+            print(checker.build_timing_report())
 
 
 # -------------------------------------------------------------------------
@@ -307,6 +363,7 @@ class CheckIntegrity:
         self.duplicated_gramps_ids = 0
         self.bad_backlinks = 0
         self.bad_note_links = 0
+        self.timings = defaultdict(float)
         self.text = StringIO()
         self.last_img_dir = config.get("behavior.addmedia-image-dir")
         self.progress = ProgressMeter(
@@ -322,6 +379,20 @@ class CheckIntegrity:
         )
         self.explanation.set_handle(create_id())
 
+    def timed(self, check, *args):
+        """
+        Run a check, adding its duration to the time spent in the check.
+        """
+        start = time.perf_counter()
+        check(*args)
+        self.add_time(check.__name__, start)
+
+    def add_time(self, name, start):
+        """
+        Add the time since start to the time spent in a check.
+        """
+        self.timings[name] += time.perf_counter() - start
+
     def family_errors(self):
         return (
             len(self.broken_parent_links)
@@ -1356,444 +1427,203 @@ class CheckIntegrity:
         ):
             logging.info("    OK: no event problems found")
 
-    def check_backlinks(self):
-        """Looking for backlink reference problems"""
-
-        total = self.db.get_total()
-
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (1)", total
-        )
-        logging.info("Looking for backlink reference problems")
+    def check_references(self):
+        """
+        Looking for reference problems, bad links in notes and backlink
+        problems.
 
+        The objects are read in a single pass, in which the references of
+        each object are read from its serialized data and given to all the
+        validators.  The problems are fixed after the pass.
+        """
+        handles = {
+            class_name: self.db.method("get_%s_handles", class_name)()
+            for class_name in CLASS_TO_KEY_MAP
+        }
+        known_handles = {
+            ref_class: set(handles[ref_class]) for ref_class in REFERENCE_CHECKS
+        }
+        # The objects created by the previous checks refer to the
+        # explanation note, which is added below.
+        known_handles["Note"].add(self.explanation.handle)
+        ref_classes = {
+            class_name: [
+                ref_class
+                for ref_class, class_names in REFERENCE_CHECKS.items()
+                if class_name in class_names
+            ]
+            for class_name in handles
+        }
+        backlink_map = self.db.get_backlink_map()
+
+        # objects with empty references, as lists of the referenced classes
+        empty_references = defaultdict(list)
+        # (class_name, handle, gramps_id) of the first object referring to
+        # each missing object of the REFERRER_CHECKS classes
+        missing = defaultdict(dict)
+        # handles of the notes with links to objects
+        linked_notes = []
         # dict of object handles indexed by forward link created here
         my_blinks = defaultdict(list)
-        my_items = 0  # count of my backlinks for progress meter
         # dict of object handles indexed by forward link from db
         db_blinks = {}
-        db_items = 0  # count of db backlinks for progress meter
 
-        # first we assemble our own backlinks table, and while we have the
-        # handle, gather up a second table with the db's backlinks
-        for obj_class in CLASS_TO_KEY_MAP.keys():
-            for handle in self.db.method("iter_%s_handles", obj_class)():
-                self.progress.step()
-                blinks = list(self.db.find_backlink_handles(handle))
-                db_blinks[(obj_class, handle)] = blinks
-                db_items += len(blinks)
-                pri_obj = self.db.method("get_%s_from_handle", obj_class)(handle)
-                handle_list = pri_obj.get_referenced_handles_recursively()
-                my_items += len(handle_list)
-
-                for item in handle_list:
-                    my_blinks[item].append((obj_class, handle))
-
-        # Now we go through our backlinks and the dbs table comparing them
-        # check that each real reference has a backlink in the db table
         self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (2)", my_items
+            _("Looking for reference problems"),
+            sum(len(handle_list) for handle_list in handles.values()),
         )
-        for key, blinks in my_blinks.items():
-            for item in blinks:
-                self.progress.step()
-                if key not in db_blinks:
-                    # object has reference to something not in db;
-                    # should have been found in previous checks
-                    logging.warning(
-                        "    Fail: reference to an object %(obj)s"
-                        " not in the db by %(ref)s!",
-                        {"obj": key, "ref": item},
-                    )
-                    continue
-                if item not in db_blinks[key]:
-                    # Object has reference with no cooresponding backlink
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        'has a "%(cls2)s" reference'
-                        " with no corresponding backlink.",
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
+        logging.info("Looking for reference problems")
 
-        # Now we go through the db table and make checks against ours
-        # Check for db backlinks that don't have a reference object at all
-        self.progress.set_pass(
-            _("Looking for backlink reference problems") + " (3)", db_items
-        )
-        for key, blinks in db_blinks.items():
-            for item in blinks:
+        for class_name, handle_list in handles.items():
+            get_raw_data_many = self.db.method("get_raw_%s_data_many", class_name)
+            for handle, data in get_raw_data_many(handle_list):
                 self.progress.step()
-                if item not in db_blinks:
-                    # backlink to object entirely missing
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        "has a backlink to a missing"
-                        ' "%(cls2)s" object.',
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
-                    continue
-                # Check if the object has a reference to the backlinked one
-                if key not in my_blinks or item not in my_blinks[key]:
-                    # backlink to object which doesn't have reference
-                    self.bad_backlinks += 1
-                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
-                    logging.warning(
-                        '    FAIL: the "%(cls)s" [%(gid)s] '
-                        'has a backlink to a "%(cls2)s"'
-                        " with no corresponding reference.",
-                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
-                    )
-
-    def callback(self, *args):
-        self.progress.step()
-
-    def check_person_references(self):
-        """Looking for person reference problems"""
-        plist = self.db.get_person_handles()
-
-        self.progress.set_pass(_("Looking for person reference problems"), len(plist))
-        logging.info("Looking for person reference problems")
-
-        for key in plist:
-            self.progress.step()
-            none_handle = False
-            newlist = []
-            person = self.db.get_person_from_handle(key)
-            for pref in person.get_person_ref_list():
-                newlist.append(pref)
-                if not pref.ref:
-                    none_handle = True
-                    pref.ref = create_id()
-                try:
-                    self.db.get_person_from_handle(pref.ref)
-                except HandleError:
-                    # The referenced person does not exist in the database
-                    make_unknown(
-                        pref.ref,
-                        self.explanation.handle,
-                        self.class_person,
-                        self.commit_person,
-                        self.trans,
-                    )
-                    self.invalid_person_references.add(key)
-            if none_handle:
-                person.set_person_ref_list(newlist)
-                self.db.commit_person(person, self.trans)
-
-        if len(self.invalid_person_references) == 0:
-            logging.info("    OK: no event problems found")
-
-    def check_family_references(self):
-        """Looking for family reference problems"""
-        plist = self.db.get_person_handles()
-
-        self.progress.set_pass(_("Looking for family reference problems"), len(plist))
-        logging.info("Looking for family reference problems")
+                references = get_raw_references(class_name, data, empty=True)
+
+                for ref_class in ref_classes[class_name]:
+                    start = time.perf_counter()
+                    known = known_handles[ref_class]
+                    for item in references:
+                        if item[0] == ref_class:
+                            if not item[1]:
+                                if ref_class in EMPTY_REFERENCE_CHECKS:
+                                    empty_references[(class_name, handle)].append(
+                                        ref_class
+                                    )
+                            elif item[1] not in known:
+                                if ref_class in REFERRER_CHECKS:
+                                    missing[ref_class].setdefault(
+                                        item[1], (class_name, handle, data[1])
+                                    )
+                                else:
+                                    self.invalid_references(ref_class).add(item[1])
+                    self.add_time(self.check_name(ref_class), start)
+
+                if class_name == "Note":
+                    start = time.perf_counter()
+                    for link in Note.create(data).get_links():
+                        if link[0] == "gramps":
+                            linked_notes.append(handle)
+                            break
+                    self.add_time("check_note_links", start)
+
+                start = time.perf_counter()
+                if backlink_map is None:
+                    blinks = list(self.db.find_backlink_handles(handle))
+                else:
+                    blinks = backlink_map.get(handle, [])
+                db_blinks[(class_name, handle)] = blinks
+                for item in references:
+                    my_blinks[item].append((class_name, handle))
+                self.add_time("check_backlinks", start)
+
+        self.fix_empty_references(empty_references, missing)
+        self.fix_missing_references(missing)
+        start = time.perf_counter()
+        removed = self.fix_note_links(linked_notes)
+        self.add_time("check_note_links", start)
+        start = time.perf_counter()
+        self.compare_backlinks(my_blinks, db_blinks, removed)
+        self.add_time("check_backlinks", start)
+
+    @staticmethod
+    def check_name(ref_class):
+        """
+        Return the name under which the time spent checking the references
+        to a class is reported.
+        """
+        if ref_class == "Repository":
+            return "check_repo_references"
+        return "check_%s_references" % ref_class.lower()
 
-        for key in plist:
-            self.progress.step()
-            person = self.db.get_person_from_handle(key)
-            for ordinance in person.get_lds_ord_list():
-                family_handle = ordinance.get_family_handle()
-                if family_handle:
-                    try:
-                        self.db.get_family_from_handle(family_handle)
-                    except HandleError:
-                        # The referenced family does not exist in the database
-                        make_unknown(
-                            family_handle,
-                            self.explanation.handle,
-                            self.class_family,
-                            self.commit_family,
-                            self.trans,
-                            db=self.db,
+    def invalid_references(self, ref_class):
+        """
+        Return the set of the missing objects of a class checked by
+        check_references, or of the objects referring to them for the
+        REFERRER_CHECKS classes.
+        """
+        return {
+            "Person": self.invalid_person_references,
+            "Family": self.invalid_family_references,
+            "Place": self.invalid_place_references,
+            "Source": self.invalid_source_references,
+            "Repository": self.invalid_repo_references,
+            "Citation": self.invalid_citation_references,
+            "Media": self.invalid_media_references,
+            "Note": self.invalid_note_references,
+            "Tag": self.invalid_tag_references,
+        }[ref_class]
+
+    def fix_empty_references(self, empty_references, missing):
+        """
+        Replace the empty references found by check_references with
+        references to new objects, which are created by
+        fix_missing_references.
+        """
+        for (class_name, handle), ref_classes in empty_references.items():
+            obj = self.db.method("get_%s_from_handle", class_name)(handle)
+            for ref_class in ref_classes:
+                if ref_class in REFERRER_CHECKS:
+                    for new_handle in self.replace_empty_refs(obj, ref_class):
+                        missing[ref_class][new_handle] = (
+                            class_name,
+                            handle,
+                            obj.gramps_id,
                         )
-                        self.invalid_family_references.add(key)
+                    continue
+                new_handle = create_id()
+                getattr(obj, "replace_%s_references" % ref_class.lower())(
+                    None, new_handle
+                )
+                self.invalid_references(ref_class).add(new_handle)
+            self.db.method("commit_%s", class_name)(obj, self.trans)
 
-        if len(self.invalid_family_references) == 0:
-            logging.info("    OK: no event problems found")
+    @staticmethod
+    def replace_empty_refs(obj, ref_class):
+        """
+        Give new handles to the empty person, place and repository
+        references of an object, or to the empty source of a citation.
 
-    def check_repo_references(self):
-        """Looking for repository reference problems"""
-        slist = self.db.get_source_handles()
+        :returns: the new handles.
+        :rtype: list
+        """
+        if ref_class == "Source":
+            obj.set_reference_handle(create_id())
+            return [obj.get_reference_handle()]
+        if ref_class == "Person":
+            ref_list = obj.get_person_ref_list()
+        elif ref_class == "Place":
+            ref_list = obj.get_placeref_list()
+        else:
+            ref_list = obj.get_reporef_list()
+        new_handles = []
+        for ref in ref_list:
+            if not ref.ref:
+                ref.ref = create_id()
+                new_handles.append(ref.ref)
+        return new_handles
+
+    def fix_missing_references(self, missing):
+        """
+        Create the missing objects found by check_references.
 
-        self.progress.set_pass(
-            _("Looking for repository reference problems"), len(slist)
+        :param missing: for each of the REFERRER_CHECKS classes, the
+                        (class_name, handle, gramps_id) of the first object
+                        found referring to each missing object.
+        :type missing: dict
+        """
+        self.make_unknown_objects(
+            "Person", self.class_person, self.commit_person, missing
         )
-        logging.info("Looking for repository reference problems")
-
-        for key in slist:
-            self.progress.step()
-            none_handle = False
-            newlist = []
-            source = self.db.get_source_from_handle(key)
-            for reporef in source.get_reporef_list():
-                newlist.append(reporef)
-                if not reporef.ref:
-                    none_handle = True
-                    reporef.ref = create_id()
-                try:
-                    self.db.get_repository_from_handle(reporef.ref)
-                except HandleError:
-                    # The referenced repository does not exist in the database
-                    make_unknown(
-                        reporef.ref,
-                        self.explanation.handle,
-                        self.class_repo,
-                        self.commit_repo,
-                        self.trans,
-                    )
-                    self.invalid_repo_references.add(key)
-            if none_handle:
-                source.set_reporef_list(newlist)
-                self.db.commit_source(source, self.trans)
-
-        if len(self.invalid_repo_references) == 0:
-            logging.info("    OK: no repository reference problems found")
-
-    def check_place_references(self):
-        """Looking for place reference problems"""
-        plist = self.db.get_person_handles()
-        flist = self.db.get_family_handles()
-        elist = self.db.get_event_handles()
-        llist = self.db.get_place_handles()
-        self.progress.set_pass(
-            _("Looking for place reference problems"),
-            len(elist) + len(plist) + len(flist) + len(llist),
+        self.make_unknown_objects(
+            "Family", self.class_family, self.commit_family, missing
         )
-        logging.info("Looking for place reference problems")
-
-        for key in llist:
-            self.progress.step()
-            none_handle = False
-            newlist = []
-            place = self.db.get_place_from_handle(key)
-            for placeref in place.get_placeref_list():
-                newlist.append(placeref)
-                if not placeref.ref:
-                    none_handle = True
-                    placeref.ref = create_id()
-                try:
-                    self.db.get_place_from_handle(placeref.ref)
-                except HandleError:
-                    # The referenced place does not exist in the database
-                    make_unknown(
-                        placeref.ref,
-                        self.explanation.handle,
-                        self.class_place,
-                        self.commit_place,
-                        self.trans,
-                    )
-                    logging.warning(
-                        '    FAIL: the place "%(gid)s" refers '
-                        'to a parent place "%(hand)s" which '
-                        "does not exist in the database",
-                        {"gid": place.gramps_id, "hand": placeref.ref},
-                    )
-                    self.invalid_place_references.add(key)
-            if none_handle:
-                place.set_placeref_list(newlist)
-                self.db.commit_place(place, self.trans)
-
-        # check persons -> the LdsOrd references a place
-        for key in plist:
-            self.progress.step()
-            person = self.db.get_person_from_handle(key)
-            for ordinance in person.lds_ord_list:
-                place_handle = ordinance.get_place_handle()
-                if place_handle:
-                    try:
-                        place = self.db.get_place_from_handle(place_handle)
-                    except HandleError:
-                        # The referenced place does not exist in the database
-                        # This is tested by TestcaseGenerator person "Broken17"
-                        # This is tested by TestcaseGenerator person "Broken18"
-                        make_unknown(
-                            place_handle,
-                            self.explanation.handle,
-                            self.class_place,
-                            self.commit_place,
-                            self.trans,
-                        )
-                        logging.warning(
-                            '    FAIL: the person "%(gid)s" refers'
-                            ' to an LdsOrd place "%(hand)s" which '
-                            "does not exist in the database",
-                            {"gid": person.gramps_id, "hand": place_handle},
-                        )
-                        self.invalid_place_references.add(key)
-        # check families -> the LdsOrd references a place
-        for key in flist:
-            self.progress.step()
-            family = self.db.get_family_from_handle(key)
-            for ordinance in family.lds_ord_list:
-                place_handle = ordinance.get_place_handle()
-                if place_handle:
-                    try:
-                        place = self.db.get_place_from_handle(place_handle)
-                    except HandleError:
-                        # The referenced place does not exist in the database
-                        make_unknown(
-                            place_handle,
-                            self.explanation.handle,
-                            self.class_place,
-                            self.commit_place,
-                            self.trans,
-                        )
-                        logging.warning(
-                            '    FAIL: the family "%(gid)s" refers'
-                            ' to an LdsOrd place "%(hand)s" which '
-                            "does not exist in the database",
-                            {"gid": family.gramps_id, "hand": place_handle},
-                        )
-                        self.invalid_place_references.add(key)
-        # check events
-        for key in elist:
-            self.progress.step()
-            event = self.db.get_event_from_handle(key)
-            place_handle = event.get_place_handle()
-            if place_handle:
-                try:
-                    place = self.db.get_place_from_handle(place_handle)
-                except HandleError:
-                    # The referenced place does not exist in the database
-                    make_unknown(
-                        place_handle,
-                        self.explanation.handle,
-                        self.class_place,
-                        self.commit_place,
-                        self.trans,
-                    )
-                    logging.warning(
-                        '    FAIL: the event "%(gid)s" refers '
-                        'to an LdsOrd place "%(hand)s" which '
-                        "does not exist in the database",
-                        {"gid": event.gramps_id, "hand": place_handle},
-                    )
-                    self.invalid_place_references.add(key)
-
-        if len(self.invalid_place_references) == 0:
-            logging.info("    OK: no place reference problems found")
-
-    def check_citation_references(self):
-        """Looking for citation reference problems"""
-        known_handles = self.db.get_citation_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_repositories()
+        self.make_unknown_objects("Place", self.class_place, self.commit_place, missing)
+        self.make_unknown_objects(
+            "Source", self.class_source, self.commit_source, missing
         )
 
-        self.progress.set_pass(_("Looking for citation reference problems"), total)
-        logging.info("Looking for citation reference problems")
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_citation_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_citation_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_citation_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_citation_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repository = self.db.get_repository_from_handle(handle)
-            handle_list = repository.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        repository.replace_citation_references(None, new_handle)
-                        self.db.commit_repository(repository, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_citation_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Citation":
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_citation_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
+        start = time.perf_counter()
         for bad_handle in self.invalid_citation_references:
             created = make_unknown(
                 bad_handle,
@@ -1809,145 +1639,9 @@ class CheckIntegrity:
 
         if len(self.invalid_citation_references) == 0:
             logging.info("   OK: no citation reference problems found")
+        self.add_time("check_citation_references", start)
 
-    def check_source_references(self):
-        """Looking for source reference problems"""
-        clist = self.db.get_citation_handles()
-        self.progress.set_pass(_("Looking for source reference problems"), len(clist))
-        logging.info("Looking for source reference problems")
-
-        for key in clist:
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(key)
-            source_handle = citation.get_reference_handle()
-            if not source_handle:
-                source_handle = create_id()
-                citation.set_reference_handle(source_handle)
-                self.db.commit_citation(citation, self.trans)
-            if source_handle:
-                try:
-                    self.db.get_source_from_handle(source_handle)
-                except HandleError:
-                    # The referenced source does not exist in the database
-                    make_unknown(
-                        source_handle,
-                        self.explanation.handle,
-                        self.class_source,
-                        self.commit_source,
-                        self.trans,
-                    )
-                    logging.warning(
-                        '    FAIL: the citation "%(gid)s" refers '
-                        'to source "%(hand)s" which does not exist'
-                        " in the database",
-                        {"gid": citation.gramps_id, "hand": source_handle},
-                    )
-                    self.invalid_source_references.add(key)
-        if len(self.invalid_source_references) == 0:
-            logging.info("   OK: no source reference problems found")
-
-    def check_media_references(self):
-        """Looking for media object reference problems"""
-        known_handles = self.db.get_media_handles(False)
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-        )
-
-        self.progress.set_pass(
-            _("Looking for media object reference " "problems"), total
-        )
-        logging.info("Looking for media object reference problems")
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Media":
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_media_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Media":
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_media_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Media":
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_media_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Media":
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_media_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Media":
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_media_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Media":
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_media_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
+        start = time.perf_counter()
         for bad_handle in self.invalid_media_references:
             make_unknown(
                 bad_handle,
@@ -1959,10 +1653,13 @@ class CheckIntegrity:
 
         if len(self.invalid_media_references) == 0:
             logging.info("    OK: no media reference problems found")
+        self.add_time("check_media_references", start)
 
-    def check_note_references(self):
-        """Looking for note reference problems"""
-        # Here I assume check note_references runs after all the next checks.
+        self.make_unknown_objects(
+            "Repository", self.class_repo, self.commit_repo, missing
+        )
+
+        start = time.perf_counter()
         missing_references = (
             len(self.invalid_person_references)
             + len(self.invalid_family_references)
@@ -1978,134 +1675,6 @@ class CheckIntegrity:
         if missing_references:
             self.db.add_note(self.explanation, self.trans, set_gid=True)
 
-        known_handles = self.db.get_note_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_repositories()
-        )
-
-        self.progress.set_pass(_("Looking for note reference problems"), total)
-        logging.info("Looking for note reference problems")
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_note_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_note_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_note_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_note_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_note_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_note_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_note_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repo = self.db.get_repository_from_handle(handle)
-            handle_list = repo.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Note":
-                    if not item[1]:
-                        new_handle = create_id()
-                        repo.replace_note_references(None, new_handle)
-                        self.db.commit_repository(repo, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
         for bad_handle in self.invalid_note_references:
             make_unknown(
                 bad_handle,
@@ -2120,6 +1689,180 @@ class CheckIntegrity:
         else:
             if not missing_references:
                 self.db.add_note(self.explanation, self.trans, set_gid=True)
+        self.add_time("check_note_references", start)
+
+        start = time.perf_counter()
+        for bad_handle in self.invalid_tag_references:
+            make_unknown(bad_handle, None, self.class_tag, self.commit_tag, self.trans)
+
+        if len(self.invalid_tag_references) == 0:
+            logging.info("   OK: no tag reference problems found")
+        self.add_time("check_tag_references", start)
+
+    def make_unknown_objects(self, ref_class, class_func, commit_func, missing):
+        """
+        Create the missing objects of one of the REFERRER_CHECKS classes,
+        counting the objects referring to them.
+        """
+        start = time.perf_counter()
+        invalid = self.invalid_references(ref_class)
+        for bad_handle, (class_name, handle, gramps_id) in missing[ref_class].items():
+            make_unknown(
+                bad_handle,
+                self.explanation.handle,
+                class_func,
+                commit_func,
+                self.trans,
+                db=self.db,
+            )
+            logging.warning(
+                '    FAIL: the %(cls)s "%(gid)s" refers to the %(cls2)s '
+                '"%(hand)s" which does not exist in the database',
+                {
+                    "cls": class_name.lower(),
+                    "gid": gramps_id,
+                    "cls2": ref_class.lower(),
+                    "hand": bad_handle,
+                },
+            )
+            invalid.add(handle)
+
+        if len(invalid) == 0:
+            logging.info("    OK: no %s reference problems found", ref_class.lower())
+        self.add_time(self.check_name(ref_class), start)
+
+    def fix_note_links(self, handles):
+        """
+        look for missing links in Notes StyledTextTags
+
+        :param handles: handles of the notes with links to objects.
+        :type handles: list
+        :returns: the (class_name, handle) tuples of the removed links.
+        :rtype: set
+        """
+        removed = set()
+        self.progress.set_pass(_("Checking for bad links in Notes"), len(handles))
+        for handle in handles:
+            self.progress.step()
+            note = self.db.get_note_from_handle(handle)
+            text = note.text
+            new_tags = []
+            for tag in text.get_tags():
+                bad_tag = False
+                if tag.name == StyledTextTagType.LINK:
+                    if tag.value.startswith("gramps://"):
+                        obj_class, prop, value = tag.value[9:].split("/")
+                        if prop == "handle":
+                            if not self.db.method("has_%s_handle", obj_class)(value):
+                                bad_tag = True
+                        elif prop == "gramps_id":
+                            if not self.db.method("has_%s_gramps_id", obj_class)(value):
+                                bad_tag = True
+                if not bad_tag:
+                    # good link, need to keep it
+                    new_tags.append(tag)
+                else:
+                    logging.warning(
+                        "    FAIL: Bad Note Link found, " "%s: %s: %s",
+                        obj_class,
+                        prop,
+                        value,
+                    )
+                    self.bad_note_links += 1
+                    if prop == "handle":
+                        removed.add((obj_class, value))
+            if len(text.get_tags()) != len(new_tags):
+                text.set_tags(new_tags)
+                self.db.commit_note(note, self.trans)
+        return removed
+
+    def compare_backlinks(self, my_blinks, db_blinks, removed):
+        """
+        Compare the references of the objects read by check_references with
+        the backlinks of the database.
+
+        :param my_blinks: lists of (class_name, handle) tuples of the
+                          objects holding each (class_name, handle)
+                          reference.
+        :type my_blinks: dict
+        :param db_blinks: lists of the backlinks of the database of each
+                          (class_name, handle) object.
+        :type db_blinks: dict
+        :param removed: (class_name, handle) references removed by the fixes.
+        :type removed: set
+        """
+        my_items = sum(len(blinks) for blinks in my_blinks.values())
+        db_items = sum(len(blinks) for blinks in db_blinks.values())
+        my_sets = {key: set(blinks) for key, blinks in my_blinks.items()}
+        db_sets = {key: set(blinks) for key, blinks in db_blinks.items()}
+
+        # Now we go through our backlinks and the dbs table comparing them
+        # check that each real reference has a backlink in the db table
+        self.progress.set_pass(
+            _("Looking for backlink reference problems") + " (2)", my_items
+        )
+        for key, blinks in my_blinks.items():
+            for item in blinks:
+                self.progress.step()
+                if key not in db_blinks:
+                    # object has reference to something not in db; the
+                    # empty and missing references found by the checks
+                    # have been fixed
+                    if (
+                        key[1]
+                        and key not in removed
+                        and not self.db.method("has_%s_handle", key[0])(key[1])
+                    ):
+                        logging.warning(
+                            "    Fail: reference to an object %(obj)s"
+                            " not in the db by %(ref)s!",
+                            {"obj": key, "ref": item},
+                        )
+                    continue
+                if item not in db_sets[key]:
+                    # Object has reference with no cooresponding backlink
+                    self.bad_backlinks += 1
+                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
+                    logging.warning(
+                        '    FAIL: the "%(cls)s" [%(gid)s] '
+                        'has a "%(cls2)s" reference'
+                        " with no corresponding backlink.",
+                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
+                    )
+
+        # Now we go through the db table and make checks against ours
+        # Check for db backlinks that don't have a reference object at all
+        self.progress.set_pass(
+            _("Looking for backlink reference problems") + " (3)", db_items
+        )
+        for key, blinks in db_blinks.items():
+            for item in blinks:
+                self.progress.step()
+                if item not in db_blinks:
+                    # backlink to object entirely missing
+                    self.bad_backlinks += 1
+                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
+                    logging.warning(
+                        '    FAIL: the "%(cls)s" [%(gid)s] '
+                        "has a backlink to a missing"
+                        ' "%(cls2)s" object.',
+                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
+                    )
+                    continue
+                # Check if the object has a reference to the backlinked one
+                if key not in my_sets or item not in my_sets[key]:
+                    # backlink to object which doesn't have reference
+                    self.bad_backlinks += 1
+                    pri_obj = self.db.method("get_%s_from_handle", key[0])(key[1])
+                    logging.warning(
+                        '    FAIL: the "%(cls)s" [%(gid)s] '
+                        'has a backlink to a "%(cls2)s"'
+                        " with no corresponding reference.",
+                        {"gid": pri_obj.gramps_id, "cls": key[0], "cls2": item[0]},
+                    )
+
+    def callback(self, *args):
+        self.progress.step()
 
     def check_checksum(self):
         """fix media checksums"""
@@ -2136,157 +1879,6 @@ class CheckIntegrity:
                 obj.checksum = new_checksum
                 self.db.commit_media(obj, self.trans)
 
-    def check_tag_references(self):
-        """Looking for tag reference problems"""
-        known_handles = self.db.get_tag_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_notes()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_repositories()
-        )
-
-        self.progress.set_pass(_("Looking for tag reference problems"), total)
-        logging.info("Looking for tag reference problems")
-
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_tag_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_tag_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_tag_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_note_handles():
-            self.progress.step()
-            note = self.db.get_note_from_handle(handle)
-            handle_list = note.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        note.replace_tag_references(None, new_handle)
-                        self.db.commit_note(note, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_tag_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_tag_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_tag_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_tag_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repository = self.db.get_repository_from_handle(handle)
-            handle_list = repository.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == "Tag":
-                    if not item[1]:
-                        new_handle = create_id()
-                        repository.replace_tag_references(None, new_handle)
-                        self.db.commit_repository(repository, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for bad_handle in self.invalid_tag_references:
-            make_unknown(bad_handle, None, self.class_tag, self.commit_tag, self.trans)
-
-        if len(self.invalid_tag_references) == 0:
-            logging.info("   OK: no tag reference problems found")
-
     def check_media_sourceref(self):
         """
         This repairs a problem with database upgrade from database schema
@@ -2513,43 +2105,6 @@ class CheckIntegrity:
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
 
-    def check_note_links(self):
-        """
-        look for missing links in Notes StyledTextTags
-        """
-        self.progress.set_pass(
-            _("Checking for bad links in Notes"), len(self.db.get_note_handles())
-        )
-        for note in self.db.iter_notes():
-            self.progress.step()
-            text = note.text
-            new_tags = []
-            for tag in text.get_tags():
-                bad_tag = False
-                if tag.name == StyledTextTagType.LINK:
-                    if tag.value.startswith("gramps://"):
-                        obj_class, prop, value = tag.value[9:].split("/")
-                        if prop == "handle":
-                            if not self.db.method("has_%s_handle", obj_class)(value):
-                                bad_tag = True
-                        elif prop == "gramps_id":
-                            if not self.db.method("has_%s_gramps_id", obj_class)(value):
-                                bad_tag = True
-                if not bad_tag:
-                    # good link, need to keep it
-                    new_tags.append(tag)
-                else:
-                    logging.warning(
-                        "    FAIL: Bad Note Link found, " "%s: %s: %s",
-                        obj_class,
-                        prop,
-                        value,
-                    )
-                    self.bad_note_links += 1
-            if len(text.get_tags()) != new_tags:
-                text.set_tags(new_tags)
-                self.db.commit_note(note, self.trans)
-
     def class_person(self, handle):
         person = Person()
         person.set_handle(handle)
@@ -3070,6 +2625,14 @@ class CheckIntegrity:
 
         return errors
 
+    def build_timing_report(self):
+        """build the report of the time spent in each check"""
+        text = StringIO()
+        text.write(_("Time spent in each check:") + "\n")
+        for name, seconds in self.timings.items():
+            text.write("   %s: %.3f s\n" % (name, seconds))
+        return text.getvalue()
+
 
 # -------------------------------------------------------------------------
 #
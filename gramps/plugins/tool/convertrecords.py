@@ -0,0 +1,125 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Tools/Family Tree Repair/Convert Record Format"""
+
+# -------------------------------------------------------------------------
+#
+# python modules
+#
+# -------------------------------------------------------------------------
+import logging
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gui.plug import tool
+from gramps.gui.dialog import OkDialog
+from gramps.gen.db.serializer import SERIALIZERS
+
+_ = glocale.translation.gettext
+
+log = logging.getLogger(".ConvertRecords")
+
+
+# -------------------------------------------------------------------------
+#
+# ConvertRecords
+#
+# -------------------------------------------------------------------------
+class ConvertRecords(tool.Tool):
+    """
+    Rewrite all records of the family tree with the selected serializer.
+    """
+
+    def __init__(self, dbstate, user, options_class, name, callback=None):
+        uistate = user.uistate
+
+        tool.Tool.__init__(self, dbstate, options_class, name)
+
+        if self.db.readonly:
+            return
+
+        if not hasattr(self.db, "set_serializer"):
+            user.warn(
+                _("Record format not converted"),
+                _("The database backend does not support record formats."),
+            )
+            return
+
+        fmt = self.options.handler.options_dict["format"]
+        if fmt not in SERIALIZERS:
+            user.warn(
+                _("Record format not converted"),
+                _("Unknown record format: %s") % fmt,
+            )
+            return
+
+        self.db.disable_signals()
+
+        if uistate:
+            uistate.set_busy_cursor(True)
+            uistate.progress.show()
+            uistate.push_message(dbstate, _("Converting records..."))
+
+            self.db.set_serializer(fmt, uistate.pulse_progressbar)
+
+            uistate.set_busy_cursor(False)
+            uistate.progress.hide()
+            OkDialog(
+                _("Records converted"),
+                _("All records have been converted to the %s format.") % fmt,
+                parent=uistate.window,
+            )
+        else:
+            print("Converting records to the %s format..." % fmt)
+            self.db.set_serializer(fmt, None)
+            print("All records have been converted.")
+
+        self.db.enable_signals()
+        self.db.request_rebuild()
+
+
+# ------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------
+class ConvertRecordsOptions(tool.ToolOptions):
+    """
+    Defines options and provides handling interface.
+    """
+
+    def __init__(self, name, person_id=None):
+        tool.ToolOptions.__init__(self, name, person_id)
+
+        self.options_dict = {
+            "format": "marshal",
+        }
+        self.options_help = {
+            "format": (
+                "=str",
+                "Record format to convert to",
+                list(SERIALIZERS),
+            ),
+        }
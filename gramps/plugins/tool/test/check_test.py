@@ -0,0 +1,160 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the reference checks of the Check and Repair tool """
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import CLASS_TO_KEY_MAP
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.dbstate import DbState
+from gramps.gen.lib import LdsOrd, PersonRef, PlaceRef, RepoRef
+from gramps.gen.lib.rawrefs import get_raw_references
+from gramps.gen.user import User
+from ..check import CheckIntegrity
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+def corrupt(db):
+    """
+    Add missing and empty references to objects of the example tree.
+    """
+    with DbTxn("Corrupt", db) as trans:
+        person = db.get_person_from_gramps_id("I0001")
+        person.add_person_ref(PersonRef())
+        person.get_person_ref_list()[-1].ref = "MISSING_PERSON"
+        person.add_person_ref(PersonRef())
+        person.add_citation("MISSING_CITATION")
+        person.add_note("MISSING_NOTE")
+        db.commit_person(person, trans)
+
+        person = db.get_person_from_gramps_id("I0002")
+        ordinance = LdsOrd()
+        ordinance.set_family_handle("MISSING_FAMILY")
+        ordinance.set_place_handle("MISSING_PLACE")
+        person.add_lds_ord(ordinance)
+        db.commit_person(person, trans)
+
+        # the missing objects are counted by the first object referring to
+        # them only
+        person = db.get_person_from_gramps_id("I0003")
+        person.add_person_ref(PersonRef())
+        person.get_person_ref_list()[-1].ref = "MISSING_PERSON"
+        db.commit_person(person, trans)
+
+        family = db.get_family_from_gramps_id("F0001")
+        ordinance = LdsOrd()
+        ordinance.set_place_handle("MISSING_PLACE")
+        family.add_lds_ord(ordinance)
+        db.commit_family(family, trans)
+
+        event = db.get_event_from_gramps_id("E0001")
+        event.set_place_handle("MISSING_EVENT_PLACE")
+        db.commit_event(event, trans)
+
+        place = db.get_place_from_gramps_id("P0001")
+        placeref = PlaceRef()
+        placeref.ref = "MISSING_PARENT_PLACE"
+        place.add_placeref(placeref)
+        place.add_placeref(PlaceRef())
+        db.commit_place(place, trans)
+
+        citation = db.get_citation_from_gramps_id("C0001")
+        citation.set_reference_handle("MISSING_SOURCE")
+        db.commit_citation(citation, trans)
+        citation = db.get_citation_from_gramps_id("C0002")
+        citation.set_reference_handle(None)
+        db.commit_citation(citation, trans)
+
+        source = db.get_source_from_gramps_id("S0001")
+        reporef = RepoRef()
+        reporef.ref = "MISSING_REPOSITORY"
+        source.add_repo_reference(reporef)
+        source.add_repo_reference(RepoRef())
+        db.commit_source(source, trans)
+
+
+class CheckReferencesTest(unittest.TestCase):
+    """
+    Check and repair the references of a corrupted example tree.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        corrupt(cls.db)
+        dbstate = DbState()
+        dbstate.change_database_noclose(cls.db)
+        with DbTxn("Check Integrity", cls.db, batch=True) as trans:
+            cls.checker = CheckIntegrity(dbstate, None, trans)
+            cls.checker.check_references()
+        cls.checker.build_report()
+        cls.report = cls.checker.text.getvalue()
+
+    def test_report(self):
+        # the same counts as when each class was checked in its own pass
+        self.assertEqual(
+            self.report.splitlines(),
+            [
+                "1 person was referenced but not found",
+                "1 family was referenced but not found",
+                "1 repository was referenced but not found",
+                "3 places were referenced, but not found",
+                "1 citation was referenced but not found",
+                "3 sources were referenced, but not found",
+                "1 note object was referenced but not found",
+            ],
+        )
+
+    def get_handle(self, class_name, gramps_id):
+        return self.db.method("get_%s_from_gramps_id", class_name)(gramps_id).handle
+
+    def test_referrers(self):
+        self.assertEqual(
+            self.checker.invalid_person_references, {self.get_handle("Person", "I0001")}
+        )
+        self.assertEqual(
+            self.checker.invalid_place_references,
+            {
+                self.get_handle("Person", "I0002"),
+                self.get_handle("Event", "E0001"),
+                self.get_handle("Place", "P0001"),
+            },
+        )
+        self.assertEqual(
+            self.checker.invalid_repo_references, {self.get_handle("Source", "S0001")}
+        )
+
+    def test_repairs(self):
+        for class_name in CLASS_TO_KEY_MAP:
+            get_raw_data = self.db.method("get_raw_%s_data", class_name)
+            for handle in self.db.method("get_%s_handles", class_name)():
+                data = get_raw_data(handle)
+                for ref_class, ref in get_raw_references(class_name, data, True):
+                    self.assertTrue(self.db.method("has_%s_handle", ref_class)(ref))
+
+
+if __name__ == "__main__":
+    unittest.main()
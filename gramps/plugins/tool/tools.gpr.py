@@ -177,7 +177,7 @@ register(
     category=TOOL_DBPROC,
     toolclass="DuplicatePeopleTool",
     optionclass="DuplicatePeopleToolOptions",
-    tool_modes=[TOOL_MODE_GUI],
+    tool_modes=[TOOL_MODE_GUI, TOOL_MODE_CLI],
 )
 
 # ------------------------------------------------------------------------
@@ -322,6 +322,31 @@ register(
     tool_modes=[TOOL_MODE_GUI, TOOL_MODE_CLI],
 )
 
+# ------------------------------------------------------------------------
+#
+# Convert Record Format
+#
+# ------------------------------------------------------------------------
+
+register(
+    TOOL,
+    id="convert_records",
+    name=_("Convert Record Format"),
+    description=_(
+        "Rewrites all records of the family tree in the selected storage format"
+    ),
+    version="1.0",
+    gramps_target_version=MODULE_VERSION,
+    status=STABLE,
+    fname="convertrecords.py",
+    authors=["The Gramps project"],
+    authors_email=["http://gramps-project.org"],
+    category=TOOL_DBFIX,
+    toolclass="ConvertRecords",
+    optionclass="ConvertRecordsOptions",
+    tool_modes=[TOOL_MODE_GUI, TOOL_MODE_CLI],
+)
+
 # ------------------------------------------------------------------------
 #
 # Rebuild Gender Statistics
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+
+"""
+Measure the speed of the CSV import.
+
+Writes a synthetic CSV file of places and imports it into an empty family
+tree, then writes a synthetic CSV file of people, whose birth and death
+places and sources are given by their titles, and imports it into the same
+family tree.  Reports the rows per second of both imports.
+
+Usage::
+
+    python3 test/benchmark/csv_benchmark.py [people] [places]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from gramps.gen.db.utils import import_from_filename, make_database
+from gramps.gen.user import User
+
+
+def write_places(filename, places):
+    """
+    Write a CSV file of places.
+    """
+    with open(filename, "w", encoding="utf-8", newline="") as ofile:
+        writer = csv.writer(ofile)
+        writer.writerow(["Place", "Title", "Name", "Type"])
+        for index in range(places):
+            title = f"Town{index}"
+            writer.writerow([f"P{index}", title, title, "City"])
+
+
+def write_people(filename, people, places):
+    """
+    Write a CSV file of people, with places and sources given by their titles.
+    Some of the places are not in the file of places.
+    """
+    with open(filename, "w", encoding="utf-8", newline="") as ofile:
+        writer = csv.writer(ofile)
+        writer.writerow(
+            [
+                "Person",
+                "Surname",
+                "Given",
+                "Gender",
+                "Birth date",
+                "Birth place",
+                "Birth source",
+                "Death date",
+                "Death place",
+            ]
+        )
+        for index in range(people):
+            writer.writerow(
+                [
+                    f"I{index}",
+                    f"Surname{index % 500}",
+                    f"Given{index}",
+                    "male" if index % 2 else "female",
+                    f"{1800 + index % 100}-01-{1 + index % 28:02d}",
+                    f"Town{index % (places + places // 10 + 1)}",
+                    f"Parish register {index % 100}",
+                    f"{1860 + index % 100}",
+                    f"Town{(7 * index) % (places + 1)}",
+                ]
+            )
+
+
+def timed_import(db, filename, rows):
+    """
+    Import a file into the database and print its rows per second.
+    """
+    start = time.perf_counter()
+    if not import_from_filename(db, filename, User()):
+        sys.exit(f"{filename} could not be imported")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{os.path.basename(filename):<12}{rows:>10}{elapsed:>12.3f}"
+        f"{rows / elapsed:>12.0f}"
+    )
+
+
+def main(people, places):
+    db = make_database("sqlite")
+    db.load(":memory:")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        places_csv = os.path.join(tmpdir, "places.csv")
+        people_csv = os.path.join(tmpdir, "people.csv")
+        write_places(places_csv, places)
+        write_people(people_csv, people, places)
+        print(f"{'file':<12}{'rows':>10}{'time (s)':>12}{'rows/s':>12}")
+        timed_import(db, places_csv, places)
+        timed_import(db, people_csv, people)
+    print(
+        f"{db.get_number_of_people()} people, {db.get_number_of_places()} "
+        f"places, {db.get_number_of_sources()} sources"
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50000,
+    )
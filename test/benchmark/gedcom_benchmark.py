@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+
+"""
+Measure the speed of the GEDCOM import front end.
+
+Writes a synthetic GEDCOM file of about the given number of lines (by
+default one million) and reports the lines per second of the first stage
+of the import, and of the reading of all lines of the file through the
+lexer, as done by the GEDCOM parser.
+
+Usage::
+
+    python3 test/benchmark/gedcom_benchmark.py [lines] [repeat]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from gramps.plugins.lib.libgedcom import GedcomStageOne, Lexer, UTF8Reader
+
+HEADER = """0 HEAD
+1 SOUR Benchmark
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR UTF-8
+"""
+
+PERSON = """0 @I{0}@ INDI
+1 NAME Given{0} /Surname{1}/
+2 GIVN Given{0}
+2 SURN Surname{1}
+1 SEX {2}
+1 BIRT
+2 DATE {3} JAN 18{4:02d}
+2 PLAC Town{1}, County, Country
+1 DEAT
+2 DATE ABT 19{4:02d}
+1 OCCU Farmer
+1 NOTE A note about person {0}, long enough to be continued on
+2 CONC  a second line,
+2 CONT and on a third line with an escaped @@ sign.
+1 FAMS @F{0}@
+"""
+
+FAMILY = """0 @F{0}@ FAM
+1 HUSB @I{0}@
+1 WIFE @I{1}@
+1 CHIL @I{2}@
+1 MARR
+2 DATE 12 JUN 18{3:02d}
+"""
+
+
+def write_gedcom(filename, lines):
+    """
+    Write a GEDCOM file of about the given number of lines.
+    """
+    count = 0
+    with open(filename, "w", encoding="utf-8") as ofile:
+        ofile.write(HEADER)
+        while count * 20 < lines:
+            ofile.write(
+                PERSON.format(
+                    count, count % 500, "MF"[count % 2], 1 + count % 28, count % 100
+                )
+            )
+            ofile.write(FAMILY.format(count, count + 1, count + 2, count % 100))
+            count += 1
+        ofile.write("0 TRLR\n")
+
+
+def stage_one(filename):
+    """
+    Run the first stage of the import.
+    """
+    with open(filename, "rb") as ifile:
+        GedcomStageOne(ifile).parse()
+
+
+def lexer(filename):
+    """
+    Read all lines of the file through the lexer, return their number.
+    """
+    errors = []
+    count = 0
+    with open(filename, "rb") as ifile:
+        lex = Lexer(UTF8Reader(ifile, errors.append, "UTF-8"), errors.append)
+        while lex.readline():
+            count += 1
+        lex.clean_up()
+    return count
+
+
+def timed(func, repeat):
+    """
+    Return the best time of repeat calls of func.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(lines, repeat):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "benchmark.ged")
+        write_gedcom(filename, lines)
+        with open(filename, "rb") as ifile:
+            total = sum(1 for _line in ifile)
+        print(f"{total} lines, {lexer(filename)} lines with their CONT and CONC")
+        print(f"{'stage':<12}{'time (s)':>12}{'lines/s':>12}")
+        results = []
+        for label, func in (("stage one", stage_one), ("lexer", lexer)):
+            elapsed = timed(lambda: func(filename), repeat)
+            results.append(elapsed)
+            print(f"{label:<12}{elapsed:>12.3f}{total / elapsed:>12.0f}")
+        elapsed = sum(results)
+        print(f"{'total':<12}{elapsed:>12.3f}{total / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+    )
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Measure the time saved by lazy objects when applying person filters.
+
+Imports a Gramps XML file (by default example/gramps/example.gramps) and
+reports, for a few filters, the time taken by GenericFilter.apply with lazy
+objects and with fully unpacked objects.
+
+Usage::
+
+    python3 test/benchmark/lazy_benchmark.py [file.gramps] [repeat]
+"""
+
+import os
+import sys
+import time
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.filters import GenericFilter
+from gramps.gen.filters.rules.person import (
+    HasNameOf,
+    HasTag,
+    IsFemale,
+    IsMale,
+    RegExpIdOf,
+)
+from gramps.gen.lib import Person
+from gramps.gen.user import User
+
+EXAMPLE = os.path.join(DATA_DIR, "..", "example", "gramps", "example.gramps")
+
+FILTERS = [
+    ("IsMale", [IsMale([])]),
+    ("IsFemale + RegExpIdOf", [IsFemale([]), RegExpIdOf(["I0.*"], use_regex=True)]),
+    ("HasTag", [HasTag(["ToDo"])]),
+    ("HasNameOf", [HasNameOf(["", "Garner"] + [""] * 9)]),
+]
+
+
+class FullPerson(Person):
+    """
+    A Person without a lazy subclass, so that filters unpack it in full.
+    """
+
+
+class FullFilter(GenericFilter):
+    """
+    A filter which applies its rules to fully unpacked objects.
+    """
+
+    def make_obj(self):
+        return FullPerson()
+
+
+def best_time(func, repeat):
+    """
+    Return the best time of repeat calls of func.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main(filename, repeat):
+    db = import_as_dict(filename, User())
+    print(f"{db.get_number_of_people()} people from {filename}")
+    print(f"{'filter':<24}{'matches':>8}{'full (s)':>12}{'lazy (s)':>12}")
+    for name, rules in FILTERS:
+        lazy = GenericFilter()
+        full = FullFilter()
+        for rule in rules:
+            lazy.add_rule(rule)
+            full.add_rule(rule)
+        matches = lazy.apply(db)
+        assert matches == full.apply(db)
+        full_time = best_time(lambda: full.apply(db), repeat)
+        lazy_time = best_time(lambda: lazy.apply(db), repeat)
+        print(f"{name:<24}{len(matches):>8}{full_time:>12.4f}{lazy_time:>12.4f}")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.normpath(EXAMPLE),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+
+"""
+Compare the extraction of the references of primary objects from their
+objects and from their serialized data.
+
+Reports the time needed to get the references of all primary objects of a
+Gramps XML file (by default example/gramps/example.gramps), by creating the
+objects and calling get_referenced_handles_recursively, and by reading the
+serialized data with get_raw_references.  Also reports the time of a
+rebuild of the reference map.
+
+Usage::
+
+    python3 test/benchmark/reference_benchmark.py [file.gramps] [repeat]
+"""
+
+import os
+import sys
+import time
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.dbconst import CLASS_TO_KEY_MAP, KEY_TO_NAME_MAP
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import (
+    Citation,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
+from gramps.gen.lib.rawrefs import get_raw_references
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi.dbapi import get_reference_rows
+
+EXAMPLE = os.path.join(DATA_DIR, "..", "example", "gramps", "example.gramps")
+
+CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        Person,
+        Family,
+        Event,
+        Place,
+        Source,
+        Citation,
+        Media,
+        Repository,
+        Note,
+        Tag,
+    )
+}
+
+
+def timed(func, repeat):
+    """
+    Return the best time of repeat calls of func.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(filename, repeat):
+    db = import_as_dict(filename, User())
+    records = {
+        name: [data for _handle, data in db.method("_iter_raw_%s_data", name)()]
+        for name in CLASS_TO_KEY_MAP
+    }
+    total = sum(len(items) for items in records.values())
+
+    def from_objects():
+        for name, items in records.items():
+            create = CLASSES[name].create
+            for data in items:
+                set(create(data).get_referenced_handles_recursively())
+
+    def from_data():
+        for name, items in records.items():
+            for data in items:
+                set(get_raw_references(name, data))
+
+    print(f"{filename}, {total} records")
+    print(f"{'method':<12}{'time (s)':>12}{'records/s':>12}")
+    for label, func in (("objects", from_objects), ("raw data", from_data)):
+        elapsed = timed(func, repeat)
+        print(f"{label:<12}{elapsed:>12.3f}{total / elapsed:>12.0f}")
+
+    rows = {}
+    for name, key in CLASS_TO_KEY_MAP.items():
+        db.dbapi.execute(f"SELECT handle, blob_data FROM {KEY_TO_NAME_MAP[key]}")
+        rows[name] = db.dbapi.fetchall()
+    elapsed = timed(
+        lambda: [
+            get_reference_rows(db.serializer.name, name, items)
+            for name, items in rows.items()
+        ],
+        repeat,
+    )
+    print(f"{'reindex rows':<12}{elapsed:>12.3f}{total / elapsed:>12.0f}")
+    elapsed = timed(lambda: db.reindex_reference_map(lambda percent: None), 1)
+    print(f"{'reindex':<12}{elapsed:>12.3f}{total / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.normpath(EXAMPLE),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+    )
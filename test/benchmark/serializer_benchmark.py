@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Compare the record serializers of the DB-API backends.
+
+Imports a Gramps XML file (by default example/gramps/example.gramps) and
+reports, for every serializer, the total encoded size of all primary objects
+and the time needed to encode and decode them.
+
+Usage::
+
+    python3 test/benchmark/serializer_benchmark.py [file.gramps] [repeat]
+"""
+
+import os
+import sys
+import time
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.dbconst import KEY_TO_NAME_MAP, REFERENCE_KEY
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from gramps.gen.db.serializer import SERIALIZERS
+
+EXAMPLE = os.path.join(DATA_DIR, "..", "example", "gramps", "example.gramps")
+
+
+def best_time(func, repeat):
+    """
+    Return the best time of repeat calls of func.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main(filename, repeat):
+    db = import_as_dict(filename, User())
+    records = []
+    for obj_key in KEY_TO_NAME_MAP:
+        if obj_key != REFERENCE_KEY:
+            records += [data for _, data in db._iter_raw_data(obj_key)]
+    print(f"{len(records)} records from {filename}")
+    print(f"{'format':<10}{'size (bytes)':>14}{'encode (s)':>12}{'decode (s)':>12}")
+    for name, serializer in SERIALIZERS.items():
+        blobs = [serializer.dumps(data) for data in records]
+        size = sum(len(blob) for blob in blobs)
+        encode = best_time(lambda: [serializer.dumps(data) for data in records], repeat)
+        decode = best_time(lambda: [serializer.loads(blob) for blob in blobs], repeat)
+        print(f"{name:<10}{size:>14}{encode:>12.4f}{decode:>12.4f}")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.normpath(EXAMPLE),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Compare the tuning profiles of the SQLite backend.
+
+For every profile, creates a family tree in a temporary directory and
+reports the time needed to import a Gramps XML file (by default
+example/gramps/example.gramps) in a batch transaction, to commit people one
+transaction at a time, and to read all people and families with the record
+cache disabled.
+
+Usage::
+
+    python3 test/benchmark/sqlite_profile_benchmark.py [file.gramps] [commits]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict, import_from_filename, make_database
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi.sqlite import PROFILES
+
+EXAMPLE = os.path.join(DATA_DIR, "..", "example", "gramps", "example.gramps")
+
+
+def timed(func):
+    """
+    Return the time of a call of func.
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_profile(name, filename, commits):
+    """
+    Return the import, commit and read times with a profile.
+    """
+    config.set("database.sqlite-profile", name)
+    with tempfile.TemporaryDirectory() as directory:
+        db = make_database("sqlite")
+        db.load(directory)
+        db.cache.set_max_size(0)
+        import_time = timed(lambda: import_from_filename(db, filename, User()))
+
+        handles = db.get_person_handles()
+
+        def commit():
+            for handle in handles[:commits]:
+                person = db.get_person_from_handle(handle)
+                with DbTxn("Edit", db) as trans:
+                    db.commit_person(person, trans)
+
+        def read():
+            for handle in handles:
+                db.get_person_from_handle(handle)
+            for handle in db.get_family_handles():
+                db.get_family_from_handle(handle)
+
+        commit_time = timed(commit)
+        read_time = timed(read)
+        db.close(update=False)
+    return import_time, commit_time, read_time
+
+
+def main(filename, commits):
+    saved = config.get("database.sqlite-profile")
+    # Load the importer plugins before anything is timed.
+    import_as_dict(filename, User())
+    print(f"{filename}, {commits} single commits")
+    print(f"{'profile':<14}{'import (s)':>12}{'commits/s':>12}{'read (s)':>12}")
+    try:
+        for name in PROFILES:
+            import_time, commit_time, read_time = run_profile(name, filename, commits)
+            print(
+                f"{name:<14}{import_time:>12.3f}"
+                f"{commits / commit_time:>12.0f}{read_time:>12.3f}"
+            )
+    finally:
+        config.set("database.sqlite-profile", saved)
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.normpath(EXAMPLE),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+
+"""
+Measure the speed of the Gramps XML export.
+
+Fills an empty family tree with synthetic people, each with a birth event
+and a note, and with a family for every two people, then exports it to
+Gramps XML files, uncompressed and compressed.  Reports the objects and
+megabytes per second of both exports.
+
+Usage::
+
+    python3 test/benchmark/xml_export_benchmark.py [people] [repeat]
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    Name,
+    Note,
+    Person,
+    Surname,
+)
+from gramps.gen.user import User
+from gramps.plugins.export.exportxml import XmlWriter
+
+
+def fill_database(db, people):
+    """
+    Add the synthetic people, with their events, notes and families.
+    """
+    with DbTxn("Benchmark", db, batch=True) as trans:
+        father = None
+        for index in range(people):
+            event = Event()
+            event.set_type(EventType.BIRTH)
+            event.set_date_object(Date(1800 + index % 100, 1 + index % 12, 1))
+            event.set_description(f"Birth of Given{index} <{index}> & co")
+            db.add_event(event, trans)
+            note = Note(f'A note about person {index}, with an "escaped" text.')
+            db.add_note(note, trans)
+            surname = Surname()
+            surname.set_surname(f"Surname{index % 500}")
+            name = Name()
+            name.set_first_name(f"Given{index}")
+            name.add_surname(surname)
+            person = Person()
+            person.set_primary_name(name)
+            person.set_gender(index % 2)
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event.handle)
+            person.add_event_ref(event_ref)
+            person.set_birth_ref(event_ref)
+            person.add_note(note.handle)
+            db.add_person(person, trans)
+            if father is None:
+                father = person
+                continue
+            family = Family()
+            family.set_father_handle(father.handle)
+            family.set_mother_handle(person.handle)
+            db.add_family(family, trans)
+            father = None
+
+
+def timed_export(db, filename, compress, objects, repeat):
+    """
+    Export the database repeat times and print the best speed.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if not XmlWriter(db, User(), 0, compress).write(filename):
+            sys.exit(f"{filename} could not be written")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    with open(filename, "rb") as ifile:
+        data = ifile.read()
+    if compress:
+        data = gzip.decompress(data)
+    label = "compressed" if compress else "plain"
+    print(
+        f"{label:<12}{best:>12.3f}{objects / best:>12.0f}"
+        f"{len(data) / best / 1e6:>12.1f}"
+    )
+
+
+def main(people, repeat):
+    db = make_database("sqlite")
+    db.load(":memory:")
+    fill_database(db, people)
+    objects = (
+        db.get_number_of_people()
+        + db.get_number_of_events()
+        + db.get_number_of_notes()
+        + db.get_number_of_families()
+    )
+    print(f"{objects} objects")
+    print(f"{'export':<12}{'time (s)':>12}{'objects/s':>12}{'MB/s':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "benchmark.gramps")
+        for compress in (False, True):
+            timed_export(db, filename, compress, objects, repeat)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+    )
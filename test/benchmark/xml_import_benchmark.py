@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+
+"""
+Measure the speed of the Gramps XML import.
+
+Exports the synthetic family tree of xml_export_benchmark.py to a Gramps
+XML file, then imports it into an empty family tree, and a second time into
+the same family tree, where all its ids are in use.  Reports the objects per
+second of both imports.
+
+Usage::
+
+    python3 test/benchmark/xml_import_benchmark.py [people]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from gramps.gen.db.utils import import_from_filename, make_database
+from gramps.gen.user import User
+from gramps.plugins.export.exportxml import XmlWriter
+from xml_export_benchmark import fill_database
+
+
+def timed_import(db, filename, label, objects):
+    """
+    Import a file into the database and print its objects per second.
+    """
+    start = time.perf_counter()
+    if not import_from_filename(db, filename, User()):
+        sys.exit(f"{filename} could not be imported")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{elapsed:>12.3f}{objects / elapsed:>12.0f}")
+
+
+def main(people):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "benchmark.gramps")
+        db = make_database("sqlite")
+        db.load(":memory:")
+        fill_database(db, people)
+        XmlWriter(db, User(), 0, False).write(filename)
+        objects = db.get_total()
+        db.close()
+        print(f"{objects} objects")
+        print(f"{'import':<12}{'time (s)':>12}{'objects/s':>12}")
+        db = make_database("sqlite")
+        db.load(":memory:")
+        timed_import(db, filename, "empty tree", objects)
+        timed_import(db, filename, "same ids", objects)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)